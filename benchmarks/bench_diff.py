@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模板比对性能测试
+
+使用 zone_generator 生成模拟导出文件并转换为DNSPOD模板，再在模板中制造少量差异
+（删除、修改TTL/MX、新增记录），分阶段测量 dns_diff.verify_template 的耗时，
+并检查报告是否恰好包含这些差异。
+
+使用方法：
+    python benchmarks/bench_diff.py --records 500000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_converter import DNSConverter  # noqa: E402
+from dns_diff import print_diff_summary, read_dnspod_template, verify_template  # noqa: E402
+from zone_generator import generate_zone  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='模板比对性能测试')
+    parser.add_argument('--records', type=int, default=500000, help='模拟记录条数（默认500000）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source_path = os.path.join(tmp, 'huawei.csv')
+        template_path = os.path.join(tmp, 'dnspod.csv')
+        generate_zone(args.records).to_csv(source_path, index=False, encoding='utf-8-sig')
+        with contextlib.redirect_stdout(io.StringIO()):
+            DNSConverter().convert_file(source_path, template_path)
+
+        # 删除2条、修改1条TTL和1条MX、新增1条
+        template = read_dnspod_template(template_path)
+        template = template.drop(index=template.index[:2])
+        template.loc[template.index[0], 'TTL'] = '1'
+        template.loc[template.index[template['Type'] == 'MX'][0], 'MX'] = '99'
+        template.loc[len(template) + 2] = ['A', 'bench-extra', 'Default', '192.0.2.1', '-', '600', '']
+        template.to_csv(template_path, index=False, encoding='utf-8-sig')
+
+        converter = DNSConverter()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = verify_template(converter, source_path, template_path)
+        elapsed = time.perf_counter() - start
+
+    print_diff_summary(report, converter.counters['diff_expected'], converter.counters['diff_actual'])
+    print("\n=== 各阶段耗时 ===")
+    for name, seconds in converter.timings.items():
+        print(f"{name:<10} {seconds:8.2f} s")
+    print(f"{'总计':<10} {elapsed:8.2f} s")
+    print(f"\n差异报告{'正确' if len(report) == 5 else '不正确'}（{len(report)} 条差异，预期 5 条）")
+
+
+if __name__ == '__main__':
+    main()
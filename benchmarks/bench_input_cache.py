@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+输入缓存性能测试
+
+生成云服务商格式的模拟Excel文件，比较不使用缓存读取（完整解析Excel并标准化列名）、
+第一次读取（解析后写入缓存）和再次读取（从缓存加载）read_dns_file 的耗时，
+并校验从缓存加载的DataFrame与直接读取完全一致。
+
+使用方法：
+    python benchmarks/bench_input_cache.py
+    python benchmarks/bench_input_cache.py --records 200000 --provider aliyun
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from dns_converter import DNSConverter  # noqa: E402
+from zone_generator import PROVIDER_COLUMNS, generate_zone, save_zone  # noqa: E402
+
+
+def timed_read(converter: DNSConverter, path: str) -> tuple:
+    """读取文件，返回 (DataFrame, 耗时秒数)"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = converter.read_dns_file(path)
+    return df, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='输入缓存性能测试')
+    parser.add_argument('--records', type=int, default=100000, help='模拟记录条数（默认100000）')
+    parser.add_argument('--provider', default='huawei', choices=sorted(PROVIDER_COLUMNS),
+                        help='模拟的云服务商格式（默认huawei）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, f'{args.provider}.xlsx')
+        save_zone(generate_zone(args.records, args.provider), input_path)
+        size_mb = os.path.getsize(input_path) / 1024 / 1024
+
+        cache_dir = os.path.join(tmp, 'cache')
+        direct_df, direct_time = timed_read(DNSConverter(), input_path)
+        _, first_time = timed_read(DNSConverter(input_cache_dir=cache_dir), input_path)
+        converter = DNSConverter(input_cache_dir=cache_dir)
+        cached_df, cached_time = timed_read(converter, input_path)
+        pd.testing.assert_frame_equal(direct_df, cached_df)
+        cache_mb = converter.input_cache.stats()['bytes'] / 1024 / 1024
+        converter.input_cache.close()
+
+    print(f"输入文件: {args.records} 条记录，{size_mb:.1f} MB（从缓存加载的结果与直接读取一致）")
+    print(f"不使用缓存: {direct_time:.3f} 秒")
+    print(f"第一次读取（写入缓存）: {first_time:.3f} 秒")
+    print(f"再次读取（从缓存加载）: {cached_time * 1000:.1f} 毫秒，缓存大小 {cache_mb:.1f} MB，"
+          f"加速 {direct_time / cached_time:.0f} 倍")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单个文件并行转换的扩展性测试
+
+使用 zone_generator 生成模拟记录并标准化列名，分别测量单进程转换和不同进程数并行转换
+（convert_dns_records_parallel）的耗时和加速比，并检查并行转换的结果与单进程完全一致。
+
+使用方法：
+    python benchmarks/bench_parallel.py --records 2000000 --workers 1 2 4 8
+    python benchmarks/bench_parallel.py --records 200000 --engine row --workers 2 4
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_converter import DNSConverter  # noqa: E402
+from zone_generator import generate_zone  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='单个文件并行转换的扩展性测试')
+    parser.add_argument('--records', type=int, default=1000000, help='模拟记录条数（默认1000000）')
+    parser.add_argument('--engine', choices=['vectorized', 'row'], default='vectorized', help='转换引擎')
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, 8], help='测试的进程数')
+    parser.add_argument('--chunk-rows', type=int, default=None, help='每块的记录数（默认按进程数自动划分）')
+    args = parser.parse_args()
+
+    converter = DNSConverter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        dns_df = converter.normalize_column_names(generate_zone(args.records))
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if args.engine == 'row':
+            expected = converter.convert_dns_records(dns_df)
+        else:
+            expected = converter.convert_dns_records_vectorized(dns_df)
+    serial = time.perf_counter() - start
+    print(f"{args.records} 条记录（转换后 {len(expected)} 条），引擎: {args.engine}\n")
+    print(f"{'单进程':<10} {serial:8.2f} s")
+
+    for workers in args.workers:
+        converter = DNSConverter()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            dnspod_df = converter.convert_dns_records_parallel(dns_df, workers, args.engine, args.chunk_rows)
+        elapsed = time.perf_counter() - start
+        status = '一致' if dnspod_df.equals(expected) else '不一致'
+        chunks = len(converter.chunk_reports) or 1
+        print(f"{f'{workers} 进程':<10} {elapsed:8.2f} s  加速 {serial / elapsed:5.2f}x  {chunks} 块，结果{status}")
+
+    print(f"\nCPU核数: {os.cpu_count()}")
+
+
+if __name__ == '__main__':
+    main()
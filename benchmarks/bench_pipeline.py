@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+转换流程性能测试
+
+使用 zone_generator 生成华为云/阿里云格式的模拟文件，在独立子进程中分别计时
+read_dns_file、convert_dns_records 和 save_dnspod_template 三个阶段并记录峰值内存，
+结果保存为JSON，可与之前的结果对比。
+
+使用方法：
+    # 默认测试 1k、100k、1M 条记录的CSV和XLSX文件
+    python benchmarks/bench_pipeline.py -o results.json
+
+    # 只测试小规模CSV，并与之前的结果对比
+    python benchmarks/bench_pipeline.py --sizes 1000 100000 --formats csv \\
+        -o new.json --compare results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+import pandas as pd  # noqa: E402
+
+from zone_generator import PROVIDER_COLUMNS, generate_zone, parse_type_mix, save_zone  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STAGES = ['read', 'convert', 'save']
+
+
+def peak_rss_mb():
+    """当前进程的峰值内存（MB），不支持的平台返回None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 的 ru_maxrss 单位为字节，Linux 为KB
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(input_path: str, engine: str) -> dict:
+    """在当前进程中执行一次完整转换，返回各阶段耗时和内存"""
+    from dns_converter import DNSConverter
+
+    converter = DNSConverter()
+    result = {'rss_start_mb': peak_rss_mb()}
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        dns_df = converter.read_dns_file(input_path)
+        result['read_s'] = time.perf_counter() - start
+        result['rss_after_read_mb'] = peak_rss_mb()
+
+        start = time.perf_counter()
+        if engine == 'row':
+            dnspod_df = converter.convert_dns_records(dns_df)
+        else:
+            dnspod_df = converter.convert_dns_records_vectorized(dns_df)
+        result['convert_s'] = time.perf_counter() - start
+        result['rss_after_convert_mb'] = peak_rss_mb()
+
+        start = time.perf_counter()
+        converter.save_dnspod_template(dnspod_df, os.path.join(tmp, 'dnspod.xlsx'))
+        result['save_s'] = time.perf_counter() - start
+
+    result['peak_rss_mb'] = peak_rss_mb()
+    result['input_records'] = len(dns_df)
+    result['output_records'] = len(dnspod_df)
+    return result
+
+
+def ensure_input(data_dir: str, provider: str, fmt: str, size: int, args) -> str:
+    """生成（或复用已生成的）模拟输入文件"""
+    mix = args.type_mix or 'default'
+    name = f"{provider}_{size}_f{args.fanout}_r{args.repetition}_{mix.replace(',', '-').replace('=', '')}.{fmt}"
+    path = os.path.join(data_dir, name)
+    if not os.path.exists(path):
+        print(f"生成模拟文件: {path}")
+        dns_df = generate_zone(size, provider, parse_type_mix(args.type_mix) if args.type_mix else None,
+                               args.fanout, args.repetition)
+        save_zone(dns_df, path)
+    return path
+
+
+def compare_results(baseline: dict, current: dict):
+    """打印与基准结果的对比（比值小于1表示变快）"""
+    previous = {item['case']: item for item in baseline['results']}
+    print("\n=== 与基准结果对比 ===")
+    for item in current['results']:
+        base = previous.get(item['case'])
+        if base is None:
+            print(f"{item['case']}: 基准结果中没有该用例")
+            continue
+        parts = []
+        for stage in STAGES:
+            key = f'{stage}_s'
+            parts.append(f"{stage} {base[key]:.3f}s → {item[key]:.3f}s ({item[key] / max(base[key], 1e-9):.2f}x)")
+        if base.get('peak_rss_mb') and item.get('peak_rss_mb'):
+            parts.append(f"内存 {base['peak_rss_mb']:.0f}MB → {item['peak_rss_mb']:.0f}MB")
+        print(f"{item['case']}: " + ', '.join(parts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DNS转换流程性能测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000],
+                        help='记录条数（默认 1000 100000 1000000）')
+    parser.add_argument('--formats', nargs='+', choices=['csv', 'xlsx'], default=['csv', 'xlsx'],
+                        help='输入文件格式')
+    parser.add_argument('--providers', nargs='+', choices=list(PROVIDER_COLUMNS), default=['huawei', 'aliyun'],
+                        help='导出格式')
+    parser.add_argument('--engine', choices=['vectorized', 'row'], default='vectorized', help='转换引擎')
+    parser.add_argument('--type-mix', default=None, help='记录类型比例，如 A=50,CNAME=20,MX=5,TXT=15,NS=10')
+    parser.add_argument('--fanout', type=int, default=2, help='A记录最多包含的IP数量')
+    parser.add_argument('--repetition', type=float, default=0.5, help='主机名和记录值的重复率')
+    parser.add_argument('--data-dir', default=os.path.join(BENCH_DIR, 'data'), help='模拟文件目录')
+    parser.add_argument('-o', '--output', help='保存测试结果的JSON文件')
+    parser.add_argument('--compare', help='与之前保存的JSON结果对比')
+    parser.add_argument('--run-case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # 子进程模式：只执行一个用例并输出JSON
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case, args.engine)))
+        return
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = []
+    for size in args.sizes:
+        for provider in args.providers:
+            for fmt in args.formats:
+                input_path = ensure_input(args.data_dir, provider, fmt, size, args)
+                command = [sys.executable, os.path.abspath(__file__), '--run-case', input_path,
+                           '--engine', args.engine]
+                output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                result.update({'case': f'{provider}-{fmt}-{size}', 'provider': provider,
+                               'format': fmt, 'size': size})
+                results.append(result)
+                peak = f"{result['peak_rss_mb']:.0f}MB" if result['peak_rss_mb'] else '-'
+                print(f"{result['case']}: 读取 {result['read_s']:.3f}s, 转换 {result['convert_s']:.3f}s, "
+                      f"保存 {result['save_s']:.3f}s, 峰值内存 {peak}, "
+                      f"{result['input_records']} → {result['output_records']} 条")
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'engine': args.engine,
+            'type_mix': args.type_mix,
+            'fanout': args.fanout,
+            'repetition': args.repetition,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"测试结果已保存到: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare_results(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+云服务商格式检测性能测试
+
+模拟批量转换多种格式的文件：按轮次交替检测各云服务商导出文件的表头（包括与已知表头
+不完全一致、需要按特征列匹配的表头），比较表头签名索引（dns_providers.detect_profile）
+与原来的逐列子串扫描加列名映射的每次耗时；并测量各格式按列执行记录值转换的吞吐量。
+
+使用方法：
+    python benchmarks/bench_providers.py
+    python benchmarks/bench_providers.py --rounds 100000 --records 200000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_converter import DNSConverter  # noqa: E402
+from dns_providers import COLUMN_MAPPING, detect_profile  # noqa: E402
+from zone_generator import PROVIDER_COLUMNS, generate_zone  # noqa: E402
+
+# 原实现按原始列名（区分大小写）映射
+LEGACY_COLUMN_MAPPING = {**{column: standard for column, standard in COLUMN_MAPPING.items()},
+                         'Type': 'Type', 'Host': 'Host', 'Name': 'Host', 'Value': 'Value',
+                         'IP': 'Value', 'Target': 'Value', 'TTL': 'TTL', 'TTL值': 'TTL',
+                         'TTL(秒)': 'TTL', 'Priority': 'MX', 'MX优先级': 'MX',
+                         'Remarks': 'Remarks', 'Comment': 'Remarks'}
+
+
+def legacy_detect(columns):
+    """原来的检测与列名标准化：逐列做子串扫描，再按一个大的映射表重命名"""
+    columns = [str(col) for col in columns]
+    if any('解析线路' in col or '线路' in col for col in columns):
+        provider = "阿里云"
+    elif any('备注' in col or 'remarks' in col.lower() for col in columns):
+        provider = "华为云"
+    else:
+        provider = "华为云"
+    return provider, [LEGACY_COLUMN_MAPPING.get(col, col) for col in columns]
+
+
+def indexed_detect(columns):
+    """表头签名索引：一次哈希查找得到格式及其列名映射"""
+    profile = detect_profile(columns)
+    return profile.name, profile.normalize_columns(columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='云服务商格式检测性能测试')
+    parser.add_argument('--rounds', type=int, default=50000, help='检测轮数（每轮检测全部表头，默认50000）')
+    parser.add_argument('--records', type=int, default=100000, help='记录值转换测试的记录条数（默认100000）')
+    args = parser.parse_args()
+
+    # 已知表头，以及多一列（需要按特征列匹配）的表头
+    headers = [list(columns) for columns in PROVIDER_COLUMNS.values()]
+    headers += [columns + ['id'] for columns in headers]
+
+    print(f"表头检测（{len(headers)} 种表头 × {args.rounds} 轮）:")
+    for name, detect in (('子串扫描', legacy_detect), ('签名索引', indexed_detect)):
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            for columns in headers:
+                detect(columns)
+        elapsed = time.perf_counter() - start
+        print(f"  {name}: {elapsed / (args.rounds * len(headers)) * 1e6:.2f} 微秒/次")
+
+    print(f"记录值转换（{args.records} 条记录）:")
+    converter = DNSConverter()
+    for provider in PROVIDER_COLUMNS:
+        dns_df = generate_zone(args.records, provider)
+        profile = detect_profile(dns_df.columns)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            converter.normalize_column_names(dns_df, profile)
+            elapsed = time.perf_counter() - start
+        print(f"  {provider:<10} → {profile.name:<10} {len(profile.transforms)} 个转换，"
+              f"{elapsed:.3f} 秒（{len(dns_df) / elapsed:,.0f} 条/秒）")
+
+
+if __name__ == '__main__':
+    main()
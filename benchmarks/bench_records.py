@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+转换结果内存占用测试
+
+使用 zone_generator 生成模拟记录并逐条转换，用 tracemalloc 比较保存同一批转换结果的
+几种方式占用的内存（字段值的字符串由各方式共享，只统计容器本身）：
+
+- 字典列表：每条记录一个7键字典（旧的 convert_record 返回值）
+- DNSPODRecord 列表：每条记录一个 __slots__ 对象
+- DNSPODRecordBuffer：按列存储，只保存字段值
+
+并比较由字典列表和按列缓冲区构建DataFrame时的峰值内存。
+
+使用方法：
+    python benchmarks/bench_records.py --records 1000000
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from dns_core import DNSPODRecord, DNSPODRecordBuffer  # noqa: E402
+from dns_converter import DNSConverter  # noqa: E402
+from zone_generator import generate_zone  # noqa: E402
+
+
+def measure(build):
+    """执行 build()，返回 (结果, 结果占用的内存MB, 构建过程的峰值内存MB)"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / 1024 / 1024, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='转换结果内存占用测试')
+    parser.add_argument('--records', type=int, default=1000000, help='模拟记录条数（默认1000000）')
+    args = parser.parse_args()
+
+    converter = DNSConverter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        dns_df = converter.normalize_column_names(generate_zone(args.records))
+        records = []
+        for record in dns_df.to_dict('records'):
+            records.extend(converter.convert_record(record))
+    del dns_df
+    print(f"输入记录: {args.records} 条，转换后: {len(records)} 条")
+
+    dicts, dict_size, _ = measure(lambda: [record.to_dict() for record in records])
+    slots, slots_size, _ = measure(lambda: [DNSPODRecord(r.type, r.host, r.value, r.mx, r.ttl, r.remarks)
+                                            for r in records])
+    del slots
+
+    def fill_buffer():
+        buffer = DNSPODRecordBuffer()
+        buffer.extend(records)
+        return buffer
+
+    buffer, buffer_size, _ = measure(fill_buffer)
+
+    print("\n=== 保存转换结果的内存占用 ===")
+    print(f"字典列表:           {dict_size:8.1f} MB")
+    print(f"DNSPODRecord 列表:  {slots_size:8.1f} MB（{dict_size / slots_size:.1f}x 更小）")
+    print(f"DNSPODRecordBuffer: {buffer_size:8.1f} MB（{dict_size / buffer_size:.1f}x 更小）")
+
+    dict_df, _, dict_peak = measure(lambda: pd.DataFrame(dicts, columns=converter.dnspod_columns))
+    del dicts
+    buffer_df, _, buffer_peak = measure(buffer.to_frame)
+    pd.testing.assert_frame_equal(dict_df, buffer_df)
+
+    print("\n=== 构建DataFrame的峰值内存（不含已有的转换结果） ===")
+    print(f"由字典列表构建:     {dict_peak:8.1f} MB")
+    print(f"由按列缓冲区构建:   {buffer_peak:8.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
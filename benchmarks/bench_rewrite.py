@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+迁移改写规则性能测试
+
+生成大量 ip_map（不同长度的IPv4网段）和 target_map（*.huaweicloud.com 下的服务后缀）规则，
+比较编译后的索引（按位前缀树、按标签倒序的后缀树，见 dns_rewrite）与逐条扫描规则列表
+（按最长匹配）每次查找的耗时，并检查两者找到的规则一致；
+再比较列式引擎转换模拟记录时不使用规则与使用规则的耗时。
+
+使用方法：
+    python benchmarks/bench_rewrite.py
+    python benchmarks/bench_rewrite.py --rules 50000 --lookups 5000 --records 200000
+"""
+
+import argparse
+import contextlib
+import io
+import ipaddress
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from dns_converter import DNSConverter  # noqa: E402
+from dns_rewrite import RewriteRules  # noqa: E402
+from zone_generator import generate_zone  # noqa: E402
+
+
+def make_rules(count: int, seed: int = 0) -> dict:
+    """生成 count 条 ip_map 规则和 count 条 target_map 规则"""
+    rng = random.Random(seed)
+    ip_map = []
+    for _ in range(count):
+        prefixlen = rng.choice([16, 20, 24, 24, 28, 32])
+        source = ipaddress.ip_network((rng.randrange(1 << 32), prefixlen), strict=False)
+        target = ipaddress.ip_network((rng.randrange(1 << 32), prefixlen), strict=False)
+        ip_map.append({'from': str(source), 'to': str(target)})
+    target_map = [{'from': f'*.svc{number}.huaweicloud.com', 'to': f'*.svc{number}.tencentcloud.com'}
+                  for number in range(count)]
+    return {'ip_map': ip_map, 'target_map': target_map}
+
+
+def make_lookups(rules: dict, count: int, seed: int = 1) -> tuple:
+    """生成待查找的IP和目标域名，约一半命中规则"""
+    rng = random.Random(seed)
+    ips, targets = [], []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            network = ipaddress.ip_network(rng.choice(rules['ip_map'])['from'])
+            ips.append(int(network.network_address) + rng.randrange(network.num_addresses))
+        else:
+            ips.append(rng.randrange(1 << 32))
+        number = rng.randrange(len(rules['target_map']) * 2)
+        targets.append(f'node{number % 97}.svc{number}.huaweicloud.com')
+    return ips, targets
+
+
+def linear_ip_match(networks: list, address: int):
+    """逐条扫描网段列表，返回最长匹配网段的规则"""
+    best, best_length = None, -1
+    for start, end, prefixlen, rule in networks:
+        if start <= address <= end and prefixlen >= best_length:
+            best, best_length = rule, prefixlen
+    return best
+
+
+def linear_target_match(suffixes: list, name: str):
+    """逐条扫描后缀列表，返回最长匹配后缀的规则"""
+    best, best_length = None, -1
+    for suffix, rule in suffixes:
+        if name.endswith(suffix) and len(suffix) >= best_length:
+            best, best_length = rule, len(suffix)
+    return best
+
+
+def timed(func, items):
+    start = time.perf_counter()
+    results = [func(item) for item in items]
+    return results, time.perf_counter() - start
+
+
+def convert_time(converter: DNSConverter, dns_df, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            converter.convert_dns_records_vectorized(dns_df)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='迁移改写规则性能测试')
+    parser.add_argument('--rules', type=int, default=20000, help='ip_map 和 target_map 规则各多少条（默认20000）')
+    parser.add_argument('--lookups', type=int, default=2000, help='查找次数（默认2000）')
+    parser.add_argument('--records', type=int, default=100000, help='端到端转换的模拟记录条数（默认100000）')
+    parser.add_argument('--repeat', type=int, default=3, help='端到端转换的重复次数，取最短耗时（默认3）')
+    args = parser.parse_args()
+
+    rule_data = make_rules(args.rules)
+    start = time.perf_counter()
+    rules = RewriteRules(rule_data)
+    compile_time = time.perf_counter() - start
+    ips, targets = make_lookups(rule_data, args.lookups)
+    print(f"规则: ip_map {args.rules} 条，target_map {args.rules} 条，编译耗时 {compile_time:.2f} 秒")
+
+    # 逐条扫描使用与索引相同的规则值：(源网段起始地址, 目标起始地址, 是否保留主机部分) 和 (是否保留前缀, 新后缀)
+    networks = []
+    for rule in rule_data['ip_map']:
+        source = ipaddress.ip_network(rule['from'])
+        target = ipaddress.ip_network(rule['to'])
+        networks.append((int(source.network_address), int(source.broadcast_address), source.prefixlen,
+                         (int(source.network_address), int(target.network_address), True)))
+    suffixes = [(rule['from'][1:], (True, rule['to'][2:])) for rule in rule_data['target_map']]
+
+    print(f"{'查找':<10} {'索引(微秒/次)':>14} {'逐条扫描(微秒/次)':>18} {'加速':>9}  结果")
+    tree = rules.ip_trees[4]
+    indexed, index_time = timed(tree.longest_match, ips)
+    scanned, scan_time = timed(lambda address: linear_ip_match(networks, address), ips)
+    print(f"{'ip_map':<10} {index_time / len(ips) * 1e6:14.2f} {scan_time / len(ips) * 1e6:18.1f} "
+          f"{scan_time / index_time:8.0f}x  {'一致' if indexed == scanned else '不一致'}")
+
+    indexed, index_time = timed(lambda name: next(rules.target_tree.matches(name.split('.')), (0, None))[1],
+                                targets)
+    scanned, scan_time = timed(lambda name: linear_target_match(suffixes, name), targets)
+    print(f"{'target_map':<10} {index_time / len(targets) * 1e6:14.2f} {scan_time / len(targets) * 1e6:18.1f} "
+          f"{scan_time / index_time:8.0f}x  {'一致' if indexed == scanned else '不一致'}")
+
+    # 端到端：模拟记录的A记录IP都在 10.0.0.0/16 内，按 /24 网段重新编号
+    zone_rules = {
+        'ip_map': rule_data['ip_map'] + [{'from': f'10.0.{n}.0/24', 'to': f'172.16.{n}.0/24'} for n in range(256)],
+        'target_map': rule_data['target_map'] + [{'from': '*.cdn.example.net', 'to': '*.cdn.tencent.net'}],
+        'ttl': [{'type': 'MX', 'ttl': 3600}],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        rules_path = os.path.join(tmp, 'rules.json')
+        with open(rules_path, 'w', encoding='utf-8') as f:
+            json.dump(zone_rules, f)
+        plain = DNSConverter(zone='example.com')
+        rewriting = DNSConverter(zone='example.com', rewrite_rules=rules_path)
+    dns_df = plain.normalize_column_names(generate_zone(args.records))
+    plain_time = convert_time(plain, dns_df, args.repeat)
+    rewrite_time = convert_time(rewriting, dns_df, args.repeat)
+    print(f"列式转换 {args.records} 条记录: 不使用规则 {plain_time:.2f} 秒，"
+          f"使用 {rewriting.rewrite_rules.rule_count} 条规则 {rewrite_time:.2f} 秒，"
+          f"改写记录值 {rewriting.counters['rewrite_values'] // args.repeat} 条/次")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地转换服务性能测试
+
+生成华为云格式的模拟Excel文件，比较每次启动 dns_converter.py 子进程转换与通过本地转换服务
+（dns_service.py，预热的工作进程池）转换的每次耗时，并校验两者输出一致；
+再用多个线程同时提交任务，统计成功、被拒绝（503，排队已满）的请求数和排队耗时。
+服务在本进程中启动，只监听 127.0.0.1 的临时端口。
+
+使用方法：
+    python benchmarks/bench_service.py
+    python benchmarks/bench_service.py --records 1000 --calls 50 --workers 4 --clients 16
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from dns_service import ConversionService, ServiceClient, create_server  # noqa: E402
+from zone_generator import generate_zone, save_zone  # noqa: E402
+
+
+def run_cli(input_path: str, output_path: str) -> float:
+    """启动 dns_converter.py 子进程转换，返回耗时秒数"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(REPO_DIR, 'dns_converter.py'), input_path, '-o', output_path],
+                   capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地转换服务性能测试')
+    parser.add_argument('--records', type=int, default=1000, help='模拟记录条数（默认1000）')
+    parser.add_argument('--calls', type=int, default=20, help='顺序转换的次数（默认20）')
+    parser.add_argument('--workers', type=int, default=2, help='服务的工作进程数（默认2）')
+    parser.add_argument('--clients', type=int, default=8, help='并发提交任务的线程数（默认8）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, 'huawei.xlsx')
+        save_zone(generate_zone(args.records), input_path)
+
+        cli_output = os.path.join(tmp, 'cli.csv')
+        cli_times = [run_cli(input_path, cli_output) for _ in range(args.calls)]
+
+        service = ConversionService(args.workers, converter_options={'cache_size': 65536})
+        server = create_server(service, port=0, quiet=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+        try:
+            warm_start = time.perf_counter()
+            service.warm_up()
+            warm_time = time.perf_counter() - warm_start
+
+            client = ServiceClient(port=port)
+            service_output = os.path.join(tmp, 'service.csv')
+            service_times = []
+            for _ in range(args.calls):
+                start = time.perf_counter()
+                status, result = client.convert_path(input_path, service_output)
+                service_times.append(time.perf_counter() - start)
+                assert status == 200, result
+            with open(input_path, 'rb') as f:
+                status, _, body = client.convert_bytes(f.read(), 'huawei.xlsx', 'csv')
+            client.close()
+            with open(cli_output, 'rb') as f:
+                expected = f.read()
+            with open(service_output, 'rb') as f:
+                assert f.read() == expected and body == expected, '服务与命令行的输出不一致'
+
+            # 并发提交：超过排队上限的请求返回503
+            statuses, queued = [], []
+
+            def submit():
+                worker_client = ServiceClient(port=port)
+                status, result = worker_client.convert_path(input_path, os.path.join(tmp, f'{threading.get_ident()}.csv'))
+                statuses.append(status)
+                if status == 200:
+                    queued.append(result['timing']['queued'])
+                worker_client.close()
+
+            threads = [threading.Thread(target=submit) for _ in range(args.clients)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.shutdown()
+
+    cli_avg = sum(cli_times) / len(cli_times)
+    service_avg = sum(service_times) / len(service_times)
+    print(f"输入文件: {args.records} 条记录，顺序转换 {args.calls} 次（服务与命令行的输出一致）")
+    print(f"命令行（每次启动子进程）: 平均 {cli_avg * 1000:.1f} 毫秒")
+    print(f"转换服务（{args.workers} 个工作进程，预热 {warm_time:.2f} 秒）: 平均 {service_avg * 1000:.1f} 毫秒，"
+          f"加速 {cli_avg / service_avg:.1f} 倍")
+    print(f"并发提交 {args.clients} 个任务（排队上限 {service.max_pending}）: "
+          f"成功 {statuses.count(200)}，排队已满 {statuses.count(503)}，"
+          f"最长排队 {max(queued, default=0) * 1000:.1f} 毫秒")
+
+
+if __name__ == '__main__':
+    main()
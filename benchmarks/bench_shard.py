@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分片输出性能测试
+
+使用 zone_generator 生成模拟记录并转换，分别测量写出单个DNSPOD模板和按记录数上限
+分片写出（不同线程数）的耗时，并检查各分片的记录数之和与转换结果一致。
+
+使用方法：
+    python benchmarks/bench_shard.py --records 200000 --shard-records 50000 --workers 1 4 8
+    python benchmarks/bench_shard.py --records 200000 --shard-records 50000 --format csv
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_converter import DNSConverter  # noqa: E402
+from dns_shard import write_shards  # noqa: E402
+from zone_generator import generate_zone  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='分片输出性能测试')
+    parser.add_argument('--records', type=int, default=200000, help='模拟记录条数（默认200000）')
+    parser.add_argument('--shard-records', type=int, default=50000, help='每个分片的记录数上限（默认50000）')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8], help='测试的写入线程数')
+    parser.add_argument('--format', choices=['xlsx', 'csv', 'ndjson'], default='xlsx', help='输出格式')
+    args = parser.parse_args()
+
+    converter = DNSConverter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        dnspod_df = converter.convert_dns_records_vectorized(
+            converter.normalize_column_names(generate_zone(args.records)))
+    print(f"转换结果: {len(dnspod_df)} 条记录，输出格式: {args.format}\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            converter.save_dnspod_template(dnspod_df, os.path.join(tmp, f'single.{args.format}'))
+        print(f"{'单个文件':<12} {time.perf_counter() - start:8.2f} s")
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            manifest = write_shards(dnspod_df, os.path.join(tmp, f'sharded_{workers}.{args.format}'),
+                                    max_records=args.shard_records, workers=workers)
+            elapsed = time.perf_counter() - start
+            written = sum(info['records'] for info in manifest['shards'])
+            status = '正确' if written == len(dnspod_df) else f'不正确（{written} 条）'
+            print(f"{f'{workers} 线程':<12} {elapsed:8.2f} s  {len(manifest['shards'])} 个分片，记录数{status}")
+
+    print(f"\nCPU核数: {os.cpu_count()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动时间性能测试
+
+在全新的子进程中分别测量：
+- 导入 dns_converter 的耗时，以及导入后是否加载了 pandas/numpy/openpyxl
+- 命令行转换小型CSV文件（CSV输入、CSV输出）的总耗时：core（标准库路径）与 vectorized（pandas）
+
+每项重复多次取最小值和中位数，用于对比冷启动的改进。
+
+使用方法：
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --records 1000 --repeat 10
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+CLI = os.path.join(REPO_DIR, 'dns_converter.py')
+
+# 导入后检查重量级依赖是否已加载
+IMPORT_CHECK = ("import sys; import dns_converter; "
+                "print(','.join(m for m in ('pandas', 'numpy', 'openpyxl') if m in sys.modules))")
+
+
+def run_timed(command, repeat: int, cwd: str = REPO_DIR):
+    """重复执行命令，返回每次的耗时（秒）和最后一次的标准输出"""
+    times = []
+    output = ''
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run(command, cwd=cwd, capture_output=True, text=True, check=True).stdout
+        times.append(time.perf_counter() - start)
+    return times, output
+
+
+def describe(name: str, times):
+    """打印一项测试的最小值和中位数"""
+    print(f"{name:<28} 最小 {min(times) * 1000:8.1f} ms   中位数 {statistics.median(times) * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='启动时间性能测试')
+    parser.add_argument('--records', type=int, default=1000, help='模拟CSV文件的记录条数（默认1000）')
+    parser.add_argument('--repeat', type=int, default=5, help='每项测试的重复次数（默认5）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, 'huawei.csv')
+        subprocess.run([sys.executable, os.path.join(BENCH_DIR, 'zone_generator.py'), str(args.records),
+                        '-o', input_path], check=True, capture_output=True)
+
+        interpreter, _ = run_timed([sys.executable, '-c', 'pass'], args.repeat)
+        describe('Python解释器启动', interpreter)
+
+        imports, loaded = run_timed([sys.executable, '-c', IMPORT_CHECK], args.repeat)
+        describe('import dns_converter', imports)
+        print(f"{'':<28} 导入后已加载: {loaded.strip() or '无'}")
+
+        pandas_import, _ = run_timed([sys.executable, '-c', 'import pandas'], args.repeat)
+        describe('import pandas（参考）', pandas_import)
+
+        results = {}
+        for engine in ('core', 'vectorized'):
+            output_path = os.path.join(tmp, f'dnspod_{engine}.csv')
+            results[engine], _ = run_timed([sys.executable, CLI, input_path, '-o', output_path,
+                                            '--engine', engine], args.repeat)
+            describe(f'CSV→CSV 转换（{engine}）', results[engine])
+
+        with open(os.path.join(tmp, 'dnspod_core.csv'), 'rb') as core_file, \
+                open(os.path.join(tmp, 'dnspod_vectorized.csv'), 'rb') as vectorized_file:
+            same = core_file.read() == vectorized_file.read()
+
+    speedup = min(results['vectorized']) / min(results['core'])
+    print(f"\n{args.records} 条记录，core 路径比 vectorized 快 {speedup:.1f}x"
+          f"（两者输出{'一致' if same else '不一致'}）")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DNSPOD API上传性能测试
+
+生成华为云格式的模拟记录并转换为 CreateRecord 参数，上传到本进程中启动的模拟DNSPOD API服务器
+（benchmarks/mock_dnspod_api.py，带限频、偶发错误和响应延迟），比较不同并发数的吞吐量、
+重试次数和使用的连接数，并校验服务器上的记录与上传的记录完全一致；
+最后模拟上传中断：先上传一部分记录，再从检查点继续上传全部记录，确认已完成的记录不会重复提交。
+
+使用方法：
+    python benchmarks/bench_upload.py
+    python benchmarks/bench_upload.py --records 2000 --server-rate 200 --latency 0.02 --concurrency 1 4 16
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from dns_converter import DNSConverter  # noqa: E402
+from dns_core import dnspod_api_record  # noqa: E402
+from dns_upload import DNSPODUploader, UploadCheckpoint, record_key  # noqa: E402
+from mock_dnspod_api import MockDNSPODAPI, create_mock_server  # noqa: E402
+from zone_generator import generate_zone  # noqa: E402
+
+ZONE = 'example.com'
+
+
+def generate_records(count: int) -> list:
+    """生成模拟记录并转换为去重后的 CreateRecord 参数"""
+    converter = DNSConverter(zone=ZONE)
+    with contextlib.redirect_stdout(io.StringIO()):
+        dnspod_df = converter.convert_dns_records_vectorized(
+            converter.normalize_column_names(generate_zone(count, repetition=0.0)))
+    records = {}
+    for row in dnspod_df.to_dict('records'):
+        record = dnspod_api_record(row, ZONE)
+        records.setdefault(record_key(record), record)
+    return list(records.values())
+
+
+@contextlib.contextmanager
+def mock_api(args):
+    """在后台线程中启动模拟API服务器，返回 (状态, 地址)"""
+    api = MockDNSPODAPI(args.server_rate, error_rate=args.error_rate, latency=args.latency, seed=1)
+    server = create_mock_server(api)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield api, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def upload(endpoint: str, records: list, args, concurrency: int, checkpoint: UploadCheckpoint = None):
+    uploader = DNSPODUploader(endpoint, rate=args.client_rate, concurrency=concurrency, batch_size=args.batch_size)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        failures = uploader.upload(records, checkpoint)
+    return uploader, failures, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DNSPOD API上传性能测试')
+    parser.add_argument('--records', type=int, default=1000, help='模拟记录条数（默认1000）')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16], help='测试的并发数（默认 1 4 16）')
+    parser.add_argument('--server-rate', type=float, default=200, help='模拟服务器每秒允许的请求数（默认200）')
+    parser.add_argument('--client-rate', type=float, default=250,
+                        help='上传端令牌桶每秒请求数，略高于服务器限制以触发限频处理（默认250）')
+    parser.add_argument('--error-rate', type=float, default=0.02, help='模拟服务器返回InternalError的比例（默认0.02）')
+    parser.add_argument('--latency', type=float, default=0.02, help='模拟服务器每个请求的处理时间（默认0.02秒）')
+    parser.add_argument('--batch-size', type=int, default=200, help='每批记录数（默认200）')
+    args = parser.parse_args()
+
+    records = generate_records(args.records)
+    expected = {record_key(record) for record in records}
+    print(f"上传 {len(records)} 条记录（服务器每秒限 {args.server_rate:g} 个请求，"
+          f"错误率 {args.error_rate:.0%}，延迟 {args.latency * 1000:.0f} 毫秒）")
+
+    for concurrency in args.concurrency:
+        with mock_api(args) as (api, endpoint):
+            uploader, failures, elapsed = upload(endpoint, records, args, concurrency)
+            uploaded = {'\t'.join(str(part) for part in key) for key in api.records}
+        counters = uploader.counters
+        status = '一致' if uploaded == expected and not failures else f'不一致（失败 {len(failures)} 条）'
+        print(f"并发 {concurrency:>3}: {elapsed:6.2f} 秒，{len(records) / elapsed:7.1f} 条/秒，"
+              f"请求 {counters['requests']}，重试 {counters['retries']}（限频 {counters['rate_limited']}），"
+              f"连接 {uploader.pool.created}，服务器记录{status}")
+
+    # 模拟中断后从检查点继续
+    concurrency = max(args.concurrency)
+    with tempfile.TemporaryDirectory() as tmp, mock_api(args) as (api, endpoint):
+        checkpoint = UploadCheckpoint(os.path.join(tmp, 'upload.sqlite'))
+        half = len(records) // 2
+        upload(endpoint, records[:half], args, concurrency, checkpoint)
+        uploader, failures, _ = upload(endpoint, records, args, concurrency, checkpoint)
+        checkpoint.close()
+        exists = api.stats['InvalidParameter.DomainRecordExist']
+    print(f"中断后继续: 检查点跳过 {uploader.counters['skipped']} 条，新建 {uploader.counters['created']} 条，"
+          f"重复提交 {exists} 条，失败 {len(failures)} 条")
+
+
+if __name__ == '__main__':
+    main()
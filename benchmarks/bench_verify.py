@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DNS解析验证性能测试
+
+使用 zone_generator 生成模拟记录并转换，在本机启动模拟DNS服务器（stub_dns_server），
+再用 dns_verify.DNSVerifier 并发查询全部记录，测量每分钟的查询数。全程离线运行。
+
+可按比例丢弃查询或篡改应答，检查超时重试和不一致记录能否被正确报告。
+
+使用方法：
+    python benchmarks/bench_verify.py --records 50000 --concurrency 200
+    python benchmarks/bench_verify.py --records 5000 --drop-rate 0.05 --corrupt-rate 0.01 --timeout 0.2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_converter import DNSConverter  # noqa: E402
+from dns_verify import DNSVerifier, expected_rrsets, print_verify_summary  # noqa: E402
+from stub_dns_server import start_stub_server  # noqa: E402
+from zone_generator import generate_zone  # noqa: E402
+
+ZONE = 'example.com'
+
+
+async def run(args, dnspod_df, converter):
+    rrsets = {key: sorted(rrset['values']) for key, rrset in expected_rrsets(dnspod_df, ZONE).items()}
+    transport, server = await start_stub_server(rrsets, drop_rate=args.drop_rate,
+                                                corrupt_rate=args.corrupt_rate)
+    port = transport.get_extra_info('sockname')[1]
+    verifier = DNSVerifier('127.0.0.1', port, args.concurrency, args.timeout, args.retries, converter)
+    try:
+        start = time.perf_counter()
+        report = await verifier.verify_async(dnspod_df, ZONE)
+        elapsed = time.perf_counter() - start
+    finally:
+        transport.close()
+    return report, elapsed, server.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DNS解析验证性能测试')
+    parser.add_argument('--records', type=int, default=50000, help='模拟记录条数（默认50000）')
+    parser.add_argument('--concurrency', type=int, default=200, help='最大并发查询数（默认200）')
+    parser.add_argument('--timeout', type=float, default=1.0, help='单次查询超时秒数（默认1）')
+    parser.add_argument('--retries', type=int, default=2, help='重试次数（默认2）')
+    parser.add_argument('--drop-rate', type=float, default=0.0, help='模拟服务器丢弃查询的比例')
+    parser.add_argument('--corrupt-rate', type=float, default=0.0, help='模拟服务器少返回一条记录的比例')
+    args = parser.parse_args()
+
+    converter = DNSConverter(zone=ZONE)
+    with contextlib.redirect_stdout(io.StringIO()):
+        dnspod_df = converter.convert_dns_records_vectorized(
+            converter.normalize_column_names(generate_zone(args.records)))
+
+    report, elapsed, stats = asyncio.run(run(args, dnspod_df, converter))
+    print_verify_summary(report)
+
+    counters = converter.counters
+    print(f"\n服务器收到 {stats['queries']} 个查询（丢弃 {stats['dropped']}，篡改 {stats['corrupted']}）")
+    print(f"客户端发出 {counters['verify_queries']} 个查询（重试 {counters['verify_retries']}，"
+          f"最终超时 {counters['verify_timeouts']}）")
+    print(f"用时 {elapsed:.2f} 秒，{counters['verify_queries'] / elapsed * 60:.0f} 个查询/分钟")
+
+
+if __name__ == '__main__':
+    main()
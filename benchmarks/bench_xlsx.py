@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+XLSX 转换路径的时间与内存对比
+
+生成华为云格式的模拟Excel文件，分别以普通模式（pd.read_excel 读取）和
+流式模式（openpyxl 只读模式读取 + write-only 模式写出）在子进程中转换，
+报告耗时和峰值内存，并校验两种模式的输出一致。
+
+使用方法：
+    python benchmarks/bench_xlsx.py --records 100000
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from zone_generator import generate_zone, save_zone  # noqa: E402
+
+# 在子进程中运行转换并输出峰值内存（KB，Linux下 ru_maxrss 单位为KB）
+RUNNER = (
+    "import resource, sys, runpy\n"
+    "sys.argv = sys.argv[1:]\n"
+    "try:\n"
+    "    runpy.run_path(sys.argv[0], run_name='__main__')\n"
+    "finally:\n"
+    "    print('PEAK_RSS_KB', resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, file=sys.stderr)\n"
+)
+
+
+def run_converter(*args) -> tuple:
+    """在子进程中运行 dns_converter.py，返回 (耗时秒数, 峰值内存MB)"""
+    command = [sys.executable, '-c', RUNNER, os.path.join(REPO_DIR, 'dns_converter.py'), *args]
+    start = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    peak_kb = int(result.stderr.rsplit('PEAK_RSS_KB', 1)[1].split()[0])
+    return elapsed, peak_kb / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='XLSX 转换路径的时间与内存对比')
+    parser.add_argument('--records', type=int, default=100000, help='模拟记录条数')
+    parser.add_argument('--chunksize', type=int, default=20000, help='流式模式每块记录数')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, 'huawei.xlsx')
+        save_zone(generate_zone(args.records), input_path)
+
+        pandas_out = os.path.join(tmp, 'pandas.xlsx')
+        stream_out = os.path.join(tmp, 'stream.xlsx')
+        pandas_time, pandas_mem = run_converter(input_path, '-o', pandas_out)
+        stream_time, stream_mem = run_converter(input_path, '-o', stream_out, '--stream',
+                                                '--chunksize', str(args.chunksize))
+        pd.testing.assert_frame_equal(pd.read_excel(pandas_out), pd.read_excel(stream_out))
+
+    print(f"输入记录: {args.records} 条（两种模式输出一致）")
+    print(f"普通模式: {pandas_time:.2f} 秒，峰值内存 {pandas_mem:.0f} MB")
+    print(f"流式模式: {stream_time:.2f} 秒，峰值内存 {stream_mem:.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地模拟DNSPOD API服务器
+
+在本机启动一个按腾讯云API 3.0格式应答 CreateRecord 的HTTP服务器，用于离线运行
+dns_upload.py 和 bench_upload.py：
+
+- 按令牌桶限制每秒请求数，超过时返回 RequestLimitExceeded
+- 可按比例返回 InternalError（模拟服务器偶发错误、触发重试）并模拟响应延迟
+- 同一域名下 (SubDomain, RecordType, RecordLine, Value) 相同的记录返回 InvalidParameter.DomainRecordExist
+- 指定 --require-auth 时检查请求是否带有TC3-HMAC-SHA256签名
+
+与真实API一样，业务错误也返回HTTP 200，错误信息在 Response.Error 中。
+
+使用方法：
+    python benchmarks/mock_dnspod_api.py --port 8054 --rate 50 --error-rate 0.02
+    python dns_upload.py dnspod_template.xlsx --domain example.com --endpoint http://127.0.0.1:8054
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_upload import CREATE_RECORD_ACTION, TokenBucket  # noqa: E402
+
+# CreateRecord 的必填参数
+REQUIRED_FIELDS = ('Domain', 'RecordType', 'RecordLine', 'Value')
+
+
+class MockDNSPODAPI:
+    """模拟API的状态：已创建的记录、限频令牌桶和请求统计"""
+
+    def __init__(self, rate: float = 20.0, burst: int = None, error_rate: float = 0.0,
+                 latency: float = 0.0, require_auth: bool = False, seed: int = 0):
+        self.limiter = TokenBucket(rate, burst)
+        self.error_rate = error_rate
+        self.latency = latency
+        self.require_auth = require_auth
+        self.random = random.Random(seed)
+        self.records: Dict[Tuple, int] = {}
+        self.stats = Counter()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def create_record(self, action: str, authorization: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """处理一个请求，返回 Response 的内容"""
+        with self._lock:
+            self.stats['requests'] += 1
+        if action != CREATE_RECORD_ACTION:
+            return self.error('InvalidAction', f'接口 {action} 不存在')
+        if self.require_auth and not authorization.startswith('TC3-HMAC-SHA256 Credential='):
+            return self.error('AuthFailure.SignatureFailure', '请求签名验证失败')
+        if not self.limiter.try_acquire():
+            return self.error('RequestLimitExceeded', '请求的次数超过了频率限制')
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            failed = self.error_rate and self.random.random() < self.error_rate
+        if failed:
+            return self.error('InternalError', '内部错误')
+        missing = [field for field in REQUIRED_FIELDS if not params.get(field)]
+        if missing:
+            return self.error('MissingParameter', f"缺少参数: {', '.join(missing)}")
+
+        key = (params['Domain'], params.get('SubDomain', '@'), params['RecordType'],
+               params['RecordLine'], str(params['Value']))
+        with self._lock:
+            exists = key in self.records
+            if not exists:
+                record_id = self.records[key] = next(self._ids)
+        if exists:
+            return self.error('InvalidParameter.DomainRecordExist', '记录已经存在')
+        return {'RecordId': record_id}
+
+    def error(self, code: str, message: str) -> Dict[str, Any]:
+        with self._lock:
+            self.stats[code] += 1
+        return {'Error': {'Code': code, 'Message': message}}
+
+
+class MockAPIRequestHandler(BaseHTTPRequestHandler):
+    """模拟API的HTTP请求处理（保持连接）"""
+
+    protocol_version = 'HTTP/1.1'
+    # 响应头和响应体分两次发送，关闭Nagle算法以免与客户端的延迟确认叠加出约40毫秒的等待
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        try:
+            params = json.loads(body or b'{}')
+        except ValueError:
+            response = self.server.api.error('InvalidParameter', '请求体不是有效的JSON')
+        else:
+            response = self.server.api.create_record(self.headers.get('X-TC-Action', ''),
+                                                     self.headers.get('Authorization', ''), params)
+        response['RequestId'] = str(uuid.uuid4())
+        data = json.dumps({'Response': response}, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def create_mock_server(api: MockDNSPODAPI, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    """创建模拟API服务器（port 为0时使用临时端口）"""
+    server = ThreadingHTTPServer((host, port), MockAPIRequestHandler)
+    server.daemon_threads = True
+    server.api = api
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地模拟DNSPOD API服务器')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址（默认127.0.0.1）')
+    parser.add_argument('--port', type=int, default=8054, help='监听端口（默认8054）')
+    parser.add_argument('--rate', type=float, default=20.0, help='每秒允许的请求数，超过时返回限频错误（默认20）')
+    parser.add_argument('--burst', type=int, help='允许的瞬时突发请求数（默认与 --rate 相同）')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='返回InternalError的比例（0-1）')
+    parser.add_argument('--latency', type=float, default=0.0, help='每个请求的模拟处理时间（秒）')
+    parser.add_argument('--require-auth', action='store_true', help='拒绝没有TC3-HMAC-SHA256签名的请求')
+    args = parser.parse_args()
+
+    api = MockDNSPODAPI(args.rate, args.burst, args.error_rate, args.latency, args.require_auth)
+    server = create_mock_server(api, args.host, args.port)
+    print(f"模拟DNSPOD API已启动: http://{args.host}:{args.port}（每秒 {args.rate:g} 个请求）", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"已创建 {len(api.records)} 条记录，请求统计: {dict(api.stats)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地模拟DNS服务器
+
+按转换后的DNSPOD记录在本机启动一个只响应UDP查询的权威DNS服务器，用于离线运行
+dns_verify.py 和 bench_verify.py。可按比例丢弃查询（模拟丢包、触发重试）或篡改
+部分应答（模拟解析不一致）。
+
+使用方法：
+    python benchmarks/stub_dns_server.py huawei_dns.xlsx --zone example.com --port 5353
+    python dns_verify.py huawei_dns.xlsx --zone example.com --server 127.0.0.1:5353
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_converter import DNSConverter  # noqa: E402
+from dns_verify import (QTYPE_NAMES, DNSMessageError, build_response, expected_rrsets,  # noqa: E402
+                        read_name)
+
+
+class StubDNSServer(asyncio.DatagramProtocol):
+    """按内存中的记录集合应答查询的UDP服务器"""
+
+    def __init__(self, rrsets: Dict[Tuple[str, str], List[str]], drop_rate: float = 0.0,
+                 corrupt_rate: float = 0.0, seed: int = 0):
+        self.rrsets = rrsets
+        self.names = {name for name, _ in rrsets}
+        self.drop_rate = drop_rate
+        self.corrupt_rate = corrupt_rate
+        self.random = random.Random(seed)
+        self.transport = None
+        self.stats = defaultdict(int)
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.stats['queries'] += 1
+        if self.drop_rate and self.random.random() < self.drop_rate:
+            self.stats['dropped'] += 1
+            return
+        try:
+            name, offset = read_name(data, 12)
+            qtype = QTYPE_NAMES.get(int.from_bytes(data[offset:offset + 2], 'big'))
+        except (DNSMessageError, IndexError):
+            return
+
+        name = name.lower()
+        if name not in self.names:
+            response = build_response(data, [], rcode=3)
+        else:
+            values = self.rrsets.get((name, qtype), [])
+            if values and self.corrupt_rate and self.random.random() < self.corrupt_rate:
+                self.stats['corrupted'] += 1
+                values = values[1:]
+            response = build_response(data, [(qtype, value) for value in values])
+        self.transport.sendto(response, addr)
+
+
+def load_rrsets(input_file: str, zone: str) -> Dict[Tuple[str, str], List[str]]:
+    """读取导出文件并转换，返回 {(完整域名, 记录类型): [记录值]}"""
+    converter = DNSConverter(zone=zone)
+    dnspod_df = converter.convert_dns_records_vectorized(converter.read_dns_file(input_file))
+    return {key: sorted(rrset['values']) for key, rrset in expected_rrsets(dnspod_df, zone).items()}
+
+
+async def start_stub_server(rrsets: Dict[Tuple[str, str], List[str]], host: str = '127.0.0.1',
+                            port: int = 0, **options) -> Tuple[asyncio.DatagramTransport, StubDNSServer]:
+    """在当前事件循环中启动模拟服务器（port 为0时使用随机端口）"""
+    loop = asyncio.get_running_loop()
+    return await loop.create_datagram_endpoint(lambda: StubDNSServer(rrsets, **options), local_addr=(host, port))
+
+
+async def serve(rrsets, host: str, port: int, drop_rate: float, corrupt_rate: float):
+    transport, server = await start_stub_server(rrsets, host, port, drop_rate=drop_rate, corrupt_rate=corrupt_rate)
+    address = transport.get_extra_info('sockname')
+    print(f"模拟DNS服务器已启动: {address[0]}:{address[1]}，共 {len(rrsets)} 组记录（Ctrl+C 退出）")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        transport.close()
+        print(f"共收到 {server.stats['queries']} 个查询")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地模拟DNS服务器')
+    parser.add_argument('input_file', help='华为云/阿里云DNS导出文件（Excel或CSV）')
+    parser.add_argument('--zone', required=True, help='主域名（如 example.com）')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址（默认127.0.0.1）')
+    parser.add_argument('--port', type=int, default=5353, help='监听端口（默认5353）')
+    parser.add_argument('--drop-rate', type=float, default=0.0, help='丢弃查询的比例（默认0）')
+    parser.add_argument('--corrupt-rate', type=float, default=0.0, help='少返回一条记录的应答比例（默认0）')
+    args = parser.parse_args()
+
+    rrsets = load_rrsets(args.input_file, args.zone.strip('.').lower())
+    try:
+        asyncio.run(serve(rrsets, args.host, args.port, args.drop_rate, args.corrupt_rate))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模拟DNS导出文件生成器
+
+按华为云、阿里云、Cloudflare或GoDaddy的导出格式生成模拟DNS记录，可配置记录条数、记录类型比例、
+A记录的多IP数量以及主机名/记录值的重复率，用于性能测试。
+
+使用方法：
+    python benchmarks/zone_generator.py 100000 -o huawei_100k.xlsx
+    python benchmarks/zone_generator.py 1000000 --provider aliyun -o aliyun_1m.csv \\
+        --type-mix A=60,CNAME=20,MX=5,TXT=10,NS=5 --fanout 3 --repetition 0.9
+"""
+
+import argparse
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+DEFAULT_TYPE_MIX = {'A': 45, 'AAAA': 5, 'CNAME': 20, 'MX': 5, 'TXT': 15, 'NS': 5, 'SRV': 5}
+
+# 各云服务商导出文件的列名
+PROVIDER_COLUMNS = {
+    'huawei': ['类型', '主机记录', '记录值', 'TTL', '备注', 'MX'],
+    'aliyun': ['记录类型', '主机记录', '解析线路', '记录值', 'MX优先级', 'TTL值', '状态(启用/暂停)'],
+    'cloudflare': ['type', 'name', 'content', 'ttl', 'priority', 'proxied'],
+    'godaddy': ['type', 'name', 'data', 'ttl', 'priority', 'weight', 'port', 'service', 'protocol'],
+}
+
+
+def parse_type_mix(text: str) -> Dict[str, float]:
+    """解析 A=50,CNAME=20 格式的记录类型比例"""
+    mix = {}
+    for item in text.split(','):
+        record_type, _, weight = item.partition('=')
+        mix[record_type.strip().upper()] = float(weight)
+    return mix
+
+
+def generate_zone(count: int, provider: str = 'huawei', type_mix: Dict[str, float] = None,
+                  fanout: int = 2, repetition: float = 0.5, zone: str = 'example.com',
+                  seed: int = 0) -> pd.DataFrame:
+    """生成模拟DNS记录
+
+    count:      记录条数
+    provider:   导出格式（huawei、aliyun、cloudflare 或 godaddy）
+    type_mix:   记录类型比例，如 {'A': 50, 'CNAME': 20}
+    fanout:     A记录最多包含的IP数量（华为云格式用换行分隔，其他格式拆分为多行）
+    repetition: 主机名和记录值的重复率（0表示几乎不重复，越接近1重复越多）
+    """
+    rng = np.random.default_rng(seed)
+    mix = type_mix or DEFAULT_TYPE_MIX
+    types = np.array(list(mix))
+    weights = np.array(list(mix.values()), dtype=float)
+    record_types = rng.choice(types, size=count, p=weights / weights.sum())
+
+    # 重复率越高，主机名和记录值取自越小的候选集合
+    pool = max(1, int(count * (1 - repetition)))
+    host_ids = rng.integers(0, pool, size=count)
+    value_ids = rng.integers(0, pool, size=count)
+    ip_counts = rng.integers(1, max(1, fanout) + 1, size=count)
+    ttls = rng.choice([300, 600, 3600, 86400], size=count)
+    mx_priorities = rng.choice([5, 10, 20], size=count)
+
+    hosts, values, mx_column = [], [], []
+    for record_type, host_id, value_id, ip_count, mx in zip(
+            record_types, host_ids, value_ids, ip_counts, mx_priorities):
+        host = '@' if host_id == 0 or record_type == 'NS' else f'host{host_id}'
+        mx_value = ''
+        if record_type == 'A':
+            value = '\n'.join(f'10.{(value_id + i) // 65536 % 256}.{(value_id + i) // 256 % 256}.'
+                              f'{(value_id + i) % 256}' for i in range(ip_count))
+        elif record_type == 'AAAA':
+            value = f'2001:db8::{value_id:x}'
+        elif record_type == 'CNAME':
+            value = f'target{value_id}.cdn.example.net'
+        elif record_type == 'MX':
+            host, value, mx_value = '@', f'mx{value_id % 10}.{zone}', int(mx)
+        elif record_type == 'TXT':
+            value = f'"v=spf1 include:_spf{value_id}.{zone} ~all"'
+        elif record_type == 'NS':
+            value = f'ns{value_id % 4}.dns-provider.com'
+        elif record_type == 'SRV':
+            host, value = f'_sip{host_id}._tcp', f'10 5 5060 sip{value_id}.{zone}'
+        else:
+            value = f'value{value_id}'
+        hosts.append(host)
+        values.append(value)
+        mx_column.append(mx_value)
+
+    if provider == 'huawei':
+        fqdn = [zone + '.' if host == '@' else f'{host}.{zone}.' for host in hosts]
+        remarks = rng.choice(['', 'Web服务器', '邮件', 'CDN'], size=count)
+        data = [record_types, fqdn, values, ttls, remarks, mx_column]
+    elif provider == 'aliyun':
+        # 阿里云的多IP为多条记录，TXT记录值不带引号
+        df = pd.DataFrame({'type': record_types, 'host': hosts, 'value': values,
+                           'mx': mx_column, 'ttl': ttls})
+        df['value'] = df['value'].str.split('\n')
+        df = df.explode('value', ignore_index=True).head(count)
+        df['value'] = df['value'].str.strip('"')
+        data = [df['type'], df['host'], '默认', df['value'], df['mx'], df['ttl'], '启用']
+    elif provider in ('cloudflare', 'godaddy'):
+        # 多IP为多条记录，MX优先级为单独的列
+        df = pd.DataFrame({'type': record_types, 'host': hosts, 'value': values,
+                           'mx': mx_column, 'ttl': ttls})
+        df['value'] = df['value'].str.split('\n')
+        df = df.explode('value', ignore_index=True).head(count)
+        if provider == 'cloudflare':
+            # 名称为完整域名，TTL为1表示自动
+            fqdn = [zone if host == '@' else f'{host}.{zone}' for host in df['host']]
+            ttl = df['ttl'].where(df.index % 4 != 0, 1)
+            data = [df['type'], fqdn, df['value'], ttl, df['mx'], df.index % 2 == 0]
+        else:
+            # SRV记录的服务、协议、优先级、权重和端口为单独的列
+            srv = (df['type'] == 'SRV').to_numpy()
+            parts = df['value'].str.split(' ', n=3)
+            labels = df['host'].str.split('.', n=1)
+            service = np.where(srv, labels.str[0], '')
+            protocol = np.where(srv, labels.str[1], '')
+            name = np.where(srv, '@', df['host'])
+            value = np.where(srv, parts.str[3], df['value'])
+            priority = np.where(srv, parts.str[0], df['mx'].astype(str))
+            data = [df['type'], name, value, df['ttl'], priority,
+                    np.where(srv, parts.str[1], ''), np.where(srv, parts.str[2], ''), service, protocol]
+    else:
+        raise ValueError(f"不支持的云服务商格式: {provider}")
+
+    return pd.DataFrame(dict(zip(PROVIDER_COLUMNS[provider], data)))
+
+
+def save_zone(dns_df: pd.DataFrame, path: str):
+    """保存模拟记录（.csv 保存为CSV，其余使用write-only模式保存为Excel）"""
+    if path.endswith('.csv'):
+        dns_df.to_csv(path, index=False, encoding='utf-8-sig')
+        return
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sheet1')
+    sheet.append(list(dns_df.columns))
+    for row in dns_df.itertuples(index=False, name=None):
+        sheet.append(row)
+    workbook.save(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成模拟DNS导出文件')
+    parser.add_argument('count', type=int, help='记录条数')
+    parser.add_argument('-o', '--output', required=True, help='输出文件路径（.csv 或 .xlsx）')
+    parser.add_argument('--provider', choices=list(PROVIDER_COLUMNS), default='huawei',
+                        help='导出格式（默认huawei）')
+    parser.add_argument('--type-mix', type=parse_type_mix, default=None,
+                        help='记录类型比例，如 A=50,CNAME=20,MX=5,TXT=15,NS=10')
+    parser.add_argument('--fanout', type=int, default=2, help='A记录最多包含的IP数量（默认2）')
+    parser.add_argument('--repetition', type=float, default=0.5,
+                        help='主机名和记录值的重复率，0-1之间（默认0.5）')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    dns_df = generate_zone(args.count, args.provider, args.type_mix, args.fanout,
+                           args.repetition, seed=args.seed)
+    save_zone(dns_df, args.output)
+    print(f"已生成 {len(dns_df)} 条{args.provider}格式记录: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -18,346 +18,1026 @@
 版本: 1.0.0
 """
 
-import pandas as pd
+from __future__ import annotations
+
 import argparse
 import sys
 import os
-from typing import List, Dict, Any
-import re
-
-
-class DNSConverter:
-    """DNS记录转换器"""
-    
-    def __init__(self):
-        # 华为云到DNSPOD的记录类型映射
-        self.type_mapping = {
-            'A': 'A',
-            'AAAA': 'AAAA', 
-            'CNAME': 'CNAME',
-            'MX': 'MX',
-            'TXT': 'TXT',
-            'NS': 'NS',
-            'SRV': 'SRV',
-            'PTR': 'PTR'
-        }
-        
-        # DNSPOD模板列名（按照正确的DNSPOD格式）
-        self.dnspod_columns = [
-            'Type',        # A列：记录类型
-            'Host',        # B列：主机记录
-            'Split Zone',  # C列：分区
-            'Value',       # D列：记录值
-            'MX',          # E列：MX优先级
-            'TTL',         # F列：TTL值
-            'Remarks'      # G列：备注
-        ]
-    
+import io
+import glob
+import time
+import contextlib
+from typing import List, Dict, Any, Iterator, Tuple
+from collections import Counter
+from itertools import chain, islice
+import json
+
+from dns_core import (IP_SEPARATORS_RE, NORMALIZED_VALUE_TYPES, DNSPODRecordBuffer, DNSPODTemplateWriter,
+                      DNSRecordConverter, LazyModule, RecordDeduplicator, normalize_record_value, timed_stage)
+from dns_input_cache import DEFAULT_INPUT_CACHE_BYTES, default_input_cache_dir
+from dns_providers import JSON_EXTENSIONS, ProviderProfile, detect_profile, is_json_file
+from dns_rewrite import RewriteRules
+from dns_shard import SHARD_SUFFIX_RE, parse_size
+from dns_validator import IPV4_RE, validate_records
+from dns_zonefile import ZONE_FILE_EXTENSIONS, ZONE_RECORD_COLUMNS, is_zone_file
+
+# pandas/numpy 在首次使用DataFrame接口时才导入，CSV的标准库转换路径不需要加载它们
+pd = LazyModule('pandas')
+np = LazyModule('numpy')
+
+# engine 为 auto 时，不超过该大小的CSV文件使用标准库转换路径：
+# 小文件的耗时主要是导入pandas，大文件则是列式引擎更快
+CORE_ENGINE_MAX_BYTES = 2 * 1024 * 1024
+
+
+class DNSConverter(DNSRecordConverter):
+    """DNS记录转换器（DataFrame接口，逐条转换规则见 DNSRecordConverter）"""
+
+    def __init__(self, *args, input_cache_dir: str = None,
+                 input_cache_bytes: int = DEFAULT_INPUT_CACHE_BYTES, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 输入文件解析结果缓存（见 dns_input_cache），未指定缓存目录时不使用
+        self.input_cache = None
+        if input_cache_dir:
+            from dns_input_cache import InputCache
+            self.input_cache = InputCache(input_cache_dir, input_cache_bytes, self.zone or '')
+
     def read_dns_file(self, file_path: str) -> pd.DataFrame:
-        """读取DNS记录文件（支持华为云和阿里云格式）"""
+        """读取DNS记录文件（支持华为云、阿里云、Cloudflare、GoDaddy导出文件，Route53等JSON记录和区域文件）
+
+        启用输入缓存时，同一文件再次读取时直接加载上次标准化后的结果。
+        """
         try:
+            self.report_progress('read', 0.0)
+            df = self._load_cached_input(file_path)
+            if df is not None:
+                self.report_progress('read', 1.0)
+                return df
+
             # 尝试读取Excel文件，支持多种格式
-            if file_path.endswith('.csv'):
-                df = pd.read_csv(file_path, encoding='utf-8-sig')
-            else:
-                df = pd.read_excel(file_path)
+            with self.stage('read'):
+                if is_zone_file(file_path):
+                    df = pd.DataFrame(list(self.iter_zone_file_records(file_path)),
+                                      columns=ZONE_RECORD_COLUMNS)
+                elif is_json_file(file_path):
+                    df = pd.DataFrame(list(self.iter_json_file_records(file_path)))
+                elif file_path.endswith('.csv'):
+                    df = pd.read_csv(file_path, encoding='utf-8-sig')
+                else:
+                    df = pd.read_excel(file_path)
+            self.report_progress('read', 1.0)
 
             print(f"成功读取DNS文件: {file_path}")
             print(f"共读取到 {len(df)} 条记录")
 
+            # 区域文件的主域名（SOA/$ORIGIN）随记录表保存，转换时使用（见 infer_dns_zone）
+            if is_zone_file(file_path):
+                df.attrs['zone'] = self.zone
+
+            # 区域文件和JSON记录读取时已使用标准列名
+            if is_zone_file(file_path) or is_json_file(file_path):
+                self._cache_input(file_path, df, '')
+                return df
+
             # 显示列名以便调试
             print(f"检测到的列名: {list(df.columns)}")
 
             # 检测云服务商类型
-            cloud_provider = self.detect_cloud_provider(df)
-            print(f"检测到云服务商: {cloud_provider}")
+            profile = self.detect_provider_profile(df.columns)
 
-            # 标准化列名
-            df = self.normalize_column_names(df)
+            # 标准化列名并执行该云服务商的记录值转换
+            df = self.normalize_column_names(df, profile)
 
+            self._cache_input(file_path, df, profile.name)
             return df
         except Exception as e:
             print(f"读取DNS文件失败: {e}")
             sys.exit(1)
 
+    def _load_cached_input(self, file_path: str) -> pd.DataFrame:
+        """从输入缓存加载文件的解析结果，未启用缓存或未命中时返回None"""
+        if self.input_cache is None:
+            return None
+        try:
+            with self.stage('read'):
+                cached = self.input_cache.get(file_path)
+        except Exception as e:
+            print(f"警告: 输入缓存不可用: {e}")
+            return None
+        if cached is None:
+            return None
+
+        df, provider = cached
+        self.counters['input_cache_hits'] += 1
+        print(f"从输入缓存加载DNS文件: {file_path}")
+        print(f"共读取到 {len(df)} 条记录")
+        if provider:
+            print(f"检测到云服务商: {provider}")
+        return df
+
+    def _cache_input(self, file_path: str, df: pd.DataFrame, provider: str):
+        """将文件的解析结果保存到输入缓存（未启用缓存时忽略）"""
+        if self.input_cache is None:
+            return
+        try:
+            self.input_cache.put(file_path, df, provider)
+        except Exception as e:
+            print(f"警告: 保存输入缓存失败: {e}")
+
+    @timed_stage('detect')
     def detect_cloud_provider(self, df: pd.DataFrame) -> str:
         """检测云服务商类型"""
-        columns = [col.lower() for col in df.columns]
-
-        # 阿里云特征：解析线路列
-        if any('解析线路' in col or '线路' in col for col in df.columns):
-            return "阿里云"
-
-        # 华为云特征：备注列
-        if any('备注' in col or 'remarks' in col.lower() for col in df.columns):
-            return "华为云"
-
-        # 默认按华为云处理
-        return "华为云"
-
-    def normalize_column_names(self, df: pd.DataFrame) -> pd.DataFrame:
-        """标准化列名，支持中英文混合"""
-        column_mapping = {
-            # 记录类型 (华为云 + 阿里云)
-            '类型': 'Type', 'type': 'Type', 'Type': 'Type', '记录类型': 'Type',
-            # 主机记录 (华为云 + 阿里云)
-            '主机记录': 'Host', 'host': 'Host', 'Host': 'Host', '名称': 'Host',
-            'name': 'Host', 'Name': 'Host', '域名': 'Host',
-            # 记录值 (华为云 + 阿里云)
-            '记录值': 'Value', 'value': 'Value', 'Value': 'Value', '值': 'Value',
-            'ip': 'Value', 'IP': 'Value', 'target': 'Value', 'Target': 'Value',
-            # TTL (华为云 + 阿里云)
-            'TTL': 'TTL', 'ttl': 'TTL', 'TTL值': 'TTL', 'TTL(秒)': 'TTL',
-            # MX优先级 (华为云 + 阿里云)
-            'MX': 'MX', 'mx': 'MX', '优先级': 'MX', 'priority': 'MX', 'Priority': 'MX',
-            'MX优先级': 'MX',
-            # 备注 (华为云)
-            '备注': 'Remarks', 'remarks': 'Remarks', 'Remarks': 'Remarks',
-            'comment': 'Remarks', 'Comment': 'Remarks', '说明': 'Remarks',
-            # 阿里云特有列（忽略这些列）
-            '解析线路': 'Line', '线路': 'Line',
-            '状态(启用/暂停)': 'Status', '状态': 'Status'
-        }
+        return detect_profile(df.columns).name
 
-        # 重命名列
-        df = df.rename(columns=column_mapping)
+    @timed_stage('normalize')
+    def normalize_column_names(self, df: pd.DataFrame, profile: ProviderProfile = None) -> pd.DataFrame:
+        """按云服务商的列名映射标准化列名（支持中英文混合），并按列执行该服务商的记录值转换"""
+        profile = profile or detect_profile(df.columns)
+        df = df.set_axis(profile.normalize_columns(df.columns), axis=1)
 
         print(f"标准化后的列名: {list(df.columns)}")
-        return df
-    
-    def parse_multiple_ips(self, value: str) -> List[str]:
-        """解析华为云A记录中的多个IP地址"""
-        if pd.isna(value) or not value:
-            return []
-        
-        # 华为云可能用换行符、分号、逗号等分隔多个IP
-        # 根据图片显示，看起来是用换行符分隔
-        ips = []
-        for line in str(value).split('\n'):
-            line = line.strip()
-            if line and self.is_valid_ip(line):
-                ips.append(line)
-        
-        return ips if ips else [str(value).strip()]
-    
-    def is_valid_ip(self, ip: str) -> bool:
-        """简单的IP地址验证"""
-        pattern = r'^(\d{1,3}\.){3}\d{1,3}$'
-        if re.match(pattern, ip):
-            parts = ip.split('.')
-            return all(0 <= int(part) <= 255 for part in parts)
-        return False
-    
-    def clean_host_record(self, host: str) -> str:
-        """清理主机记录，移除域名部分"""
-        if not host or pd.isna(host) or host == 'nan':
-            return '@'
-
-        host = str(host).strip()
-
-        # 如果是根域名标识
-        if host == '@' or host == '':
-            return '@'
-
-        # 移除末尾的点号
-        if host.endswith('.'):
-            host = host[:-1]
-
-        # 检查是否包含域名，需要提取子域名部分
-        # 常见的域名模式：www.example.com, mail.example.com, example.com
-        if '.' in host:
-            parts = host.split('.')
-
-            # 如果只有两个部分，可能是 example.com 格式，应该转为 @
-            if len(parts) == 2:
-                # 检查是否是常见的顶级域名格式
-                tld_patterns = ['.com', '.cn', '.net', '.org', '.cc', '.co']
-                if any(host.endswith(pattern) for pattern in tld_patterns):
-                    return '@'
-
-            # 如果有三个或更多部分，取第一个作为子域名
-            elif len(parts) >= 3:
-                return parts[0]
-
-        # 如果没有点号，直接返回（可能已经是正确的子域名）
-        return host
-
-    def clean_record_value(self, value: str, record_type: str) -> str:
-        """清理记录值，移除不必要的引号和格式化"""
-        if not value:
-            return value
-
-        value = str(value).strip()
-
-        # 对于TXT记录，移除首尾的引号
-        if record_type.upper() == 'TXT':
-            # 移除首尾的双引号
-            if value.startswith('"') and value.endswith('"'):
-                value = value[1:-1]
-            # 移除首尾的单引号
-            elif value.startswith("'") and value.endswith("'"):
-                value = value[1:-1]
-
-        return value
-
-    def convert_record(self, record: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """转换单条DNS记录"""
-        converted_records = []
-
-        # 获取基本信息，使用标准化后的列名
-        record_type = str(record.get('Type', '')).upper().strip()
-        host = str(record.get('Host', '')).strip()
-        value = record.get('Value', '')
-        ttl = record.get('TTL', 600)
-        mx_priority = record.get('MX', '')
-        remarks = record.get('Remarks', '')
-
-        # 跳过空记录
-        if not record_type or pd.isna(record_type) or record_type == 'NAN':
-            return converted_records
-
-        # 跳过NS记录（DNSPOD不需要导入NS记录，由服务商自动管理）
-        if record_type == 'NS':
-            print(f"跳过NS记录: {host} -> {value} (DNSPOD不需要导入NS记录)")
-            return converted_records
-
-        # 清理主机记录，移除域名部分
-        host = self.clean_host_record(host)
+        return self.apply_value_transforms(df, profile)
 
-        # 处理TTL
-        try:
-            ttl = int(float(ttl)) if ttl and not pd.isna(ttl) else 600
-        except (ValueError, TypeError):
-            ttl = 600
-
-        # 处理记录值
-        if pd.isna(value) or value == '':
-            print(f"警告: {record_type} 记录 {host} 的值为空，跳过")
-            return converted_records
-
-        # 清理记录值（移除不必要的引号）
-        value = self.clean_record_value(str(value), record_type)
-
-        # 处理备注
-        remarks = str(remarks) if remarks and not pd.isna(remarks) else ''
-        
-        # 根据记录类型处理
-        if record_type == 'A':
-            # A记录可能包含多个IP地址
-            ips = self.parse_multiple_ips(value)
-            for ip in ips:
-                converted_record = {
-                    'Type': 'A',
-                    'Host': host,
-                    'Split Zone': 'Default',
-                    'Value': ip,
-                    'MX': '-',
-                    'TTL': ttl,
-                    'Remarks': remarks
-                }
-                converted_records.append(converted_record)
-
-        elif record_type == 'MX':
-            # MX记录需要处理优先级
-            converted_record = {
-                'Type': 'MX',
-                'Host': host,
-                'Split Zone': 'Default',
-                'Value': str(value) if value and not pd.isna(value) else '',
-                'MX': str(mx_priority) if mx_priority and not pd.isna(mx_priority) else '',
-                'TTL': ttl,
-                'Remarks': remarks
-            }
-            converted_records.append(converted_record)
+    def apply_value_transforms(self, df: pd.DataFrame, profile: ProviderProfile) -> pd.DataFrame:
+        """按列执行云服务商的记录值转换（如Route53的MX记录值拆分出优先级）"""
+        if not profile.transforms:
+            return df
+        columns = {name: df[name].tolist() for name in profile.transform_inputs if name in df.columns}
+        return df.assign(**profile.transform_columns(columns, len(df)))
 
-        else:
-            # 其他记录类型直接转换
-            if record_type in self.type_mapping:
-                converted_record = {
-                    'Type': self.type_mapping[record_type],
-                    'Host': host,
-                    'Split Zone': 'Default',
-                    'Value': str(value) if value and not pd.isna(value) else '',
-                    'MX': '-',
-                    'TTL': ttl,
-                    'Remarks': remarks
-                }
-                converted_records.append(converted_record)
-        
-        return converted_records
-    
+    @timed_stage('convert')
     def convert_dns_records(self, huawei_df: pd.DataFrame) -> pd.DataFrame:
         """转换所有DNS记录"""
-        all_converted_records = []
-        
+        # 转换结果按列追加到缓冲区，不保留逐条的记录对象
+        self.infer_dns_zone(huawei_df)
+        converted = DNSPODRecordBuffer()
+        total = len(huawei_df)
+        # 进度最多报告约100次，避免大文件时输出本身成为开销
+        progress_step = max(10, total // 100)
+
         print("开始转换DNS记录...")
-        
-        for index, record in huawei_df.iterrows():
+        self.report_progress('convert', 0.0)
+
+        for position, (index, record) in enumerate(huawei_df.iterrows(), 1):
             try:
-                converted_records = self.convert_record(record.to_dict())
-                all_converted_records.extend(converted_records)
-                
-                # 显示转换进度
-                if (index + 1) % 10 == 0:
-                    print(f"已处理 {index + 1}/{len(huawei_df)} 条记录")
-                    
+                converted.extend(self.convert_record(record.to_dict()))
             except Exception as e:
                 print(f"转换第 {index + 1} 条记录时出错: {e}")
-                continue
-        
+                self.counters['errors'] += 1
+
+            # 显示转换进度
+            if position % progress_step == 0:
+                print(f"已处理 {position}/{total} 条记录")
+                self.report_progress('convert', position / total)
+
         # 创建DNSPOD格式的DataFrame
-        dnspod_df = pd.DataFrame(all_converted_records, columns=self.dnspod_columns)
-        
+        dnspod_df = converted.to_frame()
+        self.counters['input_records'] += total
+        self.counters['output_records'] += len(dnspod_df)
+        self.report_progress('convert', 1.0)
+
         print(f"转换完成！华为云 {len(huawei_df)} 条记录转换为DNSPOD {len(dnspod_df)} 条记录")
-        
+
         return dnspod_df
-    
+
+    @timed_stage('convert')
+    def convert_dns_records_vectorized(self, dns_df: pd.DataFrame) -> pd.DataFrame:
+        """按列批量转换所有DNS记录，输出与逐行转换（convert_record）完全一致
+
+        内置记录类型按列转换；register_record_handler 注册的类型逐行调用 convert_record。
+        """
+        print("开始转换DNS记录（列式模式）...")
+        self.infer_dns_zone(dns_df)
+
+        # 重复列名时与 to_dict() 的行为保持一致：以最后一列为准
+        df = dns_df.loc[:, ~dns_df.columns.duplicated(keep='last')].reset_index(drop=True)
+
+        record_type = self._per_unique(self._column_as_str(df, 'Type'),
+                                       lambda s: s.str.upper().str.strip())
+        raw_host = self._per_unique(self._column_as_str(df, 'Host'), lambda s: s.str.strip())
+        keep = (record_type != '') & (record_type != 'NAN')
+
+        # 通过 register_record_handler 注册的类型交给逐行转换
+        custom_mask = keep & record_type.isin(list(self.custom_record_types))
+        keep &= ~custom_mask
+
+        # 跳过NS记录（DNSPOD不需要导入NS记录，由服务商自动管理）
+        ns_mask = keep & (record_type == 'NS')
+        if ns_mask.any():
+            ns_values = self._column_as_str(df, 'Value')[ns_mask]
+            for host, value in zip(raw_host[ns_mask], ns_values):
+                print(f"跳过NS记录: {host} -> {value} (DNSPOD不需要导入NS记录)")
+        self.counters['ns_skipped'] += int(ns_mask.sum())
+        keep &= ~ns_mask
+
+        # TTL无法按列处理的行（如无穷大）交给逐行转换，以保证错误处理一致
+        ttl, ttl_failed = self._ttl_column(df)
+        fallback_mask = custom_mask | (keep & ttl_failed)
+        keep &= ~ttl_failed
+
+        host = self._per_unique(raw_host, self._clean_host_column)
+
+        # 跳过空值记录
+        if 'Value' in df.columns:
+            raw_value = df['Value']
+            value_missing = raw_value.isna() | (raw_value == '')
+        else:
+            value_missing = pd.Series(True, index=df.index)
+        empty_mask = keep & value_missing
+        for rtype, h in zip(record_type[empty_mask], host[empty_mask]):
+            print(f"警告: {rtype} 记录 {h} 的值为空，跳过")
+        self.counters['empty_values'] += int(empty_mask.sum())
+        keep &= ~value_missing
+
+        # 清理记录值：去除首尾空白，TXT记录去除成对的首尾引号
+        value = self._per_unique(self._column_as_str(df, 'Value'), lambda s: s.str.strip())
+        is_txt = record_type == 'TXT'
+        if is_txt.any():
+            value = value.mask(is_txt, self._per_unique(value[is_txt], self._unquote_column))
+
+        remarks = self._truthy_str_column(df, 'Remarks')
+        mx_priority = self._truthy_str_column(df, 'MX')
+
+        keep &= record_type.isin(list(self.type_mapping))
+        a_mask = keep & (record_type == 'A')
+        other_mask = keep & ~a_mask
+
+        frames = [pd.DataFrame({
+            'Type': record_type[other_mask].map(self.type_mapping),
+            'Host': host[other_mask],
+            'Value': value[other_mask],
+            'MX': mx_priority[other_mask].where(record_type[other_mask] == 'MX', '-'),
+            'TTL': ttl[other_mask],
+            'Remarks': remarks[other_mask],
+        })]
+
+        # A记录：按换行、逗号、分号等分隔符拆分多个IP并展开为多行（规则与 parse_multiple_ips 一致）
+        a_values = value[a_mask]
+        if len(a_values):
+            lines = self._map_values(a_values, IP_SEPARATORS_RE.split).explode()
+            valid = self._valid_ipv4_mask(lines)
+            has_valid = valid.groupby(level=0).any().reindex(a_values.index, fill_value=False)
+            # 没有任何合法IP时保留原始值（与 parse_multiple_ips 一致）
+            ips = pd.concat([lines[valid], a_values[~has_valid & (a_values != '')]])
+            self.counters['ip_fanout'] += len(ips) - ips.index.nunique()
+            frames.append(pd.DataFrame({
+                'Type': 'A',
+                'Host': host.loc[ips.index],
+                'Value': ips,
+                'MX': '-',
+                'TTL': ttl.loc[ips.index],
+                'Remarks': remarks.loc[ips.index],
+            }))
+
+        # 逐行转换的记录已在 convert_record 中应用改写规则
+        if self.rewrite_rules is not None:
+            frames = [self.rewrite_frame(frame) for frame in frames]
+
+        for index in df.index[fallback_mask]:
+            try:
+                converted_records = self.convert_record(df.loc[index].to_dict())
+            except Exception as e:
+                print(f"转换第 {dns_df.index[index] + 1} 条记录时出错: {e}")
+                self.counters['errors'] += 1
+                continue
+            if converted_records:
+                frames.append(pd.DataFrame([tuple(record) for record in converted_records],
+                                           columns=self.dnspod_columns,
+                                           index=[index] * len(converted_records)))
+
+        dnspod_df = pd.concat(frames).sort_index(kind='stable').reset_index(drop=True)
+        if dnspod_df.empty:
+            dnspod_df = pd.DataFrame([], columns=self.dnspod_columns)
+        else:
+            dnspod_df['Split Zone'] = 'Default'
+            dnspod_df = dnspod_df[self.dnspod_columns].astype({'TTL': 'int64'}).infer_objects()
+
+        self.counters['input_records'] += len(dns_df)
+        self.counters['output_records'] += len(dnspod_df)
+        self.report_progress('convert', 1.0)
+        print(f"转换完成！华为云 {len(dns_df)} 条记录转换为DNSPOD {len(dnspod_df)} 条记录")
+
+        return dnspod_df
+
+    def infer_dns_zone(self, dns_df: pd.DataFrame):
+        """未指定主域名时按记录表的主机名确定主域名（见 infer_file_zone），区域文件的主域名保存在 attrs['zone']"""
+        if self.configured_zone is not None or self._file_zone_fixed or not self.infer_file_zones:
+            return
+        hosts = dns_df['Host'] if 'Host' in dns_df.columns else pd.Series([], dtype=object)
+        if isinstance(hosts, pd.DataFrame):
+            # 重复列名时以最后一列为准
+            hosts = hosts.iloc[:, -1]
+        self.infer_file_zone(hosts.value_counts().items(), dns_df.attrs.get('zone'))
+
+    def rewrite_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """按改写规则改写DNSPOD记录表的记录值和TTL，去掉被类型过滤规则排除的行（与 rewrite_records 一致）"""
+        if frame.empty:
+            return frame
+        apply = self.rewrite_rules.apply
+        results = [apply(record_type, host, value, int(ttl)) for record_type, host, value, ttl
+                   in zip(frame['Type'].tolist(), frame['Host'].tolist(), frame['Value'].tolist(),
+                          frame['TTL'].tolist())]
+        kept = [result is not None for result in results]
+        self.counters['rewrite_filtered'] += kept.count(False)
+        frame = frame[kept]
+        values = [result[0] for result in results if result is not None]
+        ttls = [result[1] for result in results if result is not None]
+        self.counters['rewrite_values'] += sum(new != old for new, old in zip(values, frame['Value'].tolist()))
+        self.counters['rewrite_ttls'] += sum(new != old for new, old in zip(ttls, frame['TTL'].tolist()))
+        return frame.assign(Value=values, TTL=ttls)
+
+    @timed_stage('parallel')
+    def convert_dns_records_parallel(self, dns_df: pd.DataFrame, workers: int, engine: str = 'vectorized',
+                                     chunk_rows: int = None) -> pd.DataFrame:
+        """将记录分块后在多个进程中并行转换，按原始顺序合并结果，输出与单进程转换一致（见 dns_parallel）
+
+        整个并行转换的耗时计入 parallel 阶段；回退为单进程转换时另外计入 convert 阶段。
+        """
+        from dns_parallel import convert_parallel, merge_chunk_counters, plan_chunks, print_chunk_summary
+
+        # 子进程使用父进程确定的主域名（converter_options）
+        self.infer_dns_zone(dns_df)
+        convert = self.convert_dns_records if engine == 'row' else self.convert_dns_records_vectorized
+        chunks = plan_chunks(len(dns_df), workers, chunk_rows)
+        if workers <= 1 or len(chunks) <= 1:
+            return convert(dns_df)
+        if self.custom_record_types:
+            # 注册的转换函数不一定能传给子进程
+            print("已注册自定义记录类型，使用单进程转换")
+            return convert(dns_df)
+
+        print(f"开始并行转换DNS记录（{min(workers, len(chunks))} 个进程，{len(chunks)} 块）...")
+        self.report_progress('convert', 0.0)
+        try:
+            dnspod_df, reports = convert_parallel(dns_df, self.converter_options(), engine, workers, chunk_rows,
+                                                  lambda fraction: self.report_progress('convert', fraction))
+        except Exception as e:
+            print(f"并行转换失败: {e}")
+            sys.exit(1)
+
+        self.counters.update(merge_chunk_counters(reports))
+        self.chunk_reports = reports
+        print_chunk_summary(reports)
+        print(f"转换完成！华为云 {len(dns_df)} 条记录转换为DNSPOD {len(dnspod_df)} 条记录")
+        return dnspod_df
+
+    @timed_stage('dedup')
+    def deduplicate_records(self, dnspod_df: pd.DataFrame, deduplicator: RecordDeduplicator) -> pd.DataFrame:
+        """去除重复记录并检查TTL冲突（规则见 RecordDeduplicator），分块转换时各块共用同一个 deduplicator"""
+        if dnspod_df.empty:
+            return dnspod_df
+
+        join = deduplicator.KEY_SEPARATOR.join
+        record_type = dnspod_df['Type'].astype(str)
+        value_key = dnspod_df['Value'].astype(str).astype(object)
+        special = record_type.isin(NORMALIZED_VALUE_TYPES).to_numpy()
+        if special.any():
+            value_key[special] = list(map(normalize_record_value, record_type[special].tolist(),
+                                          value_key[special].tolist()))
+        host_key = self._map_values(dnspod_df['Host'].astype(str), str.lower)
+
+        rrsets = list(map(join, zip(record_type.tolist(), host_key.tolist(),
+                                    dnspod_df['Split Zone'].astype(str).tolist())))
+        keys = list(map(join, zip(rrsets, value_key.tolist())))
+        keep = np.array(deduplicator.keep_mask(rrsets, keys, dnspod_df['TTL'].tolist()), dtype=bool)
+        if keep.all():
+            return dnspod_df
+        return dnspod_df[keep].reset_index(drop=True)
+
+    def _column_as_str(self, df: pd.DataFrame, column: str) -> pd.Series:
+        """按 str() 规则将列转换为字符串，列不存在时返回空字符串"""
+        if column not in df.columns:
+            return pd.Series('', index=df.index, dtype=object)
+        return df[column].map(str).astype(str)
+
+    def _per_unique(self, series: pd.Series, column_func) -> pd.Series:
+        """只对字符串列中的不同值执行列操作，再按原顺序展开"""
+        codes, uniques = pd.factorize(series)
+        result = column_func(pd.Series(uniques, dtype=series.dtype)).to_numpy(dtype=object)
+        return pd.Series(result[codes], index=series.index, dtype=series.dtype)
+
+    def _map_values(self, series: pd.Series, func) -> pd.Series:
+        """对列中每个不同的值只调用一次 func"""
+        if series.dtype == object:
+            # object 列中 1、1.0、True 哈希相等，不能按唯一值合并
+            return series.map(func)
+        codes, uniques = pd.factorize(series, use_na_sentinel=False)
+        mapped = np.empty(len(uniques), dtype=object)
+        mapped[:] = [func(unique) for unique in uniques]
+        return pd.Series(mapped[codes], index=series.index)
+
+    def _truthy_str_column(self, df: pd.DataFrame, column: str) -> pd.Series:
+        """空值、NaN 和 0 转为空字符串，其余按 str() 转换（用于MX和备注列）"""
+        if column not in df.columns:
+            return pd.Series('', index=df.index, dtype=object)
+        return self._map_values(df[column], lambda v: str(v) if v and not pd.isna(v) else '')
+
+    def _ttl_column(self, df: pd.DataFrame):
+        """按列标准化TTL，返回 (TTL列, 无法按列处理的行掩码)"""
+        if 'TTL' not in df.columns:
+            return pd.Series(600, index=df.index, dtype='int64'), pd.Series(False, index=df.index)
+
+        column = df['TTL']
+        if pd.api.types.is_numeric_dtype(column) or pd.api.types.is_bool_dtype(column):
+            values = column.to_numpy(dtype='float64', na_value=np.nan)
+            missing = np.isnan(values) | (values == 0)
+            failed = ~missing & ~(np.abs(values) < 2.0 ** 63)
+            ttl = np.where(missing | failed, 600, np.trunc(np.where(failed, 0, values))).astype('int64')
+            return pd.Series(ttl, index=df.index), pd.Series(failed, index=df.index)
+
+        def coerce(value):
+            try:
+                return self.normalize_ttl(value)
+            except Exception:
+                return None
+
+        ttl = self._map_values(column, coerce)
+        failed = ttl.isna()
+        return ttl.where(~failed, 600).astype('int64'), failed
+
+    def _clean_host_column(self, host: pd.Series) -> pd.Series:
+        """按列清理主机记录（调用方只传入不同的主机名，每个只清理一次）"""
+        return host.map(self.clean_host_record)
+
+    def _unquote_column(self, value: pd.Series) -> pd.Series:
+        """按列移除成对的首尾双引号或单引号（规则与 clean_record_value 一致）"""
+        quoted = ((value.str.startswith('"') & value.str.endswith('"')) |
+                  (value.str.startswith("'") & value.str.endswith("'")))
+        return value.mask(quoted, value.str[1:-1])
+
+    def _valid_ipv4_mask(self, values: pd.Series) -> pd.Series:
+        """按列判断是否为合法IPv4地址"""
+        return values.str.fullmatch(IPV4_RE.pattern).fillna(False).astype(bool)
+
+    @timed_stage('write')
     def save_dnspod_template(self, dnspod_df: pd.DataFrame, output_path: str):
-        """保存DNSPOD模板文件"""
+        """保存DNSPOD模板文件（.csv 后缀保存为CSV，其余保存为Excel）"""
         try:
-            dnspod_df.to_excel(output_path, index=False)
+            self.report_progress('write', 0.0)
+            with DNSPODTemplateWriter(output_path, list(dnspod_df.columns), self.zone) as writer:
+                writer.write(dnspod_df, lambda fraction: self.report_progress('write', fraction))
             print(f"DNSPOD模板已保存到: {output_path}")
         except Exception as e:
             print(f"保存DNSPOD模板失败: {e}")
             sys.exit(1)
-    
+
+    @timed_stage('write')
+    def save_dnspod_shards(self, dnspod_df: pd.DataFrame, output_path: str, max_records: int = None,
+                           max_bytes: int = None, group_by: str = None, workers: int = None) -> Dict[str, Any]:
+        """按记录数或字节数上限将DNSPOD模板拆分为多个文件并发写出，同时保存分片清单（见 dns_shard）"""
+        from dns_shard import manifest_path_for, print_shard_summary, write_shards
+
+        try:
+            manifest = write_shards(dnspod_df, output_path, max_records, max_bytes, group_by,
+                                    workers, self.zone)
+        except Exception as e:
+            print(f"保存DNSPOD模板失败: {e}")
+            sys.exit(1)
+        self.counters['shards'] += len(manifest['shards'])
+        print_shard_summary(manifest, manifest_path_for(output_path))
+        return manifest
+
+    def iter_dns_chunks(self, file_path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+        """分块读取DNS记录文件（CSV、XLSX或区域文件），云服务商检测和列名标准化只根据表头执行一次"""
+        if is_zone_file(file_path):
+            records = self.iter_zone_file_records(file_path)
+            while True:
+                with self.stage('read'):
+                    chunk = list(islice(records, chunksize))
+                if not chunk:
+                    return
+                yield pd.DataFrame(chunk, columns=ZONE_RECORD_COLUMNS)
+
+        if is_json_file(file_path):
+            records = self.iter_json_file_records(file_path)
+            while True:
+                with self.stage('read'):
+                    chunk = list(islice(records, chunksize))
+                if not chunk:
+                    return
+                yield pd.DataFrame(chunk)
+
+        if file_path.endswith('.csv'):
+            header_df = pd.read_csv(file_path, encoding='utf-8-sig', nrows=0)
+            raw_chunks = self._iter_csv_chunks(file_path, chunksize, len(header_df.columns))
+        elif file_path.endswith('.xlsx'):
+            rows = self._iter_xlsx_rows(file_path)
+            header = next(rows, None)
+            if header is None:
+                raise ValueError(f"Excel文件中没有数据: {file_path}")
+            from pandas.io.parsers import TextParser
+            header_df = TextParser([header], header=0).read()
+            with self.stage('read'):
+                dtypes = self._infer_xlsx_dtypes(file_path, chunksize)
+            raw_chunks = self._iter_xlsx_chunks(header, rows, chunksize, dtypes)
+        else:
+            raise ValueError("流式模式仅支持CSV、XLSX、JSON和区域文件格式的输入文件")
+
+        print(f"检测到的列名: {list(header_df.columns)}")
+        profile = self.detect_provider_profile(header_df.columns)
+        with self.stage('normalize'):
+            columns = profile.normalize_columns(header_df.columns)
+        print(f"标准化后的列名: {columns}")
+
+        while True:
+            with self.stage('read'):
+                chunk = next(raw_chunks, None)
+            if chunk is None:
+                break
+            chunk.columns = columns
+            if profile.transforms:
+                with self.stage('normalize'):
+                    chunk = self.apply_value_transforms(chunk, profile)
+            yield chunk
+
+    def _iter_csv_chunks(self, file_path: str, chunksize: int, width: int) -> Iterator[pd.DataFrame]:
+        """分块读取CSV，各列的类型按整个文件推断（与一次读取整个文件的 pd.read_csv 一致）
+
+        pd.read_csv 的 chunksize 模式按块分别推断类型，同一列在不同块中可能是整数、浮点数
+        或字符串（如MX优先级 10 与 10.0）。这里先用 core 引擎的第一遍扫描确定各列的解析函数，
+        再以字符串读取每一块并逐列解析。
+        """
+        parsers = self._infer_csv_columns(file_path, width)
+        reader = pd.read_csv(file_path, encoding='utf-8-sig', chunksize=chunksize,
+                             dtype=str, keep_default_na=False, na_filter=False)
+        for chunk in reader:
+            for position, parse in enumerate(parsers):
+                if parse is not None:
+                    chunk.isetitem(position, [parse(text) for text in chunk.iloc[:, position]])
+            yield chunk
+
+    def _iter_xlsx_rows(self, file_path: str) -> Iterator[tuple]:
+        """使用openpyxl只读模式逐行读取第一个工作表，单元格取值规则与 pd.read_excel 一致"""
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for row in workbook.worksheets[0].iter_rows(values_only=True):
+                # 与 pd.read_excel 一致：跳过空行，整数值的浮点数转为整数
+                if all(cell is None for cell in row):
+                    continue
+                yield tuple('' if cell is None
+                            else int(cell) if isinstance(cell, float) and cell.is_integer()
+                            else cell
+                            for cell in row)
+        finally:
+            workbook.close()
+
+    def _iter_xlsx_chunks(self, header: tuple, rows: Iterator[tuple], chunksize: int,
+                          dtypes: Dict[str, Any] = None) -> Iterator[pd.DataFrame]:
+        """将逐行读取的Excel数据按块解析为DataFrame，行号在各块之间连续
+
+        指定 dtypes（列名 → 类型）时各块按这些类型解析，否则按块分别推断。
+        """
+        from pandas.io.parsers import TextParser
+
+        start = 0
+        while True:
+            batch = list(islice(rows, chunksize))
+            if not batch:
+                break
+            chunk = TextParser([header] + batch, header=0, dtype=dtypes).read()
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            yield chunk
+
+    def _infer_xlsx_dtypes(self, file_path: str, chunksize: int) -> Dict[str, Any]:
+        """第一遍扫描：返回一次读取整个Excel文件时各列的类型（与 pd.read_excel 一致）
+
+        与CSV相同，按块解析时同一列在不同块中可能是整数、浮点数或字符串（如MX优先级
+        10 与 10.0）。这里记录各块中非空值推断出的类型、是否有空值，以及单元格是否都是文本，
+        再按整个文件合并：只有数值和布尔值时，有空值或浮点数为浮点数，否则为整数或布尔值；
+        各块的类型相同时不变；其他情况下单元格都是文本时为字符串，否则为 object（保留单元格原来的值）；
+        整列为空时为浮点数。布尔值与数值混合的列（很少见）可能与一次读取的结果不同。
+        """
+        kinds: Dict[str, set] = {}
+        has_missing = set()
+        # 含有非文本单元格的列（按位置）
+        non_text = set()
+
+        def track(rows):
+            for row in rows:
+                non_text.update(position for position, cell in enumerate(row)
+                                if cell != '' and not isinstance(cell, str))
+                yield row
+
+        rows = self._iter_xlsx_rows(file_path)
+        header = next(rows, None)
+        if header is not None:
+            for chunk in self._iter_xlsx_chunks(header, track(rows), chunksize):
+                for column, values in chunk.items():
+                    missing = values.isna()
+                    if missing.any():
+                        has_missing.add(column)
+                    column_kinds = kinds.setdefault(column, set())
+                    if not missing.all():
+                        column_kinds.add(values.dtype)
+
+        dtypes = {}
+        for position, (column, column_kinds) in enumerate(kinds.items()):
+            if all(isinstance(kind, np.dtype) and kind.kind in 'biuf' for kind in column_kinds):
+                if not column_kinds or column in has_missing or any(kind.kind == 'f' for kind in column_kinds):
+                    dtypes[column] = np.dtype('float64')
+                elif any(kind.kind in 'iu' for kind in column_kinds):
+                    dtypes[column] = np.dtype('int64')
+                else:
+                    dtypes[column] = np.dtype(bool)
+            elif len(column_kinds) == 1:
+                dtypes[column] = column_kinds.pop()
+            else:
+                text_kinds = [kind for kind in column_kinds if isinstance(kind, pd.StringDtype)]
+                dtypes[column] = text_kinds[0] if text_kinds and position not in non_text else np.dtype(object)
+        return dtypes
+
+    @timed_stage('validate')
+    def split_invalid_records(self, dnspod_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """按记录类型校验转换结果，返回 (通过校验的记录, 未通过校验的记录及原因)"""
+        reasons = validate_records(dnspod_df)
+        invalid = reasons != ''
+        rejects_df = dnspod_df[invalid].assign(Reason=reasons[invalid])
+        self.counters['rejected'] += len(rejects_df)
+        return dnspod_df[~invalid].reset_index(drop=True), rejects_df
+
+    def convert_file_streaming(self, input_path: str, output_path: str,
+                               chunksize: int = 50000, validate: bool = False,
+                               rejects_path: str = None) -> Counter:
+        """流式转换：逐块读取、转换并追加写入DNSPOD模板，内存占用与文件大小无关
+
+        返回各记录类型的输出条数。
+        """
+        record_counts = Counter()
+        total_input = 0
+        rejects_path = rejects_path or self.rejects_report_path(output_path)
+        rejects_writer = None
+        deduplicator = RecordDeduplicator() if self.dedup else None
+        with self.input_file_scope():
+            try:
+                # 先读取第一块以确定主域名，模板的域名依赖主域名
+                chunks = self.iter_dns_chunks(input_path, chunksize)
+                first_chunk = next(chunks, None)
+                if first_chunk is not None:
+                    self.infer_dns_zone(first_chunk)
+                    chunks = chain([first_chunk], chunks)
+                with DNSPODTemplateWriter(output_path, self.dnspod_columns, self.zone) as writer:
+                    for chunk in chunks:
+                        dnspod_df = self.convert_dns_records_vectorized(chunk)
+                        if deduplicator is not None:
+                            dnspod_df = self.deduplicate_records(dnspod_df, deduplicator)
+                        if validate:
+                            dnspod_df, rejects_df = self.split_invalid_records(dnspod_df)
+                            if len(rejects_df):
+                                if rejects_writer is None:
+                                    rejects_writer = DNSPODTemplateWriter(rejects_path, list(rejects_df.columns),
+                                                                          self.zone)
+                                rejects_writer.write(rejects_df)
+                        with self.stage('write'):
+                            writer.write(dnspod_df)
+                        record_counts.update(dnspod_df['Type'].value_counts().to_dict())
+                        total_input += len(chunk)
+                        print(f"已处理 {total_input} 条记录，已写入 {writer.rows_written} 条DNSPOD记录")
+            except Exception as e:
+                print(f"流式转换失败: {e}")
+                sys.exit(1)
+            finally:
+                if rejects_writer is not None:
+                    rejects_writer.close()
+
+        if deduplicator is not None:
+            self.print_dedup_summary(deduplicator)
+        print(f"DNSPOD模板已保存到: {output_path}")
+        if rejects_writer is not None:
+            print(f"校验未通过 {rejects_writer.rows_written} 条记录，已写入: {rejects_path}")
+        return record_counts
+
+    def convert_file(self, input_path: str, output_path: str, engine: str = 'auto',
+                     stream: bool = False, chunksize: int = 50000, validate: bool = False,
+                     rejects_path: str = None, incremental: bool = False, cache_path: str = None,
+                     diff_path: str = None, shard_records: int = None, shard_bytes: int = None,
+                     shard_by: str = None, shard_workers: int = None, workers: int = None) -> Dict[str, int]:
+        """转换单个DNS文件并保存DNSPOD模板，返回各记录类型的输出条数
+
+        engine 为 auto 时，区域文件、JSON记录和较小的CSV输入使用标准库转换路径（core），其他情况使用列式引擎。
+        incremental 为True时逐行转换并使用增量缓存，只转换新增或变化的行（见 dns_incremental）。
+        指定 shard_records 或 shard_bytes 时，按上限将输出拆分为多个文件（见 dns_shard）。
+        workers 大于1时，将记录分块后在多个进程中并行转换（见 dns_parallel）。
+        """
+        shard = bool(shard_records or shard_bytes)
+        if shard and (incremental or stream or engine == 'core'):
+            print("错误: 分片输出不能与 --incremental、--stream 或 --engine core 同时使用")
+            sys.exit(1)
+        parallel = bool(workers and workers > 1)
+        if parallel and (incremental or stream or engine == 'core'):
+            print("错误: 单个文件的并行转换不能与 --incremental、--stream 或 --engine core 同时使用")
+            sys.exit(1)
+
+        if incremental:
+            def read_records():
+                if is_zone_file(input_path):
+                    return self.iter_zone_file_records(input_path)
+                if is_json_file(input_path):
+                    return self.iter_json_file_records(input_path)
+                if input_path.endswith('.csv'):
+                    return self.iter_csv_records(input_path)
+                return self.read_dns_file(input_path).to_dict('records')
+
+            return self.convert_records_to_file(read_records, output_path, chunksize, validate,
+                                                rejects_path, True, cache_path, diff_path)
+
+        if engine == 'auto':
+            use_core = is_zone_file(input_path) or is_json_file(input_path) or (input_path.endswith('.csv')
+                                                    and os.path.getsize(input_path) <= CORE_ENGINE_MAX_BYTES)
+            # 分片输出和并行转换需要完整的DataFrame，始终使用列式引擎
+            engine = 'core' if use_core and not shard and not parallel else 'vectorized'
+        if engine == 'core':
+            if is_zone_file(input_path):
+                return self.convert_records_to_file(lambda: self.iter_zone_file_records(input_path),
+                                                    output_path, chunksize, validate, rejects_path)
+            if is_json_file(input_path):
+                return self.convert_records_to_file(lambda: self.iter_json_file_records(input_path),
+                                                    output_path, chunksize, validate, rejects_path)
+            if not input_path.endswith('.csv'):
+                print("错误: core 引擎仅支持CSV、JSON和区域文件格式的输入文件")
+                sys.exit(1)
+            return self.convert_csv_file(input_path, output_path, chunksize, validate, rejects_path)
+
+        if stream:
+            return self.convert_file_streaming(input_path, output_path, chunksize,
+                                               validate, rejects_path)
+
+        # 读取DNS文件（自动检测云服务商格式）
+        dns_df = self.read_dns_file(input_path)
+
+        # 转换为DNSPOD格式
+        if parallel:
+            dnspod_df = self.convert_dns_records_parallel(dns_df, workers, engine)
+        elif engine == 'row':
+            dnspod_df = self.convert_dns_records(dns_df)
+        else:
+            dnspod_df = self.convert_dns_records_vectorized(dns_df)
+
+        # 去除重复记录（DNSPOD导入时会拒绝重复记录），并报告TTL不一致的记录集
+        if self.dedup:
+            deduplicator = RecordDeduplicator()
+            dnspod_df = self.deduplicate_records(dnspod_df, deduplicator)
+            self.print_dedup_summary(deduplicator)
+
+        # 校验记录值，未通过校验的记录写入报告而不是导入模板
+        if validate:
+            dnspod_df, rejects_df = self.split_invalid_records(dnspod_df)
+            if len(rejects_df):
+                rejects_path = rejects_path or self.rejects_report_path(output_path)
+                with DNSPODTemplateWriter(rejects_path, list(rejects_df.columns), self.zone) as writer:
+                    writer.write(rejects_df)
+                print(f"校验未通过 {len(rejects_df)} 条记录，已写入: {rejects_path}")
+
+        # 保存DNSPOD模板
+        if shard:
+            self.save_dnspod_shards(dnspod_df, output_path, shard_records, shard_bytes, shard_by, shard_workers)
+        else:
+            self.save_dnspod_template(dnspod_df, output_path)
+        return dnspod_df['Type'].value_counts().to_dict()
+
     def print_conversion_summary(self, dnspod_df: pd.DataFrame):
         """打印转换摘要"""
-        print("\n=== 转换摘要 ===")
-        record_counts = dnspod_df['Type'].value_counts()
-        for record_type, count in record_counts.items():
-            print(f"{record_type} 记录: {count} 条")
+        self.print_record_counts(dnspod_df['Type'].value_counts().to_dict())
+
+
+BATCH_INPUT_EXTENSIONS = ('.xlsx', '.xls', '.csv') + JSON_EXTENSIONS + ZONE_FILE_EXTENSIONS
+
+
+def collect_input_files(pattern: str) -> List[str]:
+    """展开目录或通配符，返回待转换的DNS文件列表（排除已生成的DNSPOD模板、分片及分片清单）"""
+    if os.path.isdir(pattern):
+        candidates = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+    else:
+        candidates = glob.glob(pattern)
+
+    return sorted(
+        path for path in candidates
+        if os.path.isfile(path)
+        and path.lower().endswith(BATCH_INPUT_EXTENSIONS)
+        and not os.path.splitext(path)[0].endswith('_dnspod')
+        and not SHARD_SUFFIX_RE.search(os.path.splitext(path)[0])
+        and not os.path.splitext(path)[0].endswith('_manifest')
+    )
+
+
+def batch_output_paths(input_files: List[str], output_dir: str = None) -> List[str]:
+    """为每个输入文件生成 <文件名>_dnspod.xlsx 输出路径，同名文件追加扩展名区分"""
+    outputs = []
+    used = set()
+    for input_path in input_files:
+        base, ext = os.path.splitext(os.path.basename(input_path))
+        directory = output_dir or os.path.dirname(input_path)
+        output_path = os.path.join(directory, f"{base}_dnspod.xlsx")
+        if output_path in used:
+            output_path = os.path.join(directory, f"{base}_{ext.lstrip('.')}_dnspod.xlsx")
+        used.add(output_path)
+        outputs.append(output_path)
+    return outputs
+
+
+def _convert_file_worker(input_path: str, output_path: str, options: Dict[str, Any],
+                         converter_options: Dict[str, Any]) -> Dict[str, Any]:
+    """批量模式的子进程任务：转换单个文件，出错时只记录错误，不影响其他文件"""
+    result = {'input': input_path, 'output': output_path, 'success': False,
+              'record_counts': {}, 'error': ''}
+    log = io.StringIO()
+    start = time.perf_counter()
+    converter = None
+    try:
+        with contextlib.redirect_stdout(log):
+            converter = DNSConverter(**converter_options)
+            result['record_counts'] = converter.convert_file(input_path, output_path, **options)
+        result['success'] = True
+    except SystemExit:
+        # read_dns_file / save_dnspod_template 出错时会打印原因后退出
+        lines = log.getvalue().strip().splitlines()
+        result['error'] = lines[-1] if lines else '转换失败'
+    except Exception as e:
+        result['error'] = str(e)
+    result['elapsed'] = time.perf_counter() - start
+    if converter is not None:
+        result['report'] = converter.instrumentation_report()
+    return result
+
 
-        print(f"\n总计: {len(dnspod_df)} 条DNS记录")
+def convert_batch(input_files: List[str], output_files: List[str], workers: int = None,
+                  converter_options: Dict[str, Any] = None, **options) -> List[Dict[str, Any]]:
+    """使用进程池并行转换多个DNS文件，每个文件独立输出DNSPOD模板"""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    for directory in {os.path.dirname(path) for path in output_files}:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_convert_file_worker, input_path, output_path, options,
+                            converter_options or {}):
+                (input_path, output_path)
+            for input_path, output_path in zip(input_files, output_files)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            input_path, output_path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # 子进程异常退出（如被系统终止）
+                result = {'input': input_path, 'output': output_path, 'success': False,
+                          'record_counts': {}, 'error': str(e) or type(e).__name__, 'elapsed': 0.0}
+            results[input_path] = result
+
+            if result['success']:
+                total = sum(result['record_counts'].values())
+                print(f"[{done}/{len(futures)}] 成功: {input_path} -> {output_path} "
+                      f"({total} 条记录, {result['elapsed']:.2f} 秒)")
+            else:
+                print(f"[{done}/{len(futures)}] 失败: {input_path}: {result['error']}")
+
+    return [results[path] for path in input_files]
+
+
+def print_batch_summary(results: List[Dict[str, Any]]):
+    """打印批量转换的汇总信息"""
+    failed = [result for result in results if not result['success']]
+    record_counts = Counter()
+    for result in results:
+        record_counts.update(result['record_counts'])
+
+    print("\n=== 批量转换摘要 ===")
+    print(f"文件总数: {len(results)}，成功: {len(results) - len(failed)}，失败: {len(failed)}")
+    for result in failed:
+        print(f"失败: {result['input']}: {result['error']}")
+
+    DNSConverter().print_record_counts(record_counts)
 
 
 def main():
-    parser = argparse.ArgumentParser(description='华为云/阿里云DNS记录转换为DNSPOD格式')
-    parser.add_argument('input_file', help='DNS Excel文件路径（支持华为云和阿里云格式）')
-    parser.add_argument('-o', '--output', help='输出的DNSPOD模板文件路径',
-                       default='dnspod_template.xlsx')
+    parser = argparse.ArgumentParser(description='华为云/阿里云等DNS记录转换为DNSPOD格式')
+    parser.add_argument('input_file',
+                       help='DNS Excel/CSV文件路径（支持华为云、阿里云、Cloudflare和GoDaddy格式）、JSON记录文件'
+                            '（Route53 list-resource-record-sets 输出或Cloudflare/GoDaddy API记录列表）'
+                            '或BIND区域文件（.zone/.db/.bind）；'
+                            '传入目录或通配符时批量转换')
+    parser.add_argument('-o', '--output',
+                       help='输出的DNSPOD模板文件路径（默认dnspod_template.xlsx；.csv 保存为CSV，'
+                            '.ndjson/.jsonl 按DNSPOD API记录格式逐行保存JSON）；批量模式下为输出目录')
+    parser.add_argument('--engine', choices=['auto', 'core', 'vectorized', 'row'], default='auto',
+                       help='转换引擎：core 使用标准库逐行转换CSV（不加载pandas，启动快），'
+                            'vectorized 按列批量转换，row 逐行转换；'
+                            'auto（默认）对区域文件和2MB以内的CSV使用core，其他情况使用vectorized')
+    parser.add_argument('--stream', action='store_true',
+                       help='流式模式：分块读取CSV/XLSX并增量写入输出文件，适合超大文件')
+    parser.add_argument('--chunksize', type=int, default=50000,
+                       help='流式模式下每块读取的记录数（默认50000）')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                       help='批量模式下并行转换的进程数（默认为CPU核数）；转换单个文件时指定大于1的值，'
+                            '将记录分块后在多个进程中并行转换，按原始顺序合并结果')
+    parser.add_argument('--zone',
+                       help='主域名（如 example.com），用于从完整域名中截取主机记录；默认按公共后缀列表自动推断')
+    parser.add_argument('--cache-size', type=int, default=65536,
+                       help='主机记录、记录值和TTL标准化结果的LRU缓存容量（默认65536，0表示不缓存）')
+    parser.add_argument('--keep-duplicates', action='store_true',
+                       help='保留重复记录（默认去除记录类型、主机记录、分区和记录值均相同的重复记录）')
+    parser.add_argument('--rules',
+                       help='迁移改写规则文件（JSON），转换时按规则改写IP、CNAME等目标域名和TTL，'
+                            '并按记录类型过滤（格式见 dns_rewrite.py）')
+    parser.add_argument('--validate', action='store_true',
+                       help='按记录类型校验记录值，未通过校验的记录写入报告文件而不导入模板')
+    parser.add_argument('--rejects',
+                       help='校验失败报告路径（默认为 <输出文件名>_rejects.csv）')
+    parser.add_argument('--incremental', action='store_true',
+                       help='增量转换：在输出文件旁保存转换缓存，只转换新增或变化的记录，'
+                            '并生成与上次运行的差异报告 <输出文件名>_diff.csv')
+    parser.add_argument('--cache-file',
+                       help='增量转换的缓存文件路径（默认为 <输出文件名>.cache.sqlite）')
+    parser.add_argument('--diff',
+                       help='增量转换的差异报告路径（默认为 <输出文件名>_diff.csv）')
+    parser.add_argument('--shard-records', type=int,
+                       help='分片输出：每个模板文件最多包含的记录数，输出为 <输出文件名>_part001.xlsx 等多个文件'
+                            '并生成分片清单 <输出文件名>_manifest.json')
+    parser.add_argument('--shard-bytes', type=parse_size,
+                       help='分片输出：每个模板文件的字节数上限（按CSV编码估算，支持 K/M/G 单位，如 5M）')
+    parser.add_argument('--shard-by', choices=['host', 'zone'],
+                       help='分片时按主机记录（host）或分区（zone）分组，同一组的记录写入同一个文件')
+    parser.add_argument('--shard-workers', type=int, default=None,
+                       help='并发写出分片的线程数（默认为CPU核数，最多8个）')
+    parser.add_argument('--input-cache', action='store_true',
+                       help='使用输入缓存：缓存Excel等文件解析和列名标准化后的结果，'
+                            '再次转换同一文件时直接加载（默认不使用）')
+    parser.add_argument('--clear-input-cache', action='store_true',
+                       help='转换前清空输入缓存')
+    parser.add_argument('--input-cache-dir',
+                       help=f'输入缓存目录（与 --input-cache 一起使用，默认 {default_input_cache_dir()}）')
+    parser.add_argument('--input-cache-size', type=parse_size, default=DEFAULT_INPUT_CACHE_BYTES,
+                       help='输入缓存的总大小上限，超过时淘汰最久未使用的文件（支持 K/M/G 单位，默认1G）')
+    parser.add_argument('--report',
+                       help='将各阶段耗时、计数器和缓存命中率保存为JSON文件')
+    parser.add_argument('--profile',
+                       help='使用cProfile分析转换过程并保存结果（可用 python -m pstats 查看）')
 
     args = parser.parse_args()
+    options = {'engine': args.engine, 'stream': args.stream, 'chunksize': args.chunksize,
+               'validate': args.validate, 'incremental': args.incremental,
+               'shard_records': args.shard_records, 'shard_bytes': args.shard_bytes,
+               'shard_by': args.shard_by, 'shard_workers': args.shard_workers}
+    converter_options = {'zone': args.zone, 'cache_size': args.cache_size, 'dedup': not args.keep_duplicates}
+    if args.rules:
+        try:
+            rules = RewriteRules.from_file(args.rules, args.cache_size)
+        except ValueError as e:
+            print(f"错误: {e}")
+            sys.exit(1)
+        print(f"已加载改写规则: {args.rules}（{rules.rule_count} 条）")
+        # 传递编译后的规则，转换器不再重新读取规则文件
+        converter_options['rewrite_rules'] = rules
+    if args.input_cache:
+        converter_options['input_cache_dir'] = args.input_cache_dir or default_input_cache_dir()
+        converter_options['input_cache_bytes'] = args.input_cache_size
+    if args.clear_input_cache:
+        from dns_input_cache import InputCache
+        cache = InputCache(args.input_cache_dir or default_input_cache_dir())
+        print(f"已清空输入缓存: {cache.clear()} 个文件")
+        cache.close()
+
+    # 批量模式：输入为目录或通配符
+    if os.path.isdir(args.input_file) or any(ch in args.input_file for ch in '*?['):
+        input_files = collect_input_files(args.input_file)
+        if not input_files:
+            print(f"错误: 没有找到可转换的DNS文件: {args.input_file}")
+            sys.exit(1)
+
+        print(f"批量转换 {len(input_files)} 个文件...")
+        results = convert_batch(input_files, batch_output_paths(input_files, args.output),
+                                args.workers, converter_options, **options)
+        print_batch_summary(results)
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump({'files': results}, f, ensure_ascii=False, indent=2)
+            print(f"性能统计报告已保存到: {args.report}")
+        if not all(result['success'] for result in results):
+            sys.exit(1)
+        return
 
     # 检查输入文件是否存在
     if not os.path.exists(args.input_file):
         print(f"错误: 输入文件不存在: {args.input_file}")
         sys.exit(1)
 
-    # 创建转换器并执行转换
-    converter = DNSConverter()
-
-    # 读取DNS文件（自动检测华为云或阿里云格式）
-    dns_df = converter.read_dns_file(args.input_file)
-
-    # 转换为DNSPOD格式
-    dnspod_df = converter.convert_dns_records(dns_df)
-
-    # 保存DNSPOD模板
-    converter.save_dnspod_template(dnspod_df, args.output)
+    # 创建转换器并执行转换（自动检测云服务商格式）
+    converter = DNSConverter(profile=bool(args.profile), **converter_options)
+    record_counts = converter.convert_file(args.input_file, args.output or 'dnspod_template.xlsx',
+                                           rejects_path=args.rejects, cache_path=args.cache_file,
+                                           diff_path=args.diff, workers=args.workers, **options)
 
     # 打印转换摘要
-    converter.print_conversion_summary(dnspod_df)
+    converter.print_record_counts(record_counts)
+    if args.report:
+        converter.save_instrumentation_report(args.report)
+    if args.profile:
+        converter.save_profile(args.profile)
 
 
 if __name__ == '__main__':
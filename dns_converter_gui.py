@@ -11,13 +11,17 @@
 - 文件拖拽支持
 - 实时转换进度显示
 - 详细的转换日志
+- 多个文件排队依次转换，可随时取消
 - 自动打开输出目录
 
 使用方法：
 1. 运行程序：python dns_converter_gui.py
-2. 选择华为云或阿里云DNS Excel文件
+2. 添加一个或多个华为云或阿里云DNS Excel文件
 3. 点击"开始转换"按钮
-4. 等待转换完成
+4. 等待转换完成（可点击"取消"中止）
+
+转换在后台线程中执行，后台线程只把日志、进度和状态放入线程安全的队列，
+由界面线程通过 root.after 定时批量取出并更新界面，不在后台线程中操作Tk组件。
 
 作者: DNS转换工具开发团队
 许可证: MIT License
@@ -27,8 +31,50 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import threading
+import queue
+import importlib.util
+import contextlib
+import io
 import os
-from dns_converter import DNSConverter
+from dns_converter import DNSConverter, batch_output_paths
+from dns_core import RecordDeduplicator
+
+# 各处理阶段在进度条上占的区间（百分比）
+PROGRESS_STAGES = {
+    'read': (0, 40),
+    'convert': (40, 70),
+    'write': (70, 100),
+}
+
+# 界面线程处理后台事件的间隔（毫秒）和每次最多处理的事件数
+POLL_INTERVAL_MS = 100
+MAX_EVENTS_PER_POLL = 5000
+
+
+class ConversionCancelled(Exception):
+    """用户取消了转换"""
+
+
+class QueueWriter(io.TextIOBase):
+    """将转换器 print 的输出按行放入事件队列（代替标准输出）"""
+
+    def __init__(self, events):
+        self.events = events
+        self.last_line = ''
+        self._partial = ''
+
+    def write(self, text):
+        lines = (self._partial + text).split('\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self.events.put(('log', line))
+            if line.strip():
+                self.last_line = line.strip()
+        return len(text)
+
+    def flush(self):
+        if self._partial:
+            self.write('\n')
 
 
 class DNSConverterGUI:
@@ -43,10 +89,20 @@ class DNSConverterGUI:
         style.theme_use('clam')
         
         self.converter = DNSConverter()
-        self.input_file = ""
+        self.input_files = []
         self.output_file = ""
-        
+
+        # 后台线程 → 界面线程的事件队列，元素为 (事件类型, 参数...)
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.worker = None
+        # 当前转换的文件序号和文件总数（用于换算总进度）
+        self.file_index, self.file_count = 0, 1
+        # 正在写入、尚未写完的输出文件，取消时删除
+        self.partial_outputs = set()
+
         self.create_widgets()
+        self.root.after(POLL_INTERVAL_MS, self.process_events)
     
     def create_widgets(self):
         """创建GUI组件"""
@@ -60,16 +116,19 @@ class DNSConverterGUI:
                                font=("Arial", 16, "bold"))
         title_label.grid(row=0, column=0, columnspan=3, pady=(0, 20))
         
-        # 输入文件选择
-        ttk.Label(main_frame, text="DNS文件:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        
-        self.input_file_var = tk.StringVar()
-        input_entry = ttk.Entry(main_frame, textvariable=self.input_file_var, width=50)
-        input_entry.grid(row=1, column=1, padx=(10, 5), pady=5, sticky=(tk.W, tk.E))
-        
-        input_button = ttk.Button(main_frame, text="浏览", command=self.select_input_file)
-        input_button.grid(row=1, column=2, padx=(5, 0), pady=5)
-        
+        # 输入文件队列
+        ttk.Label(main_frame, text="DNS文件:").grid(row=1, column=0, sticky=(tk.W, tk.N), pady=5)
+
+        self.input_listbox = tk.Listbox(main_frame, height=4, selectmode=tk.EXTENDED)
+        self.input_listbox.grid(row=1, column=1, padx=(10, 5), pady=5, sticky=(tk.W, tk.E))
+
+        input_buttons = ttk.Frame(main_frame)
+        input_buttons.grid(row=1, column=2, padx=(5, 0), pady=5, sticky=tk.N)
+        self.add_button = ttk.Button(input_buttons, text="添加", command=self.select_input_file)
+        self.add_button.pack(fill=tk.X)
+        self.remove_button = ttk.Button(input_buttons, text="移除", command=self.remove_selected_files)
+        self.remove_button.pack(fill=tk.X, pady=(5, 0))
+
         # 输出文件选择
         ttk.Label(main_frame, text="DNSPOD模板文件:").grid(row=2, column=0, sticky=tk.W, pady=5)
         
@@ -79,32 +138,38 @@ class DNSConverterGUI:
         
         output_button = ttk.Button(main_frame, text="浏览", command=self.select_output_file)
         output_button.grid(row=2, column=2, padx=(5, 0), pady=5)
+        ttk.Label(main_frame, text="（添加多个文件时，每个文件输出到其所在目录的 <文件名>_dnspod.xlsx）",
+                  foreground="gray").grid(row=3, column=1, columnspan=2, sticky=tk.W, padx=(10, 0))
         
         # 转换按钮
         convert_frame = ttk.Frame(main_frame)
-        convert_frame.grid(row=3, column=0, columnspan=3, pady=20)
+        convert_frame.grid(row=4, column=0, columnspan=3, pady=20)
         
         self.convert_button = ttk.Button(convert_frame, text="开始转换", 
                                         command=self.start_conversion, style="Accent.TButton")
         self.convert_button.pack(side=tk.LEFT, padx=5)
-        
+
+        self.cancel_button = ttk.Button(convert_frame, text="取消", command=self.cancel_conversion,
+                                        state='disabled')
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+
         self.clear_button = ttk.Button(convert_frame, text="清空", command=self.clear_fields)
         self.clear_button.pack(side=tk.LEFT, padx=5)
         
         # 进度条
         self.progress_var = tk.DoubleVar()
         self.progress_bar = ttk.Progressbar(main_frame, variable=self.progress_var, 
-                                           mode='indeterminate')
-        self.progress_bar.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
+                                           mode='determinate', maximum=100)
+        self.progress_bar.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
         
         # 状态标签
-        self.status_var = tk.StringVar(value="请选择DNS文件（支持华为云和阿里云格式）")
+        self.status_var = tk.StringVar(value="请选择DNS文件（支持华为云、阿里云、Cloudflare、GoDaddy和Route53格式）")
         status_label = ttk.Label(main_frame, textvariable=self.status_var)
-        status_label.grid(row=5, column=0, columnspan=3, pady=5)
+        status_label.grid(row=6, column=0, columnspan=3, pady=5)
         
         # 日志文本框
         log_frame = ttk.LabelFrame(main_frame, text="转换日志", padding="5")
-        log_frame.grid(row=6, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
+        log_frame.grid(row=7, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
         
         # 创建文本框和滚动条
         self.log_text = tk.Text(log_frame, height=15, wrap=tk.WORD)
@@ -118,34 +183,44 @@ class DNSConverterGUI:
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
         main_frame.columnconfigure(1, weight=1)
-        main_frame.rowconfigure(6, weight=1)
+        main_frame.rowconfigure(7, weight=1)
         log_frame.columnconfigure(0, weight=1)
         log_frame.rowconfigure(0, weight=1)
     
     def select_input_file(self):
-        """选择输入文件"""
-        file_path = filedialog.askopenfilename(
-            title="选择DNS文件（华为云或阿里云格式）",
+        """选择输入文件（可多选），加入转换队列"""
+        file_paths = filedialog.askopenfilenames(
+            title="选择DNS文件",
             filetypes=[
                 ("Excel文件", "*.xlsx *.xls"),
                 ("CSV文件", "*.csv"),
+                ("JSON记录（Route53等）", "*.json"),
+                ("BIND区域文件", "*.zone *.db *.bind"),
                 ("所有文件", "*.*")
             ]
         )
-        
-        if file_path:
-            self.input_file_var.set(file_path)
-            self.input_file = file_path
-            
+
+        for file_path in file_paths:
+            if file_path not in self.input_files:
+                self.input_files.append(file_path)
+                self.input_listbox.insert(tk.END, file_path)
+
+        if file_paths:
             # 自动生成输出文件名
             if not self.output_file_var.get():
-                base_name = os.path.splitext(file_path)[0]
+                base_name = os.path.splitext(self.input_files[0])[0]
                 output_path = f"{base_name}_dnspod.xlsx"
                 self.output_file_var.set(output_path)
                 self.output_file = output_path
-            
-            self.status_var.set("已选择输入文件，点击开始转换")
-    
+
+            self.status_var.set(f"已添加 {len(self.input_files)} 个文件，点击开始转换")
+
+    def remove_selected_files(self):
+        """从转换队列中移除选中的文件"""
+        for index in reversed(self.input_listbox.curselection()):
+            self.input_listbox.delete(index)
+            del self.input_files[index]
+
     def select_output_file(self):
         """选择输出文件"""
         file_path = filedialog.asksaveasfilename(
@@ -153,6 +228,8 @@ class DNSConverterGUI:
             defaultextension=".xlsx",
             filetypes=[
                 ("Excel文件", "*.xlsx"),
+                ("CSV文件", "*.csv"),
+                ("DNSPOD API记录（NDJSON）", "*.ndjson *.jsonl"),
                 ("所有文件", "*.*")
             ]
         )
@@ -163,100 +240,221 @@ class DNSConverterGUI:
     
     def clear_fields(self):
         """清空所有字段"""
-        self.input_file_var.set("")
+        self.input_listbox.delete(0, tk.END)
         self.output_file_var.set("")
-        self.input_file = ""
+        self.input_files = []
         self.output_file = ""
         self.log_text.delete(1.0, tk.END)
-        self.status_var.set("请选择DNS文件（支持华为云和阿里云格式）")
-    
+        self.status_var.set("请选择DNS文件（支持华为云、阿里云、Cloudflare、GoDaddy和Route53格式）")
+
     def log_message(self, message):
-        """添加日志消息"""
-        self.log_text.insert(tk.END, message + "\n")
-        self.log_text.see(tk.END)
-        self.root.update_idletasks()
-    
+        """添加日志消息（可在任意线程中调用，由界面线程批量写入日志框）"""
+        self.events.put(('log', message))
+
+    def update_progress(self, stage, fraction):
+        """转换器进度回调：按阶段权重换算为当前文件的进度（在转换线程中调用）
+
+        已请求取消时抛出 ConversionCancelled，中止正在进行的读取、转换或写入。
+        """
+        self.check_cancelled()
+        if stage not in PROGRESS_STAGES:
+            return
+        start, end = PROGRESS_STAGES[stage]
+        self.events.put(('progress', (start + (end - start) * fraction) / 100))
+
+    def check_cancelled(self):
+        """已请求取消时抛出 ConversionCancelled"""
+        if self.cancel_event.is_set():
+            raise ConversionCancelled("用户取消了转换")
+
+    def process_events(self):
+        """界面线程：批量取出后台事件并更新界面，再安排下一次处理"""
+        try:
+            self.drain_events()
+        finally:
+            self.root.after(POLL_INTERVAL_MS, self.process_events)
+
+    def drain_events(self):
+        """取出队列中的事件，日志一次性写入日志框，进度只使用最新的值"""
+        lines = []
+        progress = None
+        finished = None
+        for _ in range(MAX_EVENTS_PER_POLL):
+            try:
+                event, *args = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event == 'log':
+                lines.append(args[0])
+            elif event == 'progress':
+                progress = args[0]
+            elif event == 'file':
+                self.file_index, self.file_count, input_path = args
+                self.status_var.set(f"正在转换（{self.file_index + 1}/{self.file_count}）: "
+                                    f"{os.path.basename(input_path)}")
+            elif event == 'done':
+                finished = args
+
+        if lines:
+            self.log_text.insert(tk.END, '\n'.join(lines) + '\n')
+            self.log_text.see(tk.END)
+        if progress is not None:
+            # 多个文件时按已完成的文件数换算为总进度
+            self.progress_var.set((self.file_index + progress) / self.file_count * 100)
+        # 日志全部显示后再弹出结果对话框
+        if finished is not None:
+            self.conversion_completed(*finished)
+
     def start_conversion(self):
-        """开始转换（在新线程中执行）"""
-        if not self.input_file:
+        """开始转换队列中的文件（在新线程中依次执行）"""
+        if not self.input_files:
             messagebox.showerror("错误", "请先选择DNS文件")
             return
-        
-        if not self.output_file:
+
+        self.output_file = self.output_file_var.get()
+        if len(self.input_files) == 1 and not self.output_file:
             messagebox.showerror("错误", "请先选择输出文件路径")
             return
-        
-        # 禁用转换按钮
+
+        # 单个文件使用指定的输出路径，多个文件输出到各自目录的 <文件名>_dnspod.xlsx
+        if len(self.input_files) == 1:
+            jobs = [(self.input_files[0], self.output_file)]
+        else:
+            jobs = list(zip(self.input_files, batch_output_paths(self.input_files)))
+
+        # 禁用转换按钮，启用取消按钮
         self.convert_button.config(state='disabled')
-        self.progress_bar.start()
+        self.add_button.config(state='disabled')
+        self.remove_button.config(state='disabled')
+        self.clear_button.config(state='disabled')
+        self.cancel_button.config(state='normal')
+        self.progress_var.set(0)
+        self.file_index, self.file_count = 0, len(jobs)
+        self.cancel_event.clear()
+        self.converter.progress_callback = self.update_progress
         self.status_var.set("正在转换...")
-        
+
         # 清空日志
         self.log_text.delete(1.0, tk.END)
-        
+
         # 在新线程中执行转换
-        thread = threading.Thread(target=self.perform_conversion)
-        thread.daemon = True
-        thread.start()
-    
-    def perform_conversion(self):
-        """执行实际的转换工作"""
-        try:
-            self.log_message("开始转换DNS记录...")
-            
-            # 读取DNS文件（自动检测华为云或阿里云格式）
-            self.log_message(f"读取文件: {self.input_file}")
-            dns_df = self.converter.read_dns_file(self.input_file)
-            self.log_message(f"成功读取 {len(dns_df)} 条记录")
-            
-            # 转换为DNSPOD格式
-            self.log_message("转换为DNSPOD格式...")
-            dnspod_df = self.converter.convert_dns_records(dns_df)
-            self.log_message(f"转换完成，共 {len(dnspod_df)} 条DNSPOD记录")
-            
-            # 保存DNSPOD模板
-            self.log_message(f"保存到: {self.output_file}")
-            self.converter.save_dnspod_template(dnspod_df, self.output_file)
-            
-            # 显示转换摘要
-            self.log_message("\n=== 转换摘要 ===")
-            record_counts = dnspod_df['Type'].value_counts()
-            for record_type, count in record_counts.items():
-                self.log_message(f"{record_type} 记录: {count} 条")
-            
-            self.log_message(f"\n总计: {len(dnspod_df)} 条DNS记录")
-            self.log_message("\n转换成功完成！")
-            
-            # 更新UI
-            self.root.after(0, self.conversion_completed, True)
-            
-        except Exception as e:
-            error_msg = f"转换失败: {str(e)}"
-            self.log_message(error_msg)
-            self.root.after(0, self.conversion_completed, False, error_msg)
-    
-    def conversion_completed(self, success, error_msg=None):
-        """转换完成后的UI更新"""
-        self.progress_bar.stop()
+        self.worker = threading.Thread(target=self.perform_conversion, args=(jobs,))
+        self.worker.daemon = True
+        self.worker.start()
+
+    def cancel_conversion(self):
+        """请求取消转换：当前文件在下一次进度回调或步骤之间中止，队列中剩余的文件不再转换"""
+        self.cancel_event.set()
+        self.cancel_button.config(state='disabled')
+        self.status_var.set("正在取消...")
+
+    def perform_conversion(self, jobs):
+        """依次转换队列中的文件（在转换线程中执行，只通过事件队列与界面通信）"""
+        succeeded = []
+        failed = []
+        output = QueueWriter(self.events)
+        with contextlib.redirect_stdout(output):
+            for index, (input_path, output_path) in enumerate(jobs):
+                if self.cancel_event.is_set():
+                    break
+                self.events.put(('file', index, len(jobs), input_path))
+                if len(jobs) > 1:
+                    self.log_message(f"\n=== [{index + 1}/{len(jobs)}] {os.path.basename(input_path)} ===")
+                try:
+                    self.convert_one(input_path, output_path)
+                    succeeded.append(output_path)
+                except ConversionCancelled:
+                    break
+                except (Exception, SystemExit) as e:
+                    # read_dns_file / save_dnspod_template 出错时会打印原因后调用 sys.exit
+                    if self.cancel_event.is_set():
+                        break
+                    error_msg = f"转换失败: {e}" if isinstance(e, Exception) else output.last_line
+                    if isinstance(e, Exception):
+                        self.log_message(error_msg)
+                    failed.append((input_path, error_msg))
+            output.flush()
+
+        if self.cancel_event.is_set() and len(succeeded) < len(jobs):
+            self.log_message("\n转换已取消")
+            self.remove_partial_outputs(succeeded)
+            self.events.put(('done', 'cancelled', succeeded, failed))
+        else:
+            self.events.put(('done', 'failed' if failed else 'success', succeeded, failed))
+
+    def remove_partial_outputs(self, succeeded):
+        """删除取消时写了一半的输出文件"""
+        for output_path in list(self.partial_outputs):
+            self.partial_outputs.discard(output_path)
+            if output_path in succeeded or not os.path.exists(output_path):
+                continue
+            try:
+                os.remove(output_path)
+                self.log_message(f"已删除未写完的文件: {output_path}")
+            except OSError:
+                pass
+
+    def convert_one(self, input_path, output_path):
+        """转换单个文件，各步骤之间检查是否已请求取消（转换器的输出会显示在日志中）"""
+        self.converter.reset_instrumentation()
+
+        # 读取DNS文件（自动检测云服务商格式）
+        self.log_message(f"读取文件: {input_path}")
+        dns_df = self.converter.read_dns_file(input_path)
+        self.check_cancelled()
+
+        # 转换为DNSPOD格式
+        dnspod_df = self.converter.convert_dns_records_vectorized(dns_df)
+        self.check_cancelled()
+
+        # 去除重复记录，并提示TTL不一致的记录集
+        if self.converter.dedup:
+            deduplicator = RecordDeduplicator()
+            dnspod_df = self.converter.deduplicate_records(dnspod_df, deduplicator)
+            self.converter.print_dedup_summary(deduplicator)
+            self.check_cancelled()
+
+        # 保存DNSPOD模板
+        self.partial_outputs.add(output_path)
+        self.converter.save_dnspod_template(dnspod_df, output_path)
+        self.partial_outputs.discard(output_path)
+
+        # 显示转换摘要
+        self.converter.print_conversion_summary(dnspod_df)
+        timings = '，'.join(f"{stage} {seconds:.2f}s"
+                           for stage, seconds in self.converter.timings.items())
+        self.log_message(f"各阶段耗时: {timings}")
+        self.log_message("\n转换成功完成！")
+
+    def conversion_completed(self, result, succeeded, failed):
+        """转换结束后的UI更新（在界面线程中执行）"""
+        self.worker = None
+        self.converter.progress_callback = None
         self.convert_button.config(state='normal')
-        
-        if success:
+        self.add_button.config(state='normal')
+        self.remove_button.config(state='normal')
+        self.clear_button.config(state='normal')
+        self.cancel_button.config(state='disabled')
+
+        if result == 'success':
+            self.progress_var.set(100)
             self.status_var.set("转换成功完成！")
-            messagebox.showinfo("成功", f"DNS记录转换成功！\n输出文件: {self.output_file}")
+            messagebox.showinfo("成功", "DNS记录转换成功！\n输出文件:\n" + "\n".join(succeeded))
+        elif result == 'cancelled':
+            self.status_var.set(f"转换已取消（已完成 {len(succeeded)} 个文件）")
         else:
-            self.status_var.set("转换失败")
-            messagebox.showerror("错误", error_msg or "转换过程中发生未知错误")
+            self.status_var.set(f"转换失败（成功 {len(succeeded)} 个，失败 {len(failed)} 个）")
+            messagebox.showerror("错误", "\n".join(f"{os.path.basename(path)}: {error}"
+                                                   for path, error in failed))
 
 
 def main():
     """主函数"""
-    try:
-        # 检查依赖
-        import pandas
-        import openpyxl
-    except ImportError as e:
+    # 检查依赖（只查找不导入，pandas 在开始转换时才加载，加快界面启动）
+    missing = [name for name in ('pandas', 'openpyxl') if importlib.util.find_spec(name) is None]
+    if missing:
         messagebox.showerror("依赖错误", 
-                           f"缺少必要的依赖包: {e}\n\n请运行以下命令安装:\npip install pandas openpyxl")
+                           f"缺少必要的依赖包: {', '.join(missing)}\n\n请运行以下命令安装:\npip install pandas openpyxl")
         return
     
     root = tk.Tk()
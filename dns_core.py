@@ -0,0 +1,1131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DNS记录转换核心（只依赖标准库）
+
+包含逐条记录的清理和转换规则、性能统计接口，以及基于标准库 csv 模块的转换路径。
+导入本模块不会加载 pandas 和 openpyxl：命令行转换CSV输入时直接使用这里的实现，
+省去导入pandas的启动开销；需要DataFrame接口时使用 dns_converter.DNSConverter。
+
+CSV读取按 pandas.read_csv 的默认规则推断列类型（缺失值、整数、浮点数、布尔值），
+因此输出与DataFrame路径完全一致。
+
+作者: DNS转换工具开发团队
+许可证: MIT License
+"""
+
+import contextlib
+import cProfile
+import csv
+import importlib
+import ipaddress
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from functools import lru_cache, wraps
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+from dns_providers import ProviderProfile, detect_profile, read_json_rows
+from dns_rewrite import RewriteRules
+from dns_suffix import infer_zone, load_public_suffix_index, normalize_zone, relativize_host
+from dns_validator import is_valid_ipv4, validate_record
+from dns_zonefile import iter_zone_records
+
+
+# 华为云到DNSPOD的记录类型映射
+TYPE_MAPPING = {
+    'A': 'A',
+    'AAAA': 'AAAA',
+    'CNAME': 'CNAME',
+    'MX': 'MX',
+    'TXT': 'TXT',
+    'NS': 'NS',
+    'SRV': 'SRV',
+    'PTR': 'PTR',
+    'CAA': 'CAA'
+}
+
+# DNSPOD模板列名（按照正确的DNSPOD格式）
+DNSPOD_COLUMNS = [
+    'Type',        # A列：记录类型
+    'Host',        # B列：主机记录
+    'Split Zone',  # C列：分区
+    'Value',       # D列：记录值
+    'MX',          # E列：MX优先级
+    'TTL',         # F列：TTL值
+    'Remarks'      # G列：备注
+]
+
+# A记录中多个IP之间的分隔符：换行及其他空白、逗号、分号、竖线和中文标点
+IP_SEPARATORS_RE = re.compile(r'[\s,;|，；、]+')
+
+# 记录值为主机名的记录类型：比较记录值时不区分大小写并忽略末尾的点号
+HOSTNAME_VALUE_TYPES = frozenset(['CNAME', 'MX', 'NS', 'PTR'])
+
+# 记录值需要规范化后才能比较的记录类型（见 normalize_record_value）
+NORMALIZED_VALUE_TYPES = HOSTNAME_VALUE_TYPES | {'SRV', 'AAAA'}
+
+# 以这些扩展名结尾的输出文件按DNSPOD API的记录格式逐行写入JSON（NDJSON）
+NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+
+# DNSPOD模板的分区对应API中的记录线路
+API_RECORD_LINES = {'Default': '默认'}
+
+# pandas.read_csv 默认识别的缺失值和布尔值
+CSV_NA_VALUES = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+CSV_TRUE_VALUES = frozenset(['True', 'TRUE', 'true'])
+CSV_FALSE_VALUES = frozenset(['False', 'FALSE', 'false'])
+
+# 与 pandas.read_csv 一致的数值格式（允许首尾空白）
+CSV_INT_RE = re.compile(r'\s*[+-]?[0-9]+\s*')
+CSV_FLOAT_RE = re.compile(r'\s*[+-]?(?:(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?|inf|infinity)\s*',
+                          re.IGNORECASE)
+
+NAN = float('nan')
+
+
+class LazyModule:
+    """延迟导入的模块：首次访问属性时才真正导入"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+def is_missing(value: Any) -> bool:
+    """判断单个值是否为缺失值（None或NaN，与 pd.isna 对标量的判断一致）"""
+    if value is None:
+        return True
+    try:
+        return bool(value != value)
+    except TypeError:
+        # pd.NA 不能转换为布尔值
+        return True
+
+
+def timed_stage(name: str):
+    """装饰器：将方法的执行时间计入转换器的指定阶段"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.stage(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def mangle_header(header: List[str]) -> List[str]:
+    """与 pandas.read_csv 一致地处理表头：空列名命名为 Unnamed: N，重复列名追加 .1、.2"""
+    columns = []
+    seen = Counter()
+    for position, name in enumerate(header):
+        name = name or f'Unnamed: {position}'
+        candidate = name
+        while candidate in seen:
+            candidate = f'{name}.{seen[name]}'
+            seen[name] += 1
+        seen[candidate] += 1
+        columns.append(candidate)
+    return columns
+
+
+def _classify_csv_value(text: str) -> str:
+    """判断CSV单元格按 pandas 默认规则会被解析为哪种类型"""
+    if text in CSV_NA_VALUES:
+        return 'na'
+    if text in CSV_TRUE_VALUES or text in CSV_FALSE_VALUES:
+        return 'bool'
+    if CSV_INT_RE.fullmatch(text):
+        return 'int'
+    if CSV_FLOAT_RE.fullmatch(text):
+        return 'float'
+    return 'str'
+
+
+def _column_parser(kinds: set) -> Callable[[str], Any]:
+    """根据一列中出现过的值类型，返回与 pandas 推断结果一致的单元格解析函数"""
+    has_na = 'na' in kinds
+    kinds = kinds - {'na'}
+
+    def parse_str(text):
+        return NAN if text in CSV_NA_VALUES else text
+
+    if not kinds:
+        return lambda text: NAN
+    if kinds == {'bool'}:
+        return lambda text: NAN if text in CSV_NA_VALUES else text in CSV_TRUE_VALUES
+    if kinds == {'int'} and not has_na:
+        return int
+    if kinds <= {'int', 'float'}:
+        return lambda text: NAN if text in CSV_NA_VALUES else float(text)
+    return parse_str
+
+
+class DNSPODRecord:
+    """一条DNSPOD格式的记录
+
+    使用 __slots__ 存储7个字段，比等价的字典小得多；可按DNSPOD列顺序迭代，
+    直接作为CSV/Excel的一行写出，也支持按列名取值（record['Type']）。
+    """
+
+    __slots__ = ('type', 'host', 'split_zone', 'value', 'mx', 'ttl', 'remarks')
+
+    # DNSPOD列名到字段名的映射
+    FIELDS = dict(zip(DNSPOD_COLUMNS, __slots__))
+
+    def __init__(self, type: str, host: str, value: str, mx: str, ttl: int, remarks: str,
+                 split_zone: str = 'Default'):
+        self.type = type
+        self.host = host
+        self.split_zone = split_zone
+        self.value = value
+        self.mx = mx
+        self.ttl = ttl
+        self.remarks = remarks
+
+    @classmethod
+    def from_row(cls, row: Iterable[Any]) -> 'DNSPODRecord':
+        """由按DNSPOD列顺序排列的一行值创建记录"""
+        record_type, host, split_zone, value, mx, ttl, remarks = row
+        return cls(record_type, host, value, mx, ttl, remarks, split_zone)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter((self.type, self.host, self.split_zone, self.value,
+                     self.mx, self.ttl, self.remarks))
+
+    def __getitem__(self, column: str) -> Any:
+        return getattr(self, self.FIELDS[column])
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DNSPODRecord):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __repr__(self) -> str:
+        return f"DNSPODRecord{tuple(self)!r}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为以DNSPOD列名为键的字典"""
+        return dict(zip(DNSPOD_COLUMNS, self))
+
+
+class DNSPODRecordBuffer:
+    """按列存储的DNSPOD记录缓冲区
+
+    每个字段一个列表，追加记录时只保存字段值，不保留记录对象；
+    可直接构建DataFrame或逐行写出。
+    """
+
+    def __init__(self):
+        self.columns = {column: [] for column in DNSPOD_COLUMNS}
+        self._appenders = [values.append for values in self.columns.values()]
+
+    def append(self, record: DNSPODRecord):
+        """追加一条记录"""
+        for append, value in zip(self._appenders, record):
+            append(value)
+
+    def extend(self, records: Iterable[DNSPODRecord]):
+        """追加多条记录"""
+        for record in records:
+            self.append(record)
+
+    def __len__(self) -> int:
+        return len(self.columns['Type'])
+
+    def rows(self) -> Iterator[tuple]:
+        """按DNSPOD列顺序逐行返回记录"""
+        return zip(*self.columns.values())
+
+    def to_frame(self):
+        """构建DNSPOD格式的DataFrame（首次调用时导入pandas）"""
+        import pandas as pd
+
+        if not len(self):
+            return pd.DataFrame([], columns=DNSPOD_COLUMNS)
+        return pd.DataFrame(self.columns, columns=DNSPOD_COLUMNS)
+
+
+# 记录类型转换函数：handler(record, record_type) -> List[DNSPODRecord]
+RecordHandler = Callable[[Dict[str, Any], str], List[DNSPODRecord]]
+
+# 原始类型字符串到转换函数的缓存容量（超出后不再缓存新的写法）
+DISPATCH_CACHE_SIZE = 1024
+
+
+def normalize_record_value(record_type: str, value: str) -> str:
+    """将记录值转换为用于比较的规范形式：主机名不区分大小写并忽略末尾的点号，IPv6地址使用压缩格式"""
+    value = value.strip()
+    if record_type in HOSTNAME_VALUE_TYPES:
+        return value.rstrip('.').lower()
+    if record_type == 'SRV':
+        parts = value.split()
+        if parts:
+            parts[-1] = parts[-1].rstrip('.').lower()
+        return ' '.join(parts)
+    if record_type == 'AAAA':
+        try:
+            return ipaddress.IPv6Address(value).compressed
+        except ValueError:
+            return value.lower()
+    return value
+
+
+class RecordDeduplicator:
+    """去除重复的DNSPOD记录，并检查同一记录集的TTL是否一致
+
+    以 记录类型、主机记录、分区和记录值 拼接成的字符串为键放入哈希集合，一次遍历即可去重，
+    重复记录保留第一条（字符串键的哈希值会被缓存，比元组键快）。主机记录不区分大小写，记录值按 normalize_record_value 规范化。
+    同一记录类型、主机记录和分区的记录组成一个记录集，记录集内TTL不同时记为冲突。
+    """
+
+    # 拼接键的分隔符（不会出现在记录中）
+    KEY_SEPARATOR = '\x00'
+
+    def __init__(self):
+        self._seen = set()
+        self._rrset_ttls: Dict[str, Any] = {}
+        # 记录集键 → 出现过的TTL
+        self.ttl_conflicts: Dict[str, set] = {}
+        self.duplicates = 0
+
+    @staticmethod
+    def value_key(record_type: str, value: str) -> str:
+        """返回用于比较的记录值（按 normalize_record_value 规范化）"""
+        if record_type in NORMALIZED_VALUE_TYPES:
+            return normalize_record_value(record_type, value)
+        return value
+
+    @classmethod
+    def split_rrset_key(cls, rrset: str) -> List[str]:
+        """将记录集键拆分为 [类型, 主机记录, 分区]"""
+        return rrset.split(cls.KEY_SEPARATOR)
+
+    def keep_mask(self, rrsets: Iterable[str], keys: Iterable[str], ttls: Iterable[Any]) -> List[bool]:
+        """返回每条记录是否保留（首次出现），同时记录TTL冲突
+
+        rrsets 为用 KEY_SEPARATOR 拼接的 类型、小写主机记录和分区，
+        keys 为记录集键再拼接 value_key 后的完整去重键。
+        """
+        seen = self._seen
+        seen_add = seen.add
+        # seen_add 返回 None，首次出现的键加入集合并保留
+        mask = [not (key in seen or seen_add(key)) for key in keys]
+        self.duplicates += mask.count(False)
+
+        first_ttl = self._rrset_ttls.setdefault
+        conflicts = self.ttl_conflicts
+        for rrset, ttl in zip(rrsets, ttls):
+            ttl_seen = first_ttl(rrset, ttl)
+            if ttl_seen != ttl:
+                conflicts.setdefault(rrset, {ttl_seen}).add(ttl)
+        return mask
+
+    def filter_records(self, records: List[DNSPODRecord]) -> List[DNSPODRecord]:
+        """去除一批记录中与之前记录重复的记录"""
+        join = self.KEY_SEPARATOR.join
+        value_key = self.value_key
+        rrsets = [join((record.type, record.host.lower(), record.split_zone)) for record in records]
+        keys = [join((rrset, value_key(record.type, record.value))) for rrset, record in zip(rrsets, records)]
+        mask = self.keep_mask(rrsets, keys, [record.ttl for record in records])
+        return [record for record, keep in zip(records, mask) if keep]
+
+
+class DNSRecordConverter:
+    """DNS记录转换核心：逐条记录的清理、转换和性能统计（不依赖pandas）"""
+
+    # 缓存统计中显示的名称
+    CACHE_LABELS = {'host': '主机记录清理', 'value': '记录值清理', 'ttl': 'TTL标准化'}
+
+    def __init__(self, zone: str = None, cache_size: int = 65536, profile: bool = False,
+                 dedup: bool = True, rewrite_rules: Union[str, RewriteRules] = None,
+                 infer_file_zones: bool = True):
+        # 指定的主域名（如 example.com）；为空时每个输入文件推断一个主域名（见 infer_file_zone）
+        self.configured_zone = normalize_zone(zone)
+        # 当前输入文件使用的主域名
+        self.zone = self.configured_zone
+        # 为False时不推断主域名，zone 为空即表示没有主域名（并行转换的子进程沿用父进程的推断结果）
+        self.infer_file_zones = infer_file_zones
+        # 分块转换一个文件期间主域名只确定一次（见 input_file_scope）
+        self._file_scope = False
+        self._file_zone_fixed = False
+        # 是否在写入前去除重复记录（DNSPOD导入时会拒绝重复记录）
+        self.dedup = dedup
+        self.suffix_index = load_public_suffix_index()
+        # 迁移改写规则（见 dns_rewrite），转换后逐条改写IP、目标域名和TTL；
+        # 可以是规则文件路径，也可以是已编译的规则（多个转换器共用，不重复编译）
+        if isinstance(rewrite_rules, str):
+            rewrite_rules = RewriteRules.from_file(rewrite_rules, cache_size)
+        self.rewrite_rules = rewrite_rules or None
+
+        # 主机记录、记录值和TTL的标准化结果缓存（LRU，cache_size 为每个缓存的容量，0表示不缓存）
+        # 导出文件中大量记录的主机名、TTL和TXT值相同，每个不同的值只需处理一次
+        self._clean_host_cache = lru_cache(maxsize=cache_size)(self._clean_host_record)
+        self._clean_value_cache = lru_cache(maxsize=cache_size)(self._clean_record_value)
+        self._ttl_cache = lru_cache(maxsize=cache_size)(self._normalize_ttl)
+        self.caches = {
+            'host': self._clean_host_cache,
+            'value': self._clean_value_cache,
+            'ttl': self._ttl_cache,
+        }
+
+        # 性能统计：各阶段耗时（read/detect/normalize/convert/validate/write）和计数器
+        self.timings = Counter()
+        self.counters = Counter()
+        self._stage_depth = 0
+        # 各阶段的嵌套深度：同名阶段嵌套时只在最外层退出时累加耗时
+        self._stage_depths = Counter()
+        # 可选的cProfile分析器，只在各阶段执行期间启用
+        self.profiler = cProfile.Profile() if profile else None
+        # 进度回调 callback(stage, fraction)，fraction 为该阶段的完成比例（0-1）
+        self.progress_callback = None
+        # 多进程并行转换时各块的转换报告（见 dns_parallel）
+        self.chunk_reports: List[Dict[str, Any]] = []
+
+        self.type_mapping = dict(TYPE_MAPPING)
+        self.dnspod_columns = list(DNSPOD_COLUMNS)
+
+        # 按记录类型分派的转换函数 handler(record, record_type) -> List[DNSPODRecord]，
+        # 只在这里构建一次；register_record_handler 可添加新类型或替换内置规则
+        self.record_handlers: Dict[str, RecordHandler] = {
+            record_type: self._simple_handler(dnspod_type) for record_type, dnspod_type in self.type_mapping.items()
+        }
+        self.record_handlers.update({
+            'A': self._convert_a_record,
+            'MX': self._convert_mx_record,
+            'TXT': self._convert_txt_record,
+            'NS': self._skip_ns_record,
+        })
+        # 通过 register_record_handler 注册的类型（列式引擎对这些类型逐行调用 convert_record）
+        self.custom_record_types = set()
+        # 原始类型字符串 → (标准化的类型, 转换函数)，导出文件中不同的类型写法很少
+        self._dispatch: Dict[str, tuple] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """统计一个处理阶段的耗时（多次执行时累加，同名阶段嵌套时不重复计算）"""
+        outermost = self._stage_depth == 0
+        if outermost and self.profiler is not None:
+            self.profiler.enable()
+        self._stage_depth += 1
+        self._stage_depths[name] += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stage_depths[name] -= 1
+            if not self._stage_depths[name]:
+                self.timings[name] += time.perf_counter() - start
+            self._stage_depth -= 1
+            if outermost and self.profiler is not None:
+                self.profiler.disable()
+
+    def report_progress(self, stage: str, fraction: float):
+        """通知进度回调（未设置回调时忽略）"""
+        if self.progress_callback is not None:
+            self.progress_callback(stage, min(max(fraction, 0.0), 1.0))
+
+    def reset_instrumentation(self):
+        """清空阶段耗时、计数器和块报告"""
+        self.timings.clear()
+        self.counters.clear()
+        self.chunk_reports = []
+
+    def instrumentation_report(self) -> Dict[str, Any]:
+        """返回可序列化为JSON的性能统计报告"""
+        caches = {}
+        for name, cache in self.caches.items():
+            info = cache.cache_info()
+            caches[name] = {'hits': info.hits, 'misses': info.misses,
+                            'size': info.currsize, 'maxsize': info.maxsize}
+        report = {
+            'timings': {name: round(seconds, 6) for name, seconds in self.timings.items()},
+            'counters': dict(self.counters),
+            'caches': caches,
+        }
+        if self.chunk_reports:
+            report['chunks'] = self.chunk_reports
+        return report
+
+    def converter_options(self) -> Dict[str, Any]:
+        """返回创建相同配置的转换器所需的参数（用于在子进程中创建转换器）
+
+        子进程直接使用当前确定的主域名（可能为None），不再按各自的记录块推断：
+        某一块中占多数的注册域名在整个文件中不一定占多数。
+        """
+        return {'zone': self.zone, 'cache_size': self._clean_host_cache.cache_info().maxsize,
+                'dedup': self.dedup, 'rewrite_rules': self.rewrite_rules, 'infer_file_zones': False}
+
+    def conversion_settings(self) -> str:
+        """影响转换结果的设置（主域名和改写规则），用作增量缓存的键"""
+        if self.rewrite_rules is None:
+            return self.zone or ''
+        return f"{self.zone or ''}|rules:{self.rewrite_rules.fingerprint}"
+
+    def save_instrumentation_report(self, report_path: str):
+        """将性能统计报告保存为JSON文件"""
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(self.instrumentation_report(), f, ensure_ascii=False, indent=2)
+        print(f"性能统计报告已保存到: {report_path}")
+
+    def save_profile(self, profile_path: str):
+        """保存cProfile分析结果（可用 python -m pstats 查看）"""
+        if self.profiler is not None:
+            self.profiler.dump_stats(profile_path)
+            print(f"性能分析结果已保存到: {profile_path}")
+
+    def parse_multiple_ips(self, value: str) -> List[str]:
+        """解析华为云A记录中的多个IP地址"""
+        if is_missing(value) or not value:
+            return []
+        return self._split_ips(str(value))
+
+    def _split_ips(self, value: str) -> List[str]:
+        """按分隔符拆分多个IP，没有合法IP时保留原始值"""
+        if not value:
+            return []
+
+        # 华为云可能用换行符、空格、分号、逗号等分隔多个IP
+        ips = [part for part in IP_SEPARATORS_RE.split(value) if part and self.is_valid_ip(part)]
+        return ips if ips else [value.strip()]
+
+    def is_valid_ip(self, ip: str) -> bool:
+        """IPv4地址验证（使用预编译的校验规则）"""
+        return is_valid_ipv4(ip)
+
+    def clean_host_record(self, host: str) -> str:
+        """清理主机记录，移除域名部分（结果按主机名缓存）"""
+        return self._clean_host_cache(host)
+
+    def _clean_host_record(self, host: str) -> str:
+        """清理主机记录（不使用缓存）"""
+        if not host or is_missing(host) or host == 'nan':
+            return '@'
+
+        host = str(host).strip()
+
+        # 如果是根域名标识
+        if host == '@' or host == '':
+            return '@'
+
+        # 移除末尾的点号（以点号结尾的是完整域名）
+        absolute = host.endswith('.')
+        if absolute:
+            host = host[:-1]
+
+        # 按主域名截取子域名部分；没有主域名时只截取完整域名，由公共后缀列表确定其注册域名
+        # 例如：www.example.com → www, a.b.example.com → a.b, example.com.cn → @
+        # 不属于主域名的名称（如阿里云的 www、_sip._tcp、api.dev）视为已经是子域名，直接返回
+        return relativize_host(host, self.suffix_index, self.zone, absolute)
+
+    def infer_file_zone(self, host_counts: Iterable[Tuple[Any, int]], zone: str = None):
+        """未指定主域名时确定当前输入文件的主域名
+
+        zone 为文件自带的主域名（如区域文件的SOA/$ORIGIN），否则由 (主机名, 出现次数) 推断
+        出现最多的注册域名（见 dns_suffix.infer_zone）。在 input_file_scope 内只按第一块确定。
+        """
+        if self.configured_zone is not None or self._file_zone_fixed or not self.infer_file_zones:
+            return
+        zone = normalize_zone(zone) or infer_zone(host_counts, self.suffix_index)
+        self._file_zone_fixed = self._file_scope
+        if zone != self.zone:
+            self.zone = zone
+            # 主机记录的清理结果依赖主域名
+            self._clean_host_cache.cache_clear()
+            if zone:
+                print(f"主域名: {zone}（未指定 --zone，按输入文件推断）")
+
+    @contextlib.contextmanager
+    def input_file_scope(self):
+        """分块转换一个输入文件：主域名按第一块确定，之后各块沿用"""
+        self._file_scope = True
+        self._file_zone_fixed = False
+        try:
+            yield
+        finally:
+            self._file_scope = False
+            self._file_zone_fixed = False
+
+    def clean_record_value(self, value: str, record_type: str) -> str:
+        """清理记录值，移除不必要的引号和格式化（结果按记录值和类型缓存）"""
+        return self._clean_value_cache(value, record_type)
+
+    def _clean_record_value(self, value: str, record_type: str) -> str:
+        """清理记录值（不使用缓存）"""
+        if not value:
+            return value
+
+        value = str(value).strip()
+
+        # 对于TXT记录，移除首尾的引号
+        if record_type.upper() == 'TXT':
+            # 移除首尾的双引号
+            if value.startswith('"') and value.endswith('"'):
+                value = value[1:-1]
+            # 移除首尾的单引号
+            elif value.startswith("'") and value.endswith("'"):
+                value = value[1:-1]
+
+        return value
+
+    def normalize_ttl(self, ttl: Any) -> int:
+        """标准化TTL值，空值或无法解析时使用默认值600（结果按原始值缓存）"""
+        return self._ttl_cache(ttl)
+
+    def _normalize_ttl(self, ttl: Any) -> int:
+        """标准化TTL值（不使用缓存）"""
+        try:
+            return int(float(ttl)) if ttl and not is_missing(ttl) else 600
+        except (ValueError, TypeError):
+            return 600
+
+    def convert_record(self, record: Dict[str, Any]) -> List[DNSPODRecord]:
+        """转换单条DNS记录：按记录类型分派给 record_handlers 中的转换函数"""
+        raw_type = record.get('Type', '')
+        try:
+            record_type, handler = self._dispatch[raw_type]
+        except (KeyError, TypeError):
+            record_type, handler = self._resolve_record_type(raw_type)
+        records = handler(record, record_type)
+        if self.rewrite_rules is not None and records:
+            records = self.rewrite_records(records)
+        return records
+
+    def rewrite_records(self, records: List[DNSPODRecord]) -> List[DNSPODRecord]:
+        """按改写规则改写转换结果的记录值和TTL，去掉被类型过滤规则排除的记录"""
+        apply = self.rewrite_rules.apply
+        rewritten = []
+        for record in records:
+            result = apply(record.type, record.host, record.value, record.ttl)
+            if result is None:
+                self.counters['rewrite_filtered'] += 1
+                continue
+            value, ttl = result
+            if value != record.value:
+                record.value = value
+                self.counters['rewrite_values'] += 1
+            if ttl != record.ttl:
+                record.ttl = ttl
+                self.counters['rewrite_ttls'] += 1
+            rewritten.append(record)
+        return rewritten
+
+    def _resolve_record_type(self, raw_type: Any) -> tuple:
+        """标准化记录类型并查找转换函数，字符串类型的结果缓存到 _dispatch"""
+        record_type = str(raw_type).upper().strip()
+        if not record_type or record_type == 'NAN':
+            # 跳过空记录
+            resolved = (record_type, self._skip_record)
+        else:
+            resolved = (record_type, self.record_handlers.get(record_type, self._convert_unsupported))
+        if type(raw_type) is str and len(self._dispatch) < DISPATCH_CACHE_SIZE:
+            self._dispatch[raw_type] = resolved
+        return resolved
+
+    def register_record_handler(self, record_type: str, handler: RecordHandler):
+        """注册或替换一种记录类型的转换函数 handler(record, record_type) -> List[DNSPODRecord]
+
+        record 为使用标准列名的输入记录，可用 record_fields 完成主机记录、TTL和备注的通用处理。
+        """
+        record_type = record_type.upper().strip()
+        self.record_handlers[record_type] = handler
+        self.custom_record_types.add(record_type)
+        self._dispatch.clear()
+
+    def record_fields(self, record: Dict[str, Any], record_type: str):
+        """各记录类型共用的处理：返回 (主机记录, 记录值, TTL, 备注)，记录值为空时给出警告并返回None"""
+        # 清理主机记录，移除域名部分
+        host = self.clean_host_record(str(record.get('Host', '')).strip())
+
+        # 处理TTL
+        ttl = self.normalize_ttl(record.get('TTL', 600))
+
+        # 处理记录值
+        value = record.get('Value', '')
+        if is_missing(value) or value == '':
+            print(f"警告: {record_type} 记录 {host} 的值为空，跳过")
+            self.counters['empty_values'] += 1
+            return None
+
+        # 处理备注
+        remarks = record.get('Remarks', '')
+        remarks = str(remarks) if remarks and not is_missing(remarks) else ''
+        return host, str(value), ttl, remarks
+
+    def _skip_record(self, record: Dict[str, Any], record_type: str) -> List[DNSPODRecord]:
+        """记录类型为空的记录直接跳过"""
+        return []
+
+    def _skip_ns_record(self, record: Dict[str, Any], record_type: str) -> List[DNSPODRecord]:
+        """跳过NS记录（DNSPOD不需要导入NS记录，由服务商自动管理）"""
+        host = str(record.get('Host', '')).strip()
+        print(f"跳过NS记录: {host} -> {record.get('Value', '')} (DNSPOD不需要导入NS记录)")
+        self.counters['ns_skipped'] += 1
+        return []
+
+    def _convert_unsupported(self, record: Dict[str, Any], record_type: str) -> List[DNSPODRecord]:
+        """DNSPOD不支持的记录类型不导入（记录值为空时仍给出警告）"""
+        self.record_fields(record, record_type)
+        return []
+
+    def _convert_a_record(self, record: Dict[str, Any], record_type: str) -> List[DNSPODRecord]:
+        """A记录可能包含多个IP地址，每个IP转换为一条记录"""
+        fields = self.record_fields(record, record_type)
+        if fields is None:
+            return []
+        host, value, ttl, remarks = fields
+        ips = self._split_ips(value.strip())
+        self.counters['ip_fanout'] += max(len(ips) - 1, 0)
+        return [DNSPODRecord('A', host, ip, '-', ttl, remarks) for ip in ips]
+
+    def _convert_mx_record(self, record: Dict[str, Any], record_type: str) -> List[DNSPODRecord]:
+        """MX记录需要处理优先级"""
+        fields = self.record_fields(record, record_type)
+        if fields is None:
+            return []
+        host, value, ttl, remarks = fields
+        mx_priority = record.get('MX', '')
+        mx_priority = str(mx_priority) if mx_priority and not is_missing(mx_priority) else ''
+        return [DNSPODRecord('MX', host, value.strip(), mx_priority, ttl, remarks)]
+
+    def _convert_txt_record(self, record: Dict[str, Any], record_type: str) -> List[DNSPODRecord]:
+        """TXT记录移除首尾的引号（结果按记录值缓存）"""
+        fields = self.record_fields(record, record_type)
+        if fields is None:
+            return []
+        host, value, ttl, remarks = fields
+        return [DNSPODRecord('TXT', host, self.clean_record_value(value, 'TXT'), '-', ttl, remarks)]
+
+    def _simple_handler(self, dnspod_type: str) -> RecordHandler:
+        """生成记录值只需去除首尾空白的记录类型（AAAA、CNAME、SRV、PTR、CAA等）的转换函数"""
+        record_fields = self.record_fields
+
+        def convert(record: Dict[str, Any], record_type: str) -> List[DNSPODRecord]:
+            fields = record_fields(record, record_type)
+            if fields is None:
+                return []
+            host, value, ttl, remarks = fields
+            return [DNSPODRecord(dnspod_type, host, value.strip(), '-', ttl, remarks)]
+
+        convert.__name__ = f'convert_{dnspod_type.lower()}_record'
+        return convert
+
+    def detect_provider_profile(self, columns: Iterable[Any]) -> ProviderProfile:
+        """按表头检测云服务商导出格式并打印检测结果（相同的表头只检测一次，见 dns_providers）"""
+        with self.stage('detect'):
+            profile = detect_profile(columns)
+        print(f"检测到云服务商: {profile.name}")
+        return profile
+
+    def read_csv_header(self, file_path: str) -> Tuple[List[str], ProviderProfile]:
+        """读取CSV表头，检测云服务商，返回 (标准化后的列名, 导出格式)"""
+        with open(file_path, encoding='utf-8-sig', newline='') as f:
+            header = next(csv.reader(f), None)
+        if header is None:
+            raise ValueError(f"CSV文件中没有数据: {file_path}")
+
+        columns = mangle_header(header)
+        print(f"检测到的列名: {columns}")
+        profile = self.detect_provider_profile(columns)
+        with self.stage('normalize'):
+            columns = profile.normalize_columns(columns)
+        print(f"标准化后的列名: {columns}")
+        return columns, profile
+
+    def _infer_csv_columns(self, file_path: str, width: int) -> List[Callable[[str], Any]]:
+        """第一遍扫描：按 pandas.read_csv 的规则推断每一列的类型，返回各列的解析函数
+
+        不需要转换的列（没有缺失值的字符串列）返回None。
+        """
+        kinds = [set() for _ in range(width)]
+        has_text = [False] * width
+        # 出现过字符串的列一定按字符串处理，之后只需判断是否有缺失值
+        seen = [set() for _ in range(width)]
+        with open(file_path, encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            while True:
+                rows = [self._pad_row(row, width) for row in islice(reader, 10000) if row]
+                if not rows:
+                    break
+                for position in range(width):
+                    # 每块中每个不同的值只判断一次
+                    values = set(map(itemgetter(position), rows)) - seen[position]
+                    if has_text[position]:
+                        if not values.isdisjoint(CSV_NA_VALUES):
+                            kinds[position].add('na')
+                        seen[position] |= values - CSV_NA_VALUES
+                        continue
+                    for text in values:
+                        kinds[position].add(_classify_csv_value(text))
+                    seen[position] |= values
+                    has_text[position] = 'str' in kinds[position]
+
+        parsers = [_column_parser(column_kinds) for column_kinds in kinds]
+        return [None if kinds == {'str'} else parse for parse, kinds in zip(parsers, kinds)]
+
+    @staticmethod
+    def _pad_row(row: List[str], width: int) -> List[str]:
+        """缺少的列补为空值（视为缺失值），列数超过表头时报错"""
+        if len(row) < width:
+            return row + [''] * (width - len(row))
+        if len(row) > width:
+            raise ValueError(f"CSV数据行有 {len(row)} 列，超过表头的 {width} 列")
+        return row
+
+    def iter_csv_records(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """逐条读取CSV记录（标准化列名），单元格取值与 pandas.read_csv 一致
+
+        先扫描一遍推断列类型，再逐行读取，内存占用与文件大小无关。推断列类型的耗时计入
+        调用方读取第一块记录时的 read 阶段（见 convert_records_to_file）。
+        """
+        columns, profile = self.read_csv_header(file_path)
+        width = len(columns)
+        parsers = self._infer_csv_columns(file_path, width)
+
+        with open(file_path, encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            conversions = [(position, parse) for position, parse in enumerate(parsers)
+                           if parse is not None]
+            for row in reader:
+                if not row:
+                    continue
+                row = self._pad_row(row, width)
+                for position, parse in conversions:
+                    row[position] = parse(row[position])
+                # 重复的标准列名以最后一列为准（与 DataFrame 行的 to_dict() 一致）
+                yield profile.transform_record(dict(zip(columns, row)))
+
+    def iter_json_file_records(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """逐条返回JSON记录文件（Route53、Cloudflare、GoDaddy等）中的记录（标准化列名），缺少的字段视为缺失值"""
+        raw_columns, rows = read_json_rows(file_path)
+        print(f"检测到的列名: {raw_columns}")
+        profile = self.detect_provider_profile(raw_columns)
+        with self.stage('normalize'):
+            columns = profile.normalize_columns(raw_columns)
+        print(f"标准化后的列名: {columns}")
+        for row in rows:
+            yield profile.transform_record(dict(zip(columns, [row.get(column, NAN) for column in raw_columns])))
+
+    def iter_zone_file_records(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """逐条读取BIND区域文件中的记录（标准列名），相对名称按 --zone 或文件中的 $ORIGIN 补全
+
+        未指定 --zone 时以区域文件的SOA主机名或 $ORIGIN 作为主域名（见 infer_file_zone）。
+        """
+        print("检测到云服务商: BIND区域文件")
+        with open(file_path, encoding='utf-8-sig') as f:
+            yield from iter_zone_records(f, self.configured_zone,
+                                         on_zone=lambda zone: self.infer_file_zone((), zone))
+
+    def convert_csv_file(self, input_path: str, output_path: str, chunksize: int = 50000,
+                         validate: bool = False, rejects_path: str = None,
+                         incremental: bool = False, cache_path: str = None,
+                         diff_path: str = None) -> Counter:
+        """使用标准库转换CSV文件：逐块读取、转换并追加写入DNSPOD模板
+
+        输出与 DNSConverter 的DataFrame路径一致，返回各记录类型的输出条数。
+        """
+        return self.convert_records_to_file(
+            lambda: self.iter_csv_records(input_path), output_path, chunksize, validate,
+            rejects_path, incremental, cache_path, diff_path)
+
+    def convert_records_to_file(self, read_records: Callable[[], Iterable[Dict[str, Any]]],
+                                output_path: str, chunksize: int = 50000, validate: bool = False,
+                                rejects_path: str = None, incremental: bool = False,
+                                cache_path: str = None, diff_path: str = None) -> Counter:
+        """逐块转换标准化后的输入记录并追加写入DNSPOD模板，返回各记录类型的输出条数
+
+        incremental 为True时使用增量缓存（默认为 <输出文件名>.cache.sqlite）：
+        只转换新增或变化的行，并将与上一次运行的差异写入 <输出文件名>_diff.csv。
+        """
+        record_counts = Counter()
+        total_input = 0
+        rejects_path = rejects_path or self.rejects_report_path(output_path)
+        rejects_writer = None
+        cache = None
+        deduplicator = RecordDeduplicator() if self.dedup else None
+        with self.input_file_scope():
+            try:
+                # 先读取第一块以确定主域名，增量缓存的键和模板的域名都依赖主域名
+                records = iter(read_records())
+                with self.stage('read'):
+                    first_chunk = list(islice(records, chunksize))
+                self.infer_file_zone(Counter(record.get('Host') for record in first_chunk).items())
+                records = chain(first_chunk, records)
+
+                if incremental:
+                    from dns_incremental import IncrementalCache, cache_path_for
+                    cache = IncrementalCache(cache_path or cache_path_for(output_path), self.conversion_settings())
+
+                print("开始转换DNS记录...")
+                with DNSPODTemplateWriter(output_path, self.dnspod_columns, self.zone) as writer:
+                    while True:
+                        with self.stage('read'):
+                            chunk = list(islice(records, chunksize))
+                        if not chunk:
+                            break
+
+                        with self.stage('convert'):
+                            converted = self._convert_chunk(chunk, total_input + 1, cache)
+
+                        if deduplicator is not None:
+                            with self.stage('dedup'):
+                                converted = deduplicator.filter_records(converted)
+
+                        if validate:
+                            with self.stage('validate'):
+                                rejects = []
+                                valid = []
+                                for record in converted:
+                                    reason = validate_record(record)
+                                    if reason:
+                                        rejects.append((*record, reason))
+                                    else:
+                                        valid.append(record)
+                                converted = valid
+                            if rejects:
+                                self.counters['rejected'] += len(rejects)
+                                if rejects_writer is None:
+                                    rejects_writer = DNSPODTemplateWriter(rejects_path,
+                                                                          self.dnspod_columns + ['Reason'])
+                                rejects_writer.write_records(rejects)
+
+                        with self.stage('write'):
+                            writer.write_records(converted)
+                        record_counts.update(record.type for record in converted)
+                        total_input += len(chunk)
+                        self.counters['input_records'] += len(chunk)
+                        self.counters['output_records'] += len(converted)
+                        print(f"已处理 {total_input} 条记录，已写入 {writer.rows_written} 条DNSPOD记录")
+
+                if cache is not None:
+                    from dns_incremental import diff_report_path
+                    diff_path = diff_path or diff_report_path(output_path)
+                    first_run = not cache.has_previous_run
+                    changes = cache.finish(diff_path)
+            except Exception as e:
+                print(f"转换失败: {e}")
+                sys.exit(1)
+            finally:
+                if rejects_writer is not None:
+                    rejects_writer.close()
+                if cache is not None:
+                    cache.close()
+
+        print(f"转换完成！共 {total_input} 条记录转换为DNSPOD {sum(record_counts.values())} 条记录")
+        if deduplicator is not None:
+            self.print_dedup_summary(deduplicator)
+        print(f"DNSPOD模板已保存到: {output_path}")
+        if rejects_writer is not None:
+            print(f"校验未通过 {rejects_writer.rows_written} 条记录，已写入: {rejects_path}")
+        if cache is not None:
+            print(f"增量转换: 复用 {self.counters['cache_hits']} 条，重新转换 {self.counters['cache_misses']} 条")
+            print(f"{'首次运行，' if first_run else ''}与上次运行相比: 新增 {changes['added']} 条，"
+                  f"删除 {changes['removed']} 条，修改 {changes['changed_old']} → {changes['changed_new']} 条，"
+                  f"差异报告: {diff_path}")
+        return record_counts
+
+    def _convert_chunk(self, chunk: List[Dict[str, Any]], first_position: int,
+                       cache=None) -> List[DNSPODRecord]:
+        """转换一块输入记录；指定增量缓存时复用未变化行的转换结果"""
+        if cache is not None:
+            hashes = [cache.row_hash(record) for record in chunk]
+            found = cache.lookup(hashes)
+
+        converted = []
+        for offset, record in enumerate(chunk):
+            if cache is not None:
+                row_hash = hashes[offset]
+                rows = found.get(row_hash)
+                if rows is not None:
+                    self.counters['cache_hits'] += 1
+                    converted.extend(DNSPODRecord.from_row(row) for row in rows)
+                    continue
+                self.counters['cache_misses'] += 1
+
+            try:
+                records = self.convert_record(record)
+            except Exception as e:
+                print(f"转换第 {first_position + offset} 条记录时出错: {e}")
+                self.counters['errors'] += 1
+                continue
+
+            if cache is not None:
+                cache.store(row_hash, records)
+                found[row_hash] = [tuple(record) for record in records]
+            converted.extend(records)
+        return converted
+
+    def rejects_report_path(self, output_path: str) -> str:
+        """根据输出文件路径生成校验失败报告路径"""
+        return f"{os.path.splitext(output_path)[0]}_rejects.csv"
+
+    def print_dedup_summary(self, deduplicator: RecordDeduplicator, limit: int = 10):
+        """记录并打印去重结果和TTL不一致的记录集"""
+        conflicts = deduplicator.ttl_conflicts
+        self.counters['duplicates_removed'] += deduplicator.duplicates
+        self.counters['ttl_conflicts'] += len(conflicts)
+        if deduplicator.duplicates:
+            print(f"已去除 {deduplicator.duplicates} 条重复记录（记录类型、主机记录、分区和记录值均相同）")
+        if conflicts:
+            print(f"警告: {len(conflicts)} 组记录的TTL不一致（同一主机记录和类型的记录应使用相同的TTL）:")
+            for rrset, ttls in islice(conflicts.items(), limit):
+                record_type, host, _ = deduplicator.split_rrset_key(rrset)
+                print(f"  {record_type} {host}: TTL {', '.join(map(str, sorted(ttls)))}")
+            if len(conflicts) > limit:
+                print(f"  …… 另有 {len(conflicts) - limit} 组")
+
+    def print_record_counts(self, record_counts: Dict[str, int]):
+        """按记录类型打印转换摘要"""
+        print("\n=== 转换摘要 ===")
+        for record_type, count in sorted(record_counts.items(), key=lambda item: -item[1]):
+            print(f"{record_type} 记录: {count} 条")
+
+        print(f"\n总计: {sum(record_counts.values())} 条DNS记录")
+        if self.rewrite_rules is not None:
+            print(f"改写规则: 改写记录值 {self.counters['rewrite_values']} 条，"
+                  f"覆盖TTL {self.counters['rewrite_ttls']} 条，按类型排除 {self.counters['rewrite_filtered']} 条")
+        self.print_cache_stats()
+
+    def print_cache_stats(self):
+        """打印缓存命中统计（没有使用过缓存时不输出）"""
+        stats = {self.CACHE_LABELS[name]: cache.cache_info() for name, cache in self.caches.items()}
+        if not any(info.hits + info.misses for info in stats.values()):
+            return
+
+        print("\n=== 缓存统计 ===")
+        for name, info in stats.items():
+            lookups = info.hits + info.misses
+            hit_rate = info.hits / lookups * 100 if lookups else 0.0
+            print(f"{name}: 命中 {info.hits} 次，未命中 {info.misses} 次，"
+                  f"命中率 {hit_rate:.1f}%，已缓存 {info.currsize}/{info.maxsize}")
+
+
+def dnspod_api_record(row: Dict[str, Any], domain: str = None) -> Dict[str, Any]:
+    """将一条DNSPOD模板记录转换为DNSPOD API（CreateRecord）的参数格式"""
+    record = {}
+    if domain:
+        record['Domain'] = domain
+    record['SubDomain'] = row['Host']
+    record['RecordType'] = row['Type']
+    record['RecordLine'] = API_RECORD_LINES.get(row['Split Zone'], row['Split Zone'])
+    record['Value'] = row['Value']
+    if row['Type'] == 'MX':
+        try:
+            record['MX'] = int(float(row['MX']))
+        except (TypeError, ValueError):
+            record['MX'] = row['MX']
+    record['TTL'] = int(row['TTL'])
+    if row['Remarks'] and not is_missing(row['Remarks']):
+        record['Remark'] = row['Remarks']
+    # 模板以外的列（如校验失败原因）原样保留
+    for column, value in row.items():
+        if column not in DNSPOD_COLUMNS:
+            record[column] = value
+    return record
+
+
+class DNSPODTemplateWriter:
+    """增量写入DNSPOD模板（CSV和NDJSON追加写入，Excel使用openpyxl的write-only模式）
+
+    输出文件以 .ndjson/.jsonl 结尾时，每行写入一条DNSPOD API格式的记录，domain 为主域名。
+    """
+
+    def __init__(self, output_path: str, columns: List[str], domain: str = None):
+        self.output_path = output_path
+        self.columns = columns
+        self.domain = domain
+        self.rows_written = 0
+        self._csv_file = None
+        self._json_file = None
+        self._workbook = None
+
+        if output_path.endswith('.csv'):
+            # 手动写入BOM后按UTF-8写入，避免 utf-8-sig 编解码器逐次调用的开销
+            self._csv_file = open(output_path, 'w', encoding='utf-8', newline='')
+            self._csv_file.write('\ufeff')
+            # 与 DataFrame.to_csv 的默认格式一致
+            self._csv_writer = csv.writer(self._csv_file, lineterminator=os.linesep)
+            self._csv_writer.writerow(columns)
+        elif output_path.lower().endswith(NDJSON_EXTENSIONS):
+            self._json_file = open(output_path, 'w', encoding='utf-8', newline='\n')
+        else:
+            from openpyxl import Workbook
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet('Sheet1')
+            self._sheet.append(columns)
+
+    def _write_json(self, rows: Iterable[Iterable[Any]]) -> int:
+        """按列顺序排列的记录逐行写入JSON，返回写入条数"""
+        columns = self.columns
+        domain = self.domain
+        lines = [json.dumps(dnspod_api_record(dict(zip(columns, row)), domain), ensure_ascii=False,
+                            default=str)
+                 for row in rows]
+        if lines:
+            self._json_file.write('\n'.join(lines) + '\n')
+        return len(lines)
+
+    def write(self, dnspod_df, progress=None):
+        """追加写入一批DNSPOD记录（DataFrame），progress(fraction) 用于报告写入进度"""
+        total = len(dnspod_df)
+        if self._csv_file is not None:
+            dnspod_df.to_csv(self._csv_file, index=False, header=False)
+        elif self._json_file is not None:
+            self._write_json(dnspod_df[self.columns].itertuples(index=False, name=None))
+        else:
+            progress_step = max(1000, total // 100)
+            for position, row in enumerate(dnspod_df[self.columns].itertuples(index=False, name=None), 1):
+                self._sheet.append(row)
+                if progress is not None and position % progress_step == 0:
+                    progress(position / total)
+        self.rows_written += total
+        if progress is not None:
+            progress(1.0)
+
+    def write_records(self, records: Iterable[Iterable[Any]]):
+        """追加写入一批按列顺序排列的记录（DNSPODRecord、元组等）"""
+        written = 0
+        if self._csv_file is not None:
+            for record in records:
+                self._csv_writer.writerow(record)
+                written += 1
+        elif self._json_file is not None:
+            written = self._write_json(records)
+        else:
+            for record in records:
+                self._sheet.append(tuple(record))
+                written += 1
+        self.rows_written += written
+
+    def close(self):
+        """完成写入并关闭文件"""
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+        elif self._json_file is not None:
+            self._json_file.close()
+            self._json_file = None
+        elif self._workbook is not None:
+            self._workbook.save(self.output_path)
+            self._workbook = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+源文件与DNSPOD模板的差异比对
+
+读取华为云/阿里云导出文件（read_dns_file 自动识别格式并标准化列名），按转换规则
+得到应导入的记录，再与DNSPOD模板逐条比对。两边的记录都按 (Type, Host, Value)
+建立哈希索引，比对为线性时间，50万条记录的区域也只需数秒。
+
+报告中的状态：
+- missing：源文件中有、模板中缺少的记录
+- extra：模板中多出的记录
+- ttl_mismatch / mx_mismatch / ttl_mx_mismatch：记录存在但TTL或MX优先级不一致
+
+比较时主机记录不区分大小写，CNAME/MX/NS/PTR/SRV 的目标主机名不区分大小写且忽略末尾的点号，
+AAAA 记录按规范的IPv6格式比较。
+
+使用方法：
+    python dns_diff.py huawei_dns.xlsx dnspod_template.xlsx -o verify_report.csv
+    python dns_diff.py huawei_dns.xlsx dnspod_template.xlsx --rules migration_rules.json
+
+作者: DNS转换工具开发团队
+许可证: MIT License
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+from dns_converter import DNSConverter, np, pd
+from dns_core import HOSTNAME_VALUE_TYPES, RecordDeduplicator, normalize_record_value
+from dns_rewrite import RewriteRules
+
+# 差异报告的列
+DIFF_REPORT_COLUMNS = ['Status', 'Type', 'Host', 'Value',
+                       'Expected TTL', 'Actual TTL', 'Expected MX', 'Actual MX']
+
+
+def normalize_ttl(ttl: str) -> str:
+    """TTL按整数比较，无法解析时按原值比较"""
+    try:
+        return str(int(float(ttl)))
+    except (ValueError, OverflowError):
+        return ttl.strip()
+
+
+def normalize_mx(mx: str) -> str:
+    """MX优先级按整数比较（5 与 5.0 相同），非MX记录的 - 和空值视为相同"""
+    mx = mx.strip()
+    if mx in ('', '-', 'nan'):
+        return '-'
+    try:
+        return str(int(float(mx)))
+    except (ValueError, OverflowError):
+        return mx
+
+
+def _map_unique(series: pd.Series, func) -> pd.Series:
+    """对列中每个不同的值只调用一次 func"""
+    codes, uniques = pd.factorize(series)
+    mapped = np.empty(len(uniques), dtype=object)
+    mapped[:] = [func(unique) for unique in uniques]
+    return pd.Series(mapped[codes], index=series.index)
+
+
+def read_dnspod_template(template_path: str) -> pd.DataFrame:
+    """读取DNSPOD模板（CSV或Excel），所有列按字符串读取"""
+    if template_path.endswith('.csv'):
+        df = pd.read_csv(template_path, encoding='utf-8-sig', dtype=str, keep_default_na=False)
+    else:
+        df = pd.read_excel(template_path, dtype=str, keep_default_na=False)
+
+    missing = [column for column in ('Type', 'Host', 'Value', 'MX', 'TTL') if column not in df.columns]
+    if missing:
+        raise ValueError(f"DNSPOD模板缺少列: {', '.join(missing)}")
+    return df
+
+
+def index_records(dnspod_df: pd.DataFrame) -> Counter:
+    """将DNSPOD格式的记录规范化为 (Type, Host, Value, TTL, MX) 并计数"""
+    columns = {column: dnspod_df[column].astype(str) for column in ('Type', 'Host', 'Value', 'TTL', 'MX')}
+    record_type = _map_unique(columns['Type'], lambda value: value.strip().upper())
+    host = columns['Host'].str.strip().str.rstrip('.').str.lower()
+
+    # 大部分记录值按列处理，只有 SRV 和 AAAA 需要逐条规范化
+    value = columns['Value'].str.strip()
+    hostname_value = record_type.isin(HOSTNAME_VALUE_TYPES)
+    value = value.mask(hostname_value, value.str.rstrip('.').str.lower())
+    special = record_type.isin(['SRV', 'AAAA'])
+    if special.any():
+        value = value.astype(object)
+        value[special] = list(map(normalize_record_value, record_type[special], value[special]))
+
+    return Counter(zip(record_type.tolist(), host.tolist(), value.tolist(),
+                       _map_unique(columns['TTL'], normalize_ttl).tolist(),
+                       _map_unique(columns['MX'], normalize_mx).tolist()))
+
+
+def diff_records(expected_df: pd.DataFrame, actual_df: pd.DataFrame) -> pd.DataFrame:
+    """比对应导入的记录与模板中的记录，返回差异报告（完全一致时为空）"""
+    actual = index_records(actual_df)
+
+    # 完全相同的记录直接抵消，剩下的按 (Type, Host, Value) 配对
+    unmatched = []
+    for record, count in index_records(expected_df).items():
+        matched = min(count, actual.get(record, 0))
+        if matched:
+            actual[record] -= matched
+        if count > matched:
+            unmatched.append((record, count - matched))
+
+    remaining: Dict[Tuple[str, str, str], List[Tuple[str, str]]] = defaultdict(list)
+    for (record_type, host, value, ttl, mx), count in actual.items():
+        if count:
+            remaining[(record_type, host, value)].extend([(ttl, mx)] * count)
+
+    rows = []
+    for (record_type, host, value, ttl, mx), count in unmatched:
+        candidates = remaining.get((record_type, host, value))
+        for _ in range(count):
+            if not candidates:
+                rows.append(('missing', record_type, host, value, ttl, '', mx, ''))
+                continue
+            actual_ttl, actual_mx = candidates.pop()
+            if actual_ttl != ttl and actual_mx != mx:
+                status = 'ttl_mx_mismatch'
+            elif actual_ttl != ttl:
+                status = 'ttl_mismatch'
+            else:
+                status = 'mx_mismatch'
+            rows.append((status, record_type, host, value, ttl, actual_ttl, mx, actual_mx))
+
+    for (record_type, host, value), candidates in remaining.items():
+        for ttl, mx in candidates:
+            rows.append(('extra', record_type, host, value, '', ttl, '', mx))
+
+    report = pd.DataFrame(rows, columns=DIFF_REPORT_COLUMNS)
+    return report.sort_values(['Status', 'Type', 'Host', 'Value'], kind='stable').reset_index(drop=True)
+
+
+def verify_template(converter: DNSConverter, source_path: str, template_path: str) -> pd.DataFrame:
+    """将源文件按转换规则得到的记录与DNSPOD模板比对，返回差异报告"""
+    source_df = converter.read_dns_file(source_path)
+    expected_df = converter.convert_dns_records_vectorized(source_df)
+    if converter.dedup:
+        expected_df = converter.deduplicate_records(expected_df, RecordDeduplicator())
+    with converter.stage('read'):
+        actual_df = read_dnspod_template(template_path)
+    print(f"成功读取DNSPOD模板: {template_path}，共 {len(actual_df)} 条记录")
+
+    with converter.stage('diff'):
+        report = diff_records(expected_df, actual_df)
+    converter.counters['diff_expected'] += len(expected_df)
+    converter.counters['diff_actual'] += len(actual_df)
+    converter.counters['diff_differences'] += len(report)
+    return report
+
+
+def print_diff_summary(report: pd.DataFrame, expected: int, actual: int):
+    """打印差异摘要"""
+    print("\n=== 比对结果 ===")
+    print(f"应导入记录: {expected} 条，模板记录: {actual} 条")
+    if report.empty:
+        print("模板与源文件完全一致")
+        return
+
+    labels = {
+        'missing': '模板中缺少',
+        'extra': '模板中多出',
+        'ttl_mismatch': 'TTL不一致',
+        'mx_mismatch': 'MX优先级不一致',
+        'ttl_mx_mismatch': 'TTL和MX优先级都不一致',
+    }
+    for status, count in report['Status'].value_counts().items():
+        print(f"{labels.get(status, status)}: {count} 条")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='比对华为云/阿里云导出文件与DNSPOD模板')
+    parser.add_argument('source_file', help='华为云/阿里云DNS导出文件（Excel或CSV）')
+    parser.add_argument('template_file', help='DNSPOD模板文件（Excel或CSV）')
+    parser.add_argument('-o', '--output', help='差异报告路径（CSV，默认为 <模板文件名>_verify.csv）')
+    parser.add_argument('--zone', help='主域名（与转换时使用的 --zone 相同）')
+    parser.add_argument('--rules', help='迁移改写规则文件（与转换时使用的 --rules 相同）')
+    args = parser.parse_args()
+
+    for path in (args.source_file, args.template_file):
+        if not os.path.exists(path):
+            print(f"错误: 文件不存在: {path}")
+            sys.exit(1)
+
+    rules = None
+    if args.rules:
+        try:
+            rules = RewriteRules.from_file(args.rules)
+        except ValueError as e:
+            print(f"错误: {e}")
+            sys.exit(1)
+        print(f"已加载改写规则: {args.rules}（{rules.rule_count} 条）")
+
+    converter = DNSConverter(zone=args.zone, rewrite_rules=rules)
+    try:
+        report = verify_template(converter, args.source_file, args.template_file)
+    except ValueError as e:
+        print(f"比对失败: {e}")
+        sys.exit(1)
+
+    print_diff_summary(report, converter.counters['diff_expected'], converter.counters['diff_actual'])
+    if not report.empty:
+        output = args.output or f"{os.path.splitext(args.template_file)[0]}_verify.csv"
+        report.to_csv(output, index=False, encoding='utf-8-sig')
+        print(f"差异报告已保存到: {output}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量转换缓存
+
+在输出文件旁保存一个SQLite缓存（<输出文件名>.cache.sqlite），以标准化后输入行的
+内容哈希为键保存转换结果。再次转换同一区域时，只有新增或变化的行需要执行
+convert_record，未变化的行直接复用缓存的结果。
+
+每次运行结束时与上一次运行的结果对比，按 (记录类型, 主机记录) 分组生成差异报告：
+- added：新增的记录
+- removed：删除的记录
+- changed_old / changed_new：同一主机记录和类型下变化前后的记录
+
+作者: DNS转换工具开发团队
+许可证: MIT License
+"""
+
+import csv
+import hashlib
+import marshal
+import os
+import sqlite3
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Tuple
+
+# 缓存格式版本，转换规则变化时递增以使旧缓存失效
+CACHE_VERSION = 2
+
+# convert_record 使用的标准列，行哈希只包含这些列
+HASHED_COLUMNS = ('Type', 'Host', 'Value', 'TTL', 'MX', 'Remarks')
+
+# 行哈希的字节数
+HASH_SIZE = 16
+
+DIFF_COLUMNS = ['Change', 'Type', 'Host', 'Split Zone', 'Value', 'MX', 'TTL', 'Remarks']
+
+
+def cache_path_for(output_path: str) -> str:
+    """根据输出文件路径生成缓存文件路径"""
+    return f"{os.path.splitext(output_path)[0]}.cache.sqlite"
+
+
+def diff_report_path(output_path: str) -> str:
+    """根据输出文件路径生成差异报告路径"""
+    return f"{os.path.splitext(output_path)[0]}_diff.csv"
+
+
+class IncrementalCache:
+    """增量转换缓存：按输入行的内容哈希保存转换结果，并记录每次运行的输入行
+
+    每次运行的输入行哈希按顺序拼接为一个BLOB保存；转换结果使用 marshal 序列化，
+    打开缓存时一次性读入内存，逐行查询只需一次字典查找。
+    """
+
+    def __init__(self, path: str, settings: str = ''):
+        self.path = path
+        # 转换设置（如主域名）和序列化格式参与哈希，变化后所有行都会重新转换
+        self._salt = f"{CACHE_VERSION}|{marshal.version}|{settings}|".encode('utf-8')
+        self._pending: List[Tuple[bytes, bytes]] = []
+        self._current: List[bytes] = []
+
+        self._db = sqlite3.connect(path)
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS conversions (hash BLOB PRIMARY KEY, records BLOB NOT NULL);
+            CREATE TABLE IF NOT EXISTS runs (name TEXT PRIMARY KEY, hashes BLOB NOT NULL);
+        ''')
+        row = self._db.execute("SELECT hashes FROM runs WHERE name = 'previous'").fetchone()
+        self._previous = row[0] if row else b''
+        self.has_previous_run = row is not None
+        self._conversions: Dict[bytes, bytes] = dict(
+            self._db.execute('SELECT hash, records FROM conversions'))
+
+    def row_hash(self, record: Dict[str, Any]) -> bytes:
+        """计算标准化输入行的内容哈希（值的类型也参与哈希，如 5 与 5.0 不同）"""
+        content = repr(tuple(map(record.get, HASHED_COLUMNS))).encode('utf-8')
+        return hashlib.blake2b(self._salt + content, digest_size=HASH_SIZE).digest()
+
+    def lookup(self, hashes: List[bytes]) -> Dict[bytes, List[tuple]]:
+        """批量查询缓存的转换结果，同时将这些行记入本次运行"""
+        self._current.extend(hashes)
+        conversions = self._conversions
+        return {row_hash: marshal.loads(conversions[row_hash])
+                for row_hash in set(hashes) if row_hash in conversions}
+
+    def store(self, row_hash: bytes, records: Iterable[Iterable[Any]]):
+        """保存一行的转换结果（积累到一定数量后批量写入）"""
+        data = marshal.dumps([tuple(record) for record in records])
+        self._conversions[row_hash] = data
+        self._pending.append((row_hash, data))
+        if len(self._pending) >= 10000:
+            self._flush()
+
+    def _flush(self):
+        self._db.executemany('INSERT OR REPLACE INTO conversions VALUES (?, ?)', self._pending)
+        self._pending.clear()
+
+    def _outputs(self, hashes: Counter) -> Counter:
+        """取出一组行哈希（含重复次数）对应的转换结果"""
+        outputs = Counter()
+        for row_hash, count in hashes.items():
+            records = self._conversions.get(row_hash)
+            if records is not None:
+                for record in marshal.loads(records):
+                    outputs[record] += count
+        return outputs
+
+    def diff(self) -> List[tuple]:
+        """对比上一次运行与本次运行，返回差异记录 (变化类型, *DNSPOD记录)"""
+        previous = Counter(self._previous[start:start + HASH_SIZE]
+                           for start in range(0, len(self._previous), HASH_SIZE))
+        current = Counter(self._current)
+        # 内容相同的行转换结果也相同，只需比较变化的行
+        removed = self._outputs(previous - current)
+        added = self._outputs(current - previous)
+        removed, added = removed - added, added - removed
+
+        groups = defaultdict(lambda: ([], []))
+        for record, count in removed.items():
+            groups[record[:2]][0].extend([record] * count)
+        for record, count in added.items():
+            groups[record[:2]][1].extend([record] * count)
+
+        changes = []
+        for key in sorted(groups):
+            old, new = groups[key]
+            if old and new:
+                changes.extend(('changed_old', *record) for record in old)
+                changes.extend(('changed_new', *record) for record in new)
+            elif old:
+                changes.extend(('removed', *record) for record in old)
+            else:
+                changes.extend(('added', *record) for record in new)
+        return changes
+
+    def finish(self, diff_path: str) -> Counter:
+        """保存缓存、写出差异报告，并将本次运行记为上一次运行；返回各变化类型的记录数"""
+        self._flush()
+        changes = self.diff()
+        with open(diff_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(DIFF_COLUMNS)
+            writer.writerows(changes)
+
+        # 只保留本次运行用到的转换结果，缓存大小不随运行次数增长
+        current = set(self._current)
+        stale = [(row_hash,) for row_hash in self._conversions if row_hash not in current]
+        self._db.executemany('DELETE FROM conversions WHERE hash = ?', stale)
+        self._db.execute("INSERT OR REPLACE INTO runs VALUES ('previous', ?)", (b''.join(self._current),))
+        self._db.commit()
+        return Counter(change[0] for change in changes)
+
+    def close(self):
+        """关闭缓存（未调用 finish 时放弃本次运行的记录）"""
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+输入文件解析结果缓存
+
+read_dns_file 每次都要完整解析Excel文件，再检测云服务商、标准化列名并执行记录值转换。
+调整转换选项时往往反复转换同一个导出文件，这里把标准化后的DataFrame保存到本地缓存目录，
+再次读取同一文件时直接加载。
+
+缓存以文件内容哈希为键（同时包含缓存版本、pandas版本和主域名等影响解析结果的设置），
+SQLite索引记录每个文件的路径、大小和修改时间：三者都未变化时无需重新计算内容哈希；
+文件被复制或只修改了时间时，按内容哈希仍能命中。缓存总大小超过上限时按最近使用时间淘汰。
+
+DataFrame使用pickle保存：标准化后的列可能混合整数和字符串（如MX优先级列），
+pickle能原样还原列的类型，保证从缓存加载后的转换结果与直接读取完全一致。
+
+作者: DNS转换工具开发团队
+许可证: MIT License
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Dict, Optional, Tuple
+
+from dns_core import LazyModule
+
+pd = LazyModule('pandas')
+
+# 缓存格式版本，读取或标准化规则变化时递增以使旧缓存失效
+INPUT_CACHE_VERSION = 1
+
+# 缓存总大小的默认上限
+DEFAULT_INPUT_CACHE_BYTES = 1024 ** 3
+
+# 计算内容哈希时每次读取的字节数
+HASH_BLOCK_SIZE = 1024 * 1024
+
+INDEX_FILE = 'index.sqlite'
+
+
+def default_input_cache_dir() -> str:
+    """默认的缓存目录（XDG_CACHE_HOME、Windows的LOCALAPPDATA或 ~/.cache 下）"""
+    base = (os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA')
+            or os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'huawei-dns-to-dnspod', 'inputs')
+
+
+def file_digest(file_path: str) -> str:
+    """计算文件内容的哈希"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class InputCache:
+    """输入文件解析结果缓存：按文件内容哈希保存标准化后的DataFrame，总大小超过上限时淘汰最久未使用的条目"""
+
+    def __init__(self, directory: str = None, max_bytes: int = DEFAULT_INPUT_CACHE_BYTES, settings: str = ''):
+        self.directory = directory or default_input_cache_dir()
+        self.max_bytes = max_bytes
+        # 影响解析结果的设置（如区域文件的主域名）与版本一起参与缓存键
+        self.settings = f"{INPUT_CACHE_VERSION}|{pd.__version__}|{settings}"
+        # 本次查询过的文件：绝对路径 → 缓存键，保存时不必重新计算内容哈希
+        self._keys: Dict[str, str] = {}
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(self.directory, INDEX_FILE), timeout=30)
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY, provider TEXT NOT NULL, rows INTEGER NOT NULL,
+                bytes INTEGER NOT NULL, last_used REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT NOT NULL, settings TEXT NOT NULL, size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL, key TEXT NOT NULL, PRIMARY KEY (path, settings));
+        ''')
+
+    def close(self):
+        self._db.close()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _cache_key(self, file_path: str) -> str:
+        """返回文件的缓存键：路径、大小和修改时间与索引一致时直接使用索引中的键，否则计算内容哈希"""
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        row = self._db.execute('SELECT key FROM files WHERE path = ? AND settings = ? AND size = ? AND mtime_ns = ?',
+                               (path, self.settings, stat.st_size, stat.st_mtime_ns)).fetchone()
+        if row:
+            key = row[0]
+        else:
+            content = f"{self.settings}|{file_digest(path)}".encode('utf-8')
+            key = hashlib.blake2b(content, digest_size=16).hexdigest()
+            with self._db:
+                self._db.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)',
+                                 (path, self.settings, stat.st_size, stat.st_mtime_ns, key))
+        self._keys[path] = key
+        return key
+
+    def get(self, file_path: str) -> Optional[Tuple[pd.DataFrame, str]]:
+        """查询文件的解析结果，命中时返回 (标准化后的DataFrame, 云服务商名称)"""
+        key = self._cache_key(file_path)
+        row = self._db.execute('SELECT provider FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            df = pd.read_pickle(self._entry_path(key))
+        except Exception as e:
+            # 缓存文件损坏或被删除时丢弃该条目，重新读取输入文件
+            print(f"警告: 输入缓存读取失败，重新解析文件: {e}")
+            self._remove(key)
+            return None
+        with self._db:
+            self._db.execute('UPDATE entries SET last_used = ? WHERE key = ?', (time.time(), key))
+        return df, row[0]
+
+    def put(self, file_path: str, df: pd.DataFrame, provider: str):
+        """保存文件的解析结果，并按总大小上限淘汰最久未使用的条目"""
+        path = os.path.abspath(file_path)
+        key = self._keys.get(path) or self._cache_key(path)
+        entry_path = self._entry_path(key)
+        temp_path = f"{entry_path}.{os.getpid()}.tmp"
+        df.to_pickle(temp_path)
+        size = os.path.getsize(temp_path)
+        if size > self.max_bytes:
+            os.remove(temp_path)
+            return
+        # 先写临时文件再替换，并行转换多个文件时不会读到写了一半的缓存
+        os.replace(temp_path, entry_path)
+        with self._db:
+            self._db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)',
+                             (key, provider, len(df), size, time.time()))
+        self.evict()
+
+    def evict(self):
+        """总大小超过上限时，按最近使用时间从旧到新删除条目"""
+        total = self._db.execute('SELECT COALESCE(SUM(bytes), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute('SELECT key, bytes FROM entries ORDER BY last_used').fetchall():
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+
+    def _remove(self, key: str):
+        with self._db:
+            self._db.execute('DELETE FROM entries WHERE key = ?', (key,))
+            self._db.execute('DELETE FROM files WHERE key = ?', (key,))
+        try:
+            os.remove(self._entry_path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> int:
+        """清空缓存（包括中断时遗留的临时文件），返回删除的条目数"""
+        count = self._db.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+        with self._db:
+            self._db.execute('DELETE FROM entries')
+            self._db.execute('DELETE FROM files')
+        for name in os.listdir(self.directory):
+            if name.endswith(('.pkl', '.tmp')):
+                os.remove(os.path.join(self.directory, name))
+        return count
+
+    def stats(self) -> Dict[str, int]:
+        """返回缓存的条目数和总字节数"""
+        entries, total = self._db.execute('SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM entries').fetchone()
+        return {'entries': entries, 'bytes': total}
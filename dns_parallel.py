@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单个文件的多进程并行转换
+
+将标准化列名后的记录按行号拆分为连续的块，在进程池中分别转换（列式或逐行引擎），
+再按块的顺序合并结果，输出与单进程转换完全一致（记录顺序确定）。
+
+每个工作进程只创建一次转换器，主机记录、记录值和TTL的缓存在该进程处理的各块之间共用。
+各块保留原始行号，出错信息（如“转换第 N 条记录时出错”）中的 N 与单进程转换相同；
+每块的记录数、错误数、耗时和出错信息保存在块报告中。
+
+不按CSV字节范围拆分：华为云的多IP记录值是带引号的多行单元格，按换行切分会拆断记录。
+
+作者: DNS转换工具开发团队
+许可证: MIT License
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import math
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Tuple
+
+from dns_core import LazyModule
+
+pd = LazyModule('pandas')
+
+# 每个进程平均分到的块数（块越多负载越均衡，但进程间传递数据的开销越大）
+CHUNKS_PER_WORKER = 4
+
+# 每块的最少记录数，记录数不超过该值时不启动进程池
+MIN_CHUNK_ROWS = 10000
+
+# 需要在块报告中保留的记录级输出（出错、警告和跳过的记录）
+CHUNK_MESSAGE_PREFIXES = ('转换第', '警告', '跳过')
+
+# 工作进程中的转换器（由 _init_worker 创建，各块共用）
+_worker_converter = None
+
+
+def plan_chunks(total: int, workers: int, chunk_rows: int = None) -> List[Tuple[int, int]]:
+    """将 total 条记录划分为连续的块，返回每块的 (起始行, 结束行)"""
+    if total == 0:
+        return []
+    if not chunk_rows:
+        chunk_rows = max(MIN_CHUNK_ROWS, math.ceil(total / (workers * CHUNKS_PER_WORKER)))
+    return [(start, min(start + chunk_rows, total)) for start in range(0, total, chunk_rows)]
+
+
+def _init_worker(converter_options: Dict[str, Any]):
+    """工作进程初始化：创建转换器"""
+    global _worker_converter
+    from dns_converter import DNSConverter
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        _worker_converter = DNSConverter(**converter_options)
+
+
+def _convert_chunk(chunk: pd.DataFrame, engine: str) -> Dict[str, Any]:
+    """转换一块记录，返回转换结果、计数器和记录级输出"""
+    converter = _worker_converter
+    converter.reset_instrumentation()
+    log = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(log):
+        if engine == 'row':
+            dnspod_df = converter.convert_dns_records(chunk)
+        else:
+            dnspod_df = converter.convert_dns_records_vectorized(chunk)
+    return {
+        'dnspod_df': dnspod_df,
+        'counters': dict(converter.counters),
+        'elapsed': time.perf_counter() - start,
+        'messages': [line for line in log.getvalue().splitlines()
+                     if line.startswith(CHUNK_MESSAGE_PREFIXES)],
+    }
+
+
+def convert_parallel(dns_df: pd.DataFrame, converter_options: Dict[str, Any], engine: str = 'vectorized',
+                     workers: int = 2, chunk_rows: int = None,
+                     progress: Callable[[float], None] = None) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """在进程池中分块转换记录，按原始顺序合并，返回 (DNSPOD记录, 各块的转换报告)
+
+    各块保留原始行号，出错信息中的行号与单进程转换一致。
+    """
+    chunks = plan_chunks(len(dns_df), workers, chunk_rows)
+    results = [None] * len(chunks)
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(chunks))), initializer=_init_worker,
+                             initargs=(converter_options,)) as executor:
+        futures = {executor.submit(_convert_chunk, dns_df.iloc[start:end], engine): number
+                   for number, (start, end) in enumerate(chunks)}
+        for done, future in enumerate(as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            if progress is not None:
+                progress(done / len(chunks))
+
+    # 空的块不参与合并，避免改变列的类型
+    frames = [result.pop('dnspod_df') for result in results]
+    non_empty = [frame for frame in frames if len(frame)]
+    dnspod_df = pd.concat(non_empty, ignore_index=True) if non_empty else frames[0]
+
+    reports = []
+    for number, ((start, end), result) in enumerate(zip(chunks, results), 1):
+        counters = result['counters']
+        reports.append({
+            'chunk': number,
+            'rows': [start + 1, end],
+            'input_records': counters.get('input_records', 0),
+            'output_records': counters.get('output_records', 0),
+            'errors': counters.get('errors', 0),
+            'elapsed': round(result['elapsed'], 6),
+            'counters': counters,
+            'messages': result['messages'],
+        })
+    return dnspod_df, reports
+
+
+def merge_chunk_counters(reports: List[Dict[str, Any]]) -> Counter:
+    """合并各块的计数器"""
+    counters = Counter()
+    for report in reports:
+        counters.update(report['counters'])
+    return counters
+
+
+def print_chunk_summary(reports: List[Dict[str, Any]]):
+    """按块的顺序输出记录级信息，并列出有出错记录的块"""
+    for report in reports:
+        for message in report['messages']:
+            print(message)
+    for report in reports:
+        if report['errors']:
+            first, last = report['rows']
+            print(f"第 {report['chunk']} 块（第 {first}-{last} 条记录）: {report['errors']} 条记录转换出错")
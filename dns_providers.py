@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+云服务商导出格式配置
+
+每种导出格式（华为云、阿里云、Cloudflare、Route53、GoDaddy）对应一个 ProviderProfile：
+识别用的表头、列名到标准列名（Type/Host/Value/TTL/MX/Remarks）的映射，以及按列执行的
+记录值转换（如Route53的MX记录值拆分出优先级、Cloudflare的自动TTL）。
+
+各格式的表头在模块加载时预先建立索引（表头列名集合 → 格式），检测只需一次哈希查找；
+表头与已知格式不完全一致时按特征列匹配，结果按表头缓存，批量转换多种格式的文件时
+相同的表头只检测一次。
+
+JSON输入（Route53 的 list-resource-record-sets 输出，GoDaddy/Cloudflare API 返回的
+记录列表）先展开为每个记录值一行，再按表头检测格式。
+
+作者: DNS转换工具开发团队
+许可证: MIT License
+"""
+
+import json
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Tuple
+
+NAN = float('nan')
+
+# 通用的列名映射（华为云/阿里云等中英文混合的导出文件），键为小写列名
+COLUMN_MAPPING = {
+    # 记录类型
+    '类型': 'Type', 'type': 'Type', '记录类型': 'Type',
+    # 主机记录
+    '主机记录': 'Host', 'host': 'Host', '名称': 'Host', 'name': 'Host', '域名': 'Host',
+    # 记录值
+    '记录值': 'Value', 'value': 'Value', '值': 'Value', 'ip': 'Value', 'target': 'Value',
+    # TTL
+    'ttl': 'TTL', 'ttl值': 'TTL', 'ttl(秒)': 'TTL',
+    # MX优先级
+    'mx': 'MX', '优先级': 'MX', 'priority': 'MX', 'mx优先级': 'MX',
+    # 备注
+    '备注': 'Remarks', 'remarks': 'Remarks', 'comment': 'Remarks', '说明': 'Remarks',
+    # 阿里云特有列（不参与转换）
+    '解析线路': 'Line', '线路': 'Line',
+    '状态(启用/暂停)': 'Status', '状态': 'Status'
+}
+
+# Cloudflare 导出的CSV（与API的记录字段相同）
+CLOUDFLARE_COLUMN_MAPPING = {
+    'type': 'Type', 'name': 'Host', 'content': 'Value', 'ttl': 'TTL',
+    'priority': 'MX', 'comment': 'Remarks', 'proxied': 'Proxied',
+}
+
+# GoDaddy API的记录字段（SRV记录的优先级、权重和端口为单独的字段）
+GODADDY_COLUMN_MAPPING = {
+    'type': 'Type', 'name': 'Host', 'data': 'Value', 'ttl': 'TTL', 'priority': 'MX',
+    'weight': 'Weight', 'port': 'Port', 'service': 'Service', 'protocol': 'Protocol',
+}
+
+# Route53 记录集展开后的字段（每个 ResourceRecords 中的值一行）
+ROUTE53_COLUMN_MAPPING = {
+    'name': 'Host', 'type': 'Type', 'ttl': 'TTL', 'resourcerecords': 'Value',
+    'setidentifier': 'Remarks',
+}
+ROUTE53_COLUMNS = ['Name', 'Type', 'TTL', 'ResourceRecords', 'SetIdentifier']
+
+# JSON格式的输入文件
+JSON_EXTENSIONS = ('.json',)
+
+# Cloudflare 的 TTL 为1表示自动，转换为DNSPOD的默认TTL
+CLOUDFLARE_AUTO_TTL = 1
+DEFAULT_TTL = 600
+
+# Route53 名称中的八进制转义（如通配符 \052）
+OCTAL_ESCAPE_RE = re.compile(r'\\([0-7]{3})')
+
+# TXT记录值中的各段带引号字符串
+QUOTED_STRING_RE = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+# 检测结果和标准化列名缓存的表头数
+PROFILE_CACHE_SIZE = 256
+
+# 按列执行的记录值转换：(输出列, 输入列, 函数)，函数按输入列的顺序接收同一行的值
+ValueTransform = Tuple[str, Tuple[str, ...], Callable[..., Any]]
+
+
+def is_json_file(file_path: str) -> bool:
+    """按扩展名判断是否为JSON格式的记录文件"""
+    return file_path.lower().endswith(JSON_EXTENSIONS)
+
+
+def header_key(columns: Iterable[Any]) -> FrozenSet[str]:
+    """表头的索引键：去除首尾空白并转为小写的列名集合"""
+    return frozenset(str(column).strip().lower() for column in columns)
+
+
+def _is_blank(value: Any) -> bool:
+    """判断单元格是否为空（None、NaN或空字符串）"""
+    return value is None or value != value or value == ''
+
+
+def _record_type(value: Any) -> str:
+    """标准化记录类型（用于按类型执行的转换）"""
+    return '' if _is_blank(value) else str(value).strip().upper()
+
+
+def _integer_text(value: Any) -> str:
+    """将优先级、权重、端口等数值转换为整数文本（如 10.0 → 10）"""
+    try:
+        return str(int(float(value)))
+    except (TypeError, ValueError):
+        return str(value).strip()
+
+
+def cloudflare_ttl(ttl: Any) -> Any:
+    """Cloudflare 的自动TTL（1）转换为默认TTL"""
+    try:
+        return DEFAULT_TTL if float(ttl) == CLOUDFLARE_AUTO_TTL else ttl
+    except (TypeError, ValueError):
+        return ttl
+
+
+def priority_text(priority: Any) -> Any:
+    """MX优先级转换为整数文本（含空值的优先级列读取后为浮点数）"""
+    return '' if _is_blank(priority) else _integer_text(priority)
+
+
+def cloudflare_value(record_type: Any, value: Any, priority: Any) -> Any:
+    """Cloudflare 的SRV记录值为 weight port target，优先级为单独的字段，补全为 priority weight port target"""
+    if _record_type(record_type) != 'SRV' or _is_blank(value) or _is_blank(priority):
+        return value
+    if len(str(value).split()) != 3:
+        return value
+    return f"{_integer_text(priority)} {str(value).strip()}"
+
+
+def godaddy_host(record_type: Any, host: Any, service: Any, protocol: Any) -> Any:
+    """GoDaddy 的SRV记录由 service、protocol 和 name 组成主机记录（如 _sip._tcp.www）"""
+    if _record_type(record_type) != 'SRV' or _is_blank(service):
+        return host
+    parts = [str(service).strip(), str(protocol).strip() if not _is_blank(protocol) else '']
+    if not _is_blank(host) and str(host).strip() != '@':
+        parts.append(str(host).strip())
+    return '.'.join(part for part in parts if part)
+
+
+def godaddy_value(record_type: Any, value: Any, priority: Any, weight: Any, port: Any) -> Any:
+    """GoDaddy 的SRV记录值只有目标主机名，按 priority weight port target 组成记录值"""
+    if _record_type(record_type) != 'SRV' or any(map(_is_blank, (value, priority, weight, port))):
+        return value
+    return ' '.join([_integer_text(priority), _integer_text(weight), _integer_text(port), str(value).strip()])
+
+
+def route53_name(name: Any) -> Any:
+    """还原 Route53 名称中的八进制转义（\\052 → *）"""
+    if _is_blank(name) or '\\' not in str(name):
+        return name
+    return OCTAL_ESCAPE_RE.sub(lambda match: chr(int(match.group(1), 8)), str(name))
+
+
+def route53_mx_priority(record_type: Any, value: Any) -> Any:
+    """Route53 的MX记录值为 "优先级 目标主机名"，取出优先级"""
+    if _record_type(record_type) != 'MX' or _is_blank(value):
+        return ''
+    priority, _, target = str(value).strip().partition(' ')
+    return priority if target else ''
+
+
+def route53_value(record_type: Any, value: Any) -> Any:
+    """Route53 的MX记录值去掉优先级，TXT记录值的多段字符串拼接为一段"""
+    record_type = _record_type(record_type)
+    if _is_blank(value):
+        return value
+    if record_type == 'MX':
+        priority, _, target = str(value).strip().partition(' ')
+        return target.strip() if target else priority
+    if record_type in ('TXT', 'SPF'):
+        parts = QUOTED_STRING_RE.findall(str(value))
+        if len(parts) > 1:
+            return '"' + ''.join(parts) + '"'
+    return value
+
+
+class ProviderProfile:
+    """一种云服务商导出格式：显示名称、识别用的表头、列名映射和按列执行的记录值转换"""
+
+    def __init__(self, key: str, name: str, column_mapping: Dict[str, str],
+                 signatures: Iterable[Iterable[str]] = (), markers: Iterable[str] = (),
+                 transforms: Iterable[ValueTransform] = ()):
+        self.key = key
+        self.name = name
+        self.column_mapping = column_mapping
+        # 完整的表头（列名集合），用于建立索引
+        self.signatures = [header_key(columns) for columns in signatures]
+        # 表头不完全一致时，列名中含有这些特征的文件按该格式处理
+        self.markers = tuple(markers)
+        self.transforms = list(transforms)
+        self._normalize_header = lru_cache(maxsize=PROFILE_CACHE_SIZE)(self._map_columns)
+
+    def __repr__(self):
+        return f'ProviderProfile({self.key!r})'
+
+    def normalize_columns(self, columns: Iterable[Any]) -> List[Any]:
+        """将列名标准化为 Type/Host/Value/TTL/MX/Remarks 等标准列名，不认识的列名保持不变（结果按表头缓存）"""
+        return list(self._normalize_header(tuple(columns)))
+
+    def _map_columns(self, header: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        """按列名映射标准化表头（不使用缓存）"""
+        mapping = self.column_mapping
+        return tuple(mapping.get(str(column).strip().lower(), column) for column in header)
+
+    def transform_columns(self, columns: Dict[str, List[Any]], length: int) -> Dict[str, List[Any]]:
+        """按列执行记录值转换，返回需要替换（或新增）的列；所有转换都读取转换前的列"""
+        missing = [NAN] * length
+        return {target: list(map(func, *(columns.get(name, missing) for name in sources)))
+                for target, sources, func in self.transforms}
+
+    def transform_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """对单条记录（标准列名）执行记录值转换"""
+        if not self.transforms:
+            return record
+        updates = {target: func(*(record.get(name, NAN) for name in sources))
+                   for target, sources, func in self.transforms}
+        record.update(updates)
+        return record
+
+    @property
+    def transform_inputs(self) -> List[str]:
+        """记录值转换读取的标准列"""
+        return list(dict.fromkeys(name for _, sources, _ in self.transforms for name in sources))
+
+
+HUAWEI = ProviderProfile(
+    'huawei', '华为云', COLUMN_MAPPING,
+    signatures=[['类型', '主机记录', '记录值', 'TTL', '备注', 'MX'],
+                ['Type', 'Name', 'Value', 'TTL', 'Remarks', 'MX']],
+    markers=['备注', 'remarks'])
+
+ALIYUN = ProviderProfile(
+    'aliyun', '阿里云', COLUMN_MAPPING,
+    signatures=[['记录类型', '主机记录', '解析线路', '记录值', 'MX优先级', 'TTL值', '状态(启用/暂停)'],
+                ['记录类型', '主机记录', '解析线路', '记录值', 'MX优先级', 'TTL值']],
+    markers=['线路'])
+
+CLOUDFLARE = ProviderProfile(
+    'cloudflare', 'Cloudflare', CLOUDFLARE_COLUMN_MAPPING,
+    signatures=[['type', 'name', 'content', 'ttl', 'priority', 'proxied'],
+                ['type', 'name', 'content', 'ttl', 'priority', 'proxied', 'comment'],
+                ['type', 'name', 'content', 'ttl', 'proxied']],
+    markers=['content', 'proxied'],
+    transforms=[('TTL', ('TTL',), cloudflare_ttl),
+                ('MX', ('MX',), priority_text),
+                ('Value', ('Type', 'Value', 'MX'), cloudflare_value)])
+
+ROUTE53 = ProviderProfile(
+    'route53', 'Route53', ROUTE53_COLUMN_MAPPING,
+    signatures=[ROUTE53_COLUMNS, ROUTE53_COLUMNS[:4]],
+    markers=['resourcerecords'],
+    transforms=[('Host', ('Host',), route53_name),
+                ('MX', ('Type', 'Value'), route53_mx_priority),
+                ('Value', ('Type', 'Value'), route53_value)])
+
+GODADDY = ProviderProfile(
+    'godaddy', 'GoDaddy', GODADDY_COLUMN_MAPPING,
+    signatures=[['type', 'name', 'data', 'ttl'],
+                ['type', 'name', 'data', 'ttl', 'priority'],
+                ['type', 'name', 'data', 'ttl', 'priority', 'weight', 'port', 'service', 'protocol']],
+    markers=['data'],
+    transforms=[('Host', ('Type', 'Host', 'Service', 'Protocol'), godaddy_host),
+                ('Value', ('Type', 'Value', 'MX', 'Weight', 'Port'), godaddy_value),
+                ('MX', ('MX',), priority_text)])
+
+# 表头不完全一致时按此顺序匹配特征列，都不匹配时按华为云处理
+PROVIDER_PROFILES = [ROUTE53, CLOUDFLARE, GODADDY, ALIYUN, HUAWEI]
+DEFAULT_PROFILE = HUAWEI
+
+PROFILES_BY_KEY = {profile.key: profile for profile in PROVIDER_PROFILES}
+
+# 表头签名索引：完整表头（列名集合）→ 导出格式
+PROFILE_INDEX: Dict[FrozenSet[str], ProviderProfile] = {
+    signature: profile for profile in PROVIDER_PROFILES for signature in profile.signatures
+}
+
+
+def _match_profile(key: FrozenSet[str]) -> ProviderProfile:
+    """按特征列匹配导出格式（表头不在索引中时使用）"""
+    for profile in PROVIDER_PROFILES:
+        if any(marker in column for marker in profile.markers for column in key):
+            return profile
+    return DEFAULT_PROFILE
+
+
+@lru_cache(maxsize=PROFILE_CACHE_SIZE)
+def _detect_header(header: Tuple[Any, ...]) -> ProviderProfile:
+    """按原始表头检测导出格式（结果按表头缓存）"""
+    key = header_key(header)
+    profile = PROFILE_INDEX.get(key)
+    return profile if profile is not None else _match_profile(key)
+
+
+def detect_profile(columns: Iterable[Any]) -> ProviderProfile:
+    """根据表头检测导出格式"""
+    return _detect_header(tuple(columns))
+
+
+def detect_provider(columns: Iterable[Any]) -> str:
+    """根据列名检测云服务商名称"""
+    return detect_profile(columns).name
+
+
+def _iter_route53_rows(record_sets: List[Dict[str, Any]], warn=print):
+    """将 Route53 记录集展开为每个记录值一行；别名记录（AliasTarget）没有对应的DNSPOD记录，跳过"""
+    aliases = 0
+    for record_set in record_sets:
+        if 'AliasTarget' in record_set and not record_set.get('ResourceRecords'):
+            aliases += 1
+            continue
+        for resource_record in record_set.get('ResourceRecords', []):
+            yield {
+                'Name': record_set.get('Name', ''),
+                'Type': record_set.get('Type', ''),
+                'TTL': record_set.get('TTL', NAN),
+                'ResourceRecords': resource_record.get('Value', ''),
+                'SetIdentifier': record_set.get('SetIdentifier', ''),
+            }
+    if aliases:
+        warn(f"警告: 跳过 {aliases} 条Route53别名记录（AliasTarget）")
+
+
+def read_json_rows(file_path: str, warn=print) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """读取JSON格式的DNS记录，返回 (列名, 每条记录一个字典)
+
+    支持 Route53 的 {"ResourceRecordSets": [...]}、Cloudflare API 的 {"result": [...]}
+    以及记录字典的列表（如GoDaddy API）。列名按各字段首次出现的顺序排列。
+    """
+    with open(file_path, encoding='utf-8-sig') as f:
+        data = json.load(f)
+
+    if isinstance(data, dict) and 'ResourceRecordSets' in data:
+        return list(ROUTE53_COLUMNS), list(_iter_route53_rows(data['ResourceRecordSets'], warn))
+    if isinstance(data, dict) and isinstance(data.get('result'), list):
+        data = data['result']
+    if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+        raise ValueError(f"无法识别的JSON记录格式: {file_path}")
+
+    columns = list(dict.fromkeys(key for row in data for key in row))
+    return columns, data
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+迁移改写规则
+
+迁移时记录值往往也要随之改变：华为云的旧IP换成腾讯云的新IP，指向 *.huaweicloud.com 的
+CNAME换成新的目标。改写规则在转换过程中（记录值清理、多IP拆分之后）逐条应用于转换结果，
+不需要再用脚本对模板做后处理。
+
+规则文件为JSON格式，所有部分均可省略：
+
+    {
+      "ip_map": [
+        {"from": "192.0.2.0/24", "to": "203.0.113.0/24"},
+        {"from": "198.51.100.7", "to": "203.0.113.200"},
+        {"from": "10.0.0.0/8", "to": "203.0.113.1"}
+      ],
+      "target_map": [
+        {"from": "*.huaweicloud.com", "to": "*.tencentcloud.com"},
+        {"from": "*.cdn.huaweicloud.com", "to": "cdn.example.net"}
+      ],
+      "ttl": [
+        {"type": "MX", "ttl": 3600},
+        {"host": "*.dev", "ttl": 60},
+        {"host": "@", "type": "A", "ttl": 300}
+      ],
+      "types": {"exclude": ["CAA"]}
+    }
+
+- ip_map：A/AAAA记录的IP按最长前缀匹配改写。目标为网段时保留主机部分（重新编号，
+  目标网段不能小于源网段）；目标为单个地址时整个源网段都改写为该地址
+- target_map：CNAME、MX、PTR、SRV记录的目标域名按最长后缀匹配改写（不区分大小写，
+  保留末尾的点）。"*.后缀" 匹配该后缀下的所有子域名，不带 * 时只匹配该域名本身；
+  目标以 "*." 开头时只替换后缀、保留前面的标签，否则整个目标替换为新域名
+- ttl：按记录类型和主机记录覆盖TTL，主机记录同样支持 "*.后缀"，省略时匹配所有主机记录；
+  主机记录更具体的规则优先，同一主机记录下指定类型的规则优先
+- types：只保留 include 中的记录类型，或排除 exclude 中的记录类型（DNSPOD记录类型）
+
+规则在加载时编译为索引：IP网段组织为按位的前缀树（IPv4、IPv6各一棵），域名和主机记录
+组织为按标签倒序的后缀树，单条记录的查找为 O(前缀长度)，与规则条数无关。
+同一条记录的改写结果会被缓存（LRU）。
+
+作者: DNS转换工具开发团队
+许可证: MIT License
+"""
+
+import hashlib
+import ipaddress
+import json
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# target_map 改写的记录类型，SRV记录的目标为记录值的最后一个字段
+TARGET_RECORD_TYPES = ('CNAME', 'MX', 'PTR', 'SRV')
+
+# ip_map 改写的记录类型
+IP_RECORD_TYPES = ('A', 'AAAA')
+
+
+class _IPNode:
+    """IP前缀树节点"""
+
+    __slots__ = ('children', 'rule')
+
+    def __init__(self):
+        self.children: List[Optional['_IPNode']] = [None, None]
+        self.rule = None
+
+
+class IPPrefixTree:
+    """按位组织的IP前缀树，查找与地址匹配的最长前缀网段"""
+
+    def __init__(self, bits: int):
+        self.bits = bits
+        self._root = _IPNode()
+        self.size = 0
+
+    def insert(self, network, rule: Any):
+        """加入一个网段；相同网段重复加入时以后加入的为准"""
+        node = self._root
+        address = int(network.network_address)
+        for position in range(self.bits - 1, self.bits - 1 - network.prefixlen, -1):
+            bit = (address >> position) & 1
+            child = node.children[bit]
+            if child is None:
+                child = node.children[bit] = _IPNode()
+            node = child
+        if node.rule is None:
+            self.size += 1
+        node.rule = rule
+
+    def longest_match(self, address: int) -> Any:
+        """返回最长匹配网段的规则，没有匹配时返回None"""
+        node = self._root
+        best = node.rule
+        position = self.bits - 1
+        while position >= 0:
+            node = node.children[(address >> position) & 1]
+            if node is None:
+                break
+            if node.rule is not None:
+                best = node.rule
+            position -= 1
+        return best
+
+
+class _LabelNode:
+    """标签后缀树节点：exact 为恰好匹配该域名的值，wildcard 为匹配其所有子域名的值"""
+
+    __slots__ = ('children', 'exact', 'wildcard')
+
+    def __init__(self):
+        self.children: Dict[str, '_LabelNode'] = {}
+        self.exact = None
+        self.wildcard = None
+
+
+class LabelSuffixTree:
+    """按标签倒序组织的域名后缀树，支持 "*.后缀" 形式的通配规则"""
+
+    def __init__(self):
+        self._root = _LabelNode()
+        self.size = 0
+
+    def insert(self, pattern: str, value: Any):
+        """加入一条规则，pattern 为域名或 "*.后缀"（"*" 匹配所有域名）"""
+        labels = pattern.lower().rstrip('.').split('.')
+        wildcard = labels[0] == '*'
+        if wildcard:
+            labels = labels[1:]
+        node = self._root
+        for label in reversed(labels):
+            node = node.children.setdefault(label, _LabelNode())
+        if wildcard:
+            node.wildcard = value
+        else:
+            node.exact = value
+        self.size += 1
+
+    def matches(self, labels: List[str]) -> Iterator[Tuple[int, Any]]:
+        """按从具体到宽泛的顺序返回与域名（已转为小写的标签列表）匹配的 (后缀标签数, 值)"""
+        node = self._root
+        wildcards = []
+        for depth, label in enumerate(reversed(labels)):
+            if node.wildcard is not None:
+                wildcards.append((depth, node.wildcard))
+            node = node.children.get(label)
+            if node is None:
+                break
+        else:
+            if node.exact is not None:
+                yield len(labels), node.exact
+        yield from reversed(wildcards)
+
+
+class RewriteRules:
+    """编译后的改写规则"""
+
+    def __init__(self, rules: Dict[str, Any], cache_size: int = 65536):
+        if not isinstance(rules, dict):
+            raise ValueError("改写规则必须是JSON对象")
+        unknown = set(rules) - {'ip_map', 'target_map', 'ttl', 'types'}
+        if unknown:
+            raise ValueError(f"未知的改写规则: {', '.join(sorted(unknown))}")
+        self.rules = rules
+        self.cache_size = cache_size
+
+        self.ip_trees = {4: IPPrefixTree(32), 6: IPPrefixTree(128)}
+        for rule in rules.get('ip_map', []):
+            self._add_ip_rule(rule)
+
+        self.target_tree = LabelSuffixTree()
+        for rule in rules.get('target_map', []):
+            source, target = self._rule_pair(rule, 'target_map')
+            keep_prefix = target.startswith('*.')
+            self.target_tree.insert(source, (keep_prefix, target[2:] if keep_prefix else target))
+
+        self.ttl_tree = LabelSuffixTree()
+        ttl_rules: Dict[str, Dict[str, int]] = {}
+        for rule in rules.get('ttl', []):
+            try:
+                ttl = int(rule['ttl'])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"TTL改写规则缺少有效的 ttl: {rule}")
+            host = str(rule.get('host') or '*').strip().lower()
+            ttl_rules.setdefault(host, {})[str(rule.get('type') or '*').upper()] = ttl
+        for host, by_type in ttl_rules.items():
+            self.ttl_tree.insert(host, by_type)
+
+        types = rules.get('types', {})
+        self.include_types = {t.upper() for t in types['include']} if types.get('include') else None
+        self.exclude_types = {t.upper() for t in types.get('exclude', [])}
+
+        # 规则内容的摘要，参与增量缓存的键
+        self.fingerprint = hashlib.sha256(
+            json.dumps(rules, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+        # 记录值改写结果和TTL覆盖结果的缓存（LRU）：IP和目标域名、主机记录在导出文件中大量重复
+        self.rewrite_value = lru_cache(maxsize=cache_size)(self._rewrite_value)
+        self.ttl_override = lru_cache(maxsize=cache_size)(self._ttl_override)
+
+    def __reduce__(self):
+        # 编译后的缓存不能pickle：传给子进程时只传递规则内容，在子进程中重新编译一次
+        return self.__class__, (self.rules, self.cache_size)
+
+    @classmethod
+    def from_file(cls, path: str, cache_size: int = 65536) -> 'RewriteRules':
+        """从JSON规则文件加载"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                rules = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"无法读取改写规则文件 {path}: {e}")
+        return cls(rules, cache_size)
+
+    @staticmethod
+    def _rule_pair(rule: Dict[str, Any], section: str) -> Tuple[str, str]:
+        try:
+            return str(rule['from']).strip(), str(rule['to']).strip()
+        except (KeyError, TypeError):
+            raise ValueError(f"{section} 规则必须包含 from 和 to: {rule}")
+
+    def _add_ip_rule(self, rule: Dict[str, Any]):
+        """编译一条 ip_map 规则，规则值为 (源网段起始地址, 目标起始地址, 是否保留主机部分)"""
+        source, target = self._rule_pair(rule, 'ip_map')
+        try:
+            source_net = ipaddress.ip_network(source, strict=False)
+            target_net = ipaddress.ip_network(target, strict=False)
+        except ValueError as e:
+            raise ValueError(f"ip_map 规则的地址无效: {rule} ({e})")
+        if source_net.version != target_net.version:
+            raise ValueError(f"ip_map 规则的源地址和目标地址版本不同: {rule}")
+        renumber = '/' in target
+        if renumber and target_net.prefixlen > source_net.prefixlen:
+            raise ValueError(f"ip_map 规则的目标网段小于源网段: {rule}")
+        self.ip_trees[source_net.version].insert(
+            source_net, (int(source_net.network_address), int(target_net.network_address), renumber))
+
+    @property
+    def rule_count(self) -> int:
+        """编译后的规则条数"""
+        return (sum(tree.size for tree in self.ip_trees.values()) + self.target_tree.size
+                + self.ttl_tree.size + len(self.exclude_types) + len(self.include_types or ()))
+
+    def apply(self, record_type: str, host: str, value: str, ttl: int) -> Optional[Tuple[str, int]]:
+        """改写一条转换后的记录，返回 (记录值, TTL)；记录被类型过滤规则排除时返回None"""
+        if record_type in self.exclude_types or (
+                self.include_types is not None and record_type not in self.include_types):
+            return None
+        if record_type in IP_RECORD_TYPES or record_type in TARGET_RECORD_TYPES:
+            value = self.rewrite_value(record_type, value)
+        if self.ttl_tree.size:
+            override = self.ttl_override(record_type, host)
+            if override is not None:
+                ttl = override
+        return value, ttl
+
+    def _rewrite_value(self, record_type: str, value: str) -> str:
+        """按 ip_map 或 target_map 改写记录值（不使用缓存）"""
+        if record_type in IP_RECORD_TYPES:
+            return self.rewrite_ip(value)
+        if record_type == 'SRV':
+            head, _, target = value.rpartition(' ')
+            return f"{head} {self.rewrite_target(target)}" if head else self.rewrite_target(value)
+        return self.rewrite_target(value)
+
+    def rewrite_ip(self, value: str) -> str:
+        """按 ip_map 改写IP地址，不是合法IP或没有匹配的规则时原样返回"""
+        try:
+            address = ipaddress.ip_address(value)
+        except ValueError:
+            return value
+        rule = self.ip_trees[address.version].longest_match(int(address))
+        if rule is None:
+            return value
+        source_start, target_start, renumber = rule
+        offset = int(address) - source_start if renumber else 0
+        return str(type(address)(target_start + offset))
+
+    def rewrite_target(self, value: str) -> str:
+        """按 target_map 改写目标域名，没有匹配的规则时原样返回"""
+        if not self.target_tree.size or not value:
+            return value
+        absolute = value.endswith('.')
+        labels = value.rstrip('.').split('.')
+        for suffix_length, (keep_prefix, target) in self.target_tree.matches([label.lower() for label in labels]):
+            if keep_prefix:
+                target = '.'.join(labels[:len(labels) - suffix_length] + [target])
+            return f"{target.rstrip('.')}." if absolute else target.rstrip('.')
+        return value
+
+    def _ttl_override(self, record_type: str, host: str) -> Optional[int]:
+        """返回 ttl 规则为该记录指定的TTL，没有匹配的规则时返回None（不使用缓存）"""
+        for _, by_type in self.ttl_tree.matches(host.lower().split('.')):
+            override = by_type.get(record_type, by_type.get('*'))
+            if override is not None:
+                return override
+        return None
@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地转换服务
+
+脚本中反复调用 dns_converter.py 时，每次都要启动Python、导入pandas并重新创建转换器。
+这里以常驻进程的方式提供本地HTTP接口（TCP端口或Unix套接字）：启动时创建进程池，
+每个工作进程预先导入pandas/openpyxl并创建转换器，之后的转换任务直接使用已就绪的转换器
+（主机记录、记录值和TTL的标准化缓存也在任务之间共用）。
+
+接口：
+    POST /convert   请求体为JSON（Content-Type: application/json）时按路径转换：
+                        {"input": "/path/export.xlsx", "output": "/path/dnspod.xlsx", "zone": "example.com"}
+                    返回转换结果（各类型记录数、耗时、转换日志）
+                    请求体为文件内容时转换上传的文件，返回DNSPOD模板文件内容：
+                        POST /convert?filename=export.xlsx&format=csv
+    GET  /health    返回工作进程数、排队中的任务数和累计任务数
+
+排队中（已提交但未完成）的任务数达到上限（--max-pending）时返回 503 和 Retry-After，
+调用方稍后重试；等待超过 --timeout 秒的任务返回 504（已开始的转换仍会在工作进程中执行完）。
+每个响应都包含排队耗时、转换耗时和总耗时。
+
+使用方法：
+    python dns_service.py --port 8053 -j 4
+    python dns_service.py --socket /tmp/dns_service.sock
+
+    curl -s localhost:8053/convert -H 'Content-Type: application/json' \
+         -d '{"input": "export.xlsx", "output": "dnspod.xlsx"}'
+    curl -s --data-binary @export.xlsx "localhost:8053/convert?filename=export.xlsx" -o dnspod.xlsx
+
+作者: DNS转换工具开发团队
+许可证: MIT License
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import http.client
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from dns_input_cache import DEFAULT_INPUT_CACHE_BYTES, default_input_cache_dir
+from dns_rewrite import RewriteRules
+from dns_shard import parse_size
+
+DEFAULT_PORT = 8053
+
+# 排队中的任务数上限（默认为工作进程数的倍数）
+PENDING_PER_WORKER = 4
+
+# 等待单个任务完成的默认秒数
+DEFAULT_JOB_TIMEOUT = 300
+
+# 上传文件的默认大小上限
+DEFAULT_MAX_UPLOAD = 100 * 1024 * 1024
+
+# 每个工作进程最多保留的转换器数（不同的主域名和去重设置各使用一个转换器），超出时淘汰最久未使用的
+WORKER_CONVERTER_LIMIT = 16
+
+# 预热时每轮向每个工作进程提交一个短任务，最多重复的轮数
+WARM_UP_ROUNDS = 5
+WARM_UP_DELAY = 0.05
+
+# 上传转换支持的输出格式
+OUTPUT_CONTENT_TYPES = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+ENGINES = ('auto', 'core', 'vectorized', 'row')
+
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+# 工作进程中的默认转换器参数和已创建的转换器（参数 → 转换器）
+_worker_options: Dict[str, Any] = {}
+_worker_converters: Dict[Tuple, Any] = {}
+
+
+def _init_worker(converter_options: Dict[str, Any]):
+    """工作进程初始化：导入pandas/openpyxl并创建默认转换器"""
+    global _worker_options
+    _worker_options = converter_options
+    with contextlib.redirect_stdout(io.StringIO()):
+        import openpyxl  # noqa: F401
+        import pandas  # noqa: F401
+        _worker_converter({})
+
+
+def _worker_converter(overrides: Dict[str, Any]):
+    """返回工作进程中指定参数的转换器，不存在时创建（按最近使用的顺序淘汰，LRU）"""
+    from dns_converter import DNSConverter
+
+    options = {**_worker_options, **overrides}
+    key = tuple(sorted(options.items()))
+    # 字典保持插入顺序：命中时移到末尾，开头即为最久未使用的转换器
+    converter = _worker_converters.pop(key, None)
+    if converter is None:
+        if len(_worker_converters) >= WORKER_CONVERTER_LIMIT:
+            _worker_converters.pop(next(iter(_worker_converters)))
+        converter = DNSConverter(**options)
+    _worker_converters[key] = converter
+    return converter
+
+
+def _worker_pid(delay: float) -> int:
+    """预热任务：稍作等待，使各任务分散到不同的工作进程"""
+    time.sleep(delay)
+    return os.getpid()
+
+
+def _run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """在工作进程中执行一个转换任务（按路径转换，或转换上传的文件内容）"""
+    started = time.time()
+    result = {'success': False, 'record_counts': {}, 'error': '', 'started': started, 'worker': os.getpid()}
+    log = io.StringIO()
+    converter = _worker_converter(job['converter_options'])
+    converter.reset_instrumentation()
+    try:
+        with contextlib.redirect_stdout(log), tempfile.TemporaryDirectory() as tmp:
+            if 'data' in job:
+                input_path = os.path.join(tmp, job['filename'])
+                output_path = os.path.join(tmp, f"dnspod_template.{job['format']}")
+                with open(input_path, 'wb') as f:
+                    f.write(job['data'])
+            else:
+                input_path, output_path = job['input'], job['output']
+            record_counts = converter.convert_file(input_path, output_path, **job['options'])
+            result['record_counts'] = {str(key): int(value) for key, value in record_counts.items()}
+            if 'data' in job:
+                with open(output_path, 'rb') as f:
+                    result['data'] = f.read()
+        result['success'] = True
+    except SystemExit:
+        # read_dns_file / save_dnspod_template 出错时会打印原因后退出
+        lines = log.getvalue().strip().splitlines()
+        result['error'] = lines[-1] if lines else '转换失败'
+    except Exception as e:
+        result['error'] = str(e)
+    result['elapsed'] = time.time() - started
+    result['log'] = log.getvalue().splitlines()
+    result['report'] = converter.instrumentation_report()
+    return result
+
+
+def parse_bool(value: Any) -> bool:
+    """解析JSON或查询参数中的布尔值"""
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def parse_job_options(params: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """从请求参数中解析 (转换器参数, convert_file 参数)，参数无效时抛出 ValueError"""
+    converter_options = {}
+    if params.get('zone'):
+        converter_options['zone'] = str(params['zone'])
+    if 'keep_duplicates' in params:
+        converter_options['dedup'] = not parse_bool(params['keep_duplicates'])
+
+    engine = params.get('engine', 'auto')
+    if engine not in ENGINES:
+        raise ValueError(f"不支持的转换引擎: {engine}（可选 {', '.join(ENGINES)}）")
+    options = {'engine': engine, 'validate': parse_bool(params.get('validate', False)),
+               'stream': parse_bool(params.get('stream', False))}
+    if params.get('chunksize'):
+        # JSON请求体中的 chunksize 可能是列表、对象等任意类型
+        try:
+            chunksize = int(params['chunksize'])
+        except (TypeError, ValueError):
+            chunksize = 0
+        if chunksize <= 0:
+            raise ValueError(f"chunksize 必须是正整数: {params['chunksize']}")
+        options['chunksize'] = chunksize
+    return converter_options, options
+
+
+class QueueFullError(Exception):
+    """排队中的任务数已达到上限"""
+
+
+class ConversionService:
+    """转换服务：在预热的进程池中执行转换任务，排队中的任务数有上限"""
+
+    def __init__(self, workers: int = None, max_pending: int = None, job_timeout: float = DEFAULT_JOB_TIMEOUT,
+                 converter_options: Dict[str, Any] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * PENDING_PER_WORKER
+        self.job_timeout = job_timeout
+        self.converter_options = converter_options or {}
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self.executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   initargs=(self.converter_options,))
+
+    def warm_up(self) -> int:
+        """启动全部工作进程并等待初始化完成，返回已就绪的进程数"""
+        pids = set()
+        for _ in range(WARM_UP_ROUNDS):
+            futures = [self.executor.submit(_worker_pid, WARM_UP_DELAY) for _ in range(self.workers)]
+            pids.update(future.result() for future in futures)
+            if len(pids) >= self.workers:
+                break
+        return len(pids)
+
+    def pending(self) -> int:
+        """排队中（已提交但未完成）的任务数"""
+        with self._lock:
+            return self.stats['submitted'] - self.stats['finished']
+
+    def submit(self, job: Dict[str, Any]) -> Future:
+        """提交任务，排队中的任务数已达上限时抛出 QueueFullError"""
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            raise QueueFullError(f"排队中的任务已达上限（{self.max_pending}）")
+        submitted = False
+        try:
+            executor = self.executor
+            try:
+                future = executor.submit(_run_job, job)
+            except BrokenProcessPool:
+                future = self._replace_broken_executor(executor).submit(_run_job, job)
+            submitted = True
+        finally:
+            # 提交失败（包括重建进程池后再次提交失败）时归还排队名额
+            if not submitted:
+                self._slots.release()
+        self._count('submitted')
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _replace_broken_executor(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """工作进程异常退出后重建进程池，返回可用的进程池
+
+        多个请求线程同时发现进程池损坏时只重建一次：已被其他线程替换时直接使用新的进程池。
+        """
+        with self._lock:
+            if self.executor is broken:
+                self.executor = self._create_executor()
+                broken.shutdown(wait=False, cancel_futures=True)
+            return self.executor
+
+    def _job_done(self, future: Future):
+        self._slots.release()
+        self._count('finished')
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def run(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """提交任务并等待结果，结果中包含排队、转换和总耗时"""
+        submitted = time.time()
+        future = self.submit(job)
+        try:
+            result = future.result(timeout=self.job_timeout)
+        except FutureTimeoutError:
+            self._count('timeouts')
+            raise
+        finished = time.time()
+        result['timing'] = {
+            'queued': round(max(result.pop('started') - submitted, 0.0), 6),
+            'convert': round(result.pop('elapsed'), 6),
+            'total': round(finished - submitted, 6),
+        }
+        self._count('succeeded' if result['success'] else 'failed')
+        return result
+
+    def health(self) -> Dict[str, Any]:
+        """服务状态"""
+        with self._lock:
+            stats = dict(self.stats)
+        return {'status': 'ok', 'workers': self.workers, 'max_pending': self.max_pending,
+                'pending': self.pending(), 'jobs': stats}
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """转换服务的HTTP请求处理"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'DNSConverterService/1.0'
+    # 响应头和响应体分两次发送，关闭Nagle算法以免与客户端的延迟确认叠加出约40毫秒的等待
+    disable_nagle_algorithm = True
+
+    def address_string(self) -> str:
+        # Unix套接字连接没有客户端地址
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format: str, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def send_body(self, status: int, body: bytes, content_type: str, headers: Dict[str, str] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_body(status, body, 'application/json; charset=utf-8', headers)
+
+    def do_GET(self):
+        if urlsplit(self.path).path == '/health':
+            self.send_json(200, self.server.service.health())
+        else:
+            self.send_json(404, {'error': f"未知的路径: {self.path}"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != '/convert':
+            self.send_json(404, {'error': f"未知的路径: {self.path}"})
+            return
+        if self.headers.get('Content-Length') is None:
+            self.close_connection = True
+            self.send_json(411, {'error': "请求缺少 Content-Length"})
+            return
+        try:
+            length = int(self.headers['Content-Length'])
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            self.close_connection = True
+            self.send_json(400, {'error': f"无效的 Content-Length: {self.headers['Content-Length']}"})
+            return
+        if length > self.server.max_upload:
+            self.close_connection = True
+            self.send_json(413, {'error': f"上传文件超过大小上限（{self.server.max_upload} 字节）"})
+            return
+        body = self.rfile.read(length)
+
+        try:
+            if self.headers.get('Content-Type', '').startswith('application/json'):
+                job = self.path_job(json.loads(body or b'{}'))
+            else:
+                job = self.upload_job(dict(parse_qsl(url.query)), body)
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+            return
+
+        service = self.server.service
+        try:
+            result = service.run(job)
+        except QueueFullError as e:
+            self.send_json(503, {'error': str(e)}, {'Retry-After': '1'})
+            return
+        except FutureTimeoutError:
+            self.send_json(504, {'error': f"任务在 {service.job_timeout} 秒内未完成"})
+            return
+        except BrokenProcessPool as e:
+            self.send_json(500, {'error': f"工作进程异常退出: {e}"})
+            return
+
+        status = 200 if result['success'] else 422
+        if 'data' in job and result['success']:
+            headers = {
+                'X-Queue-Seconds': str(result['timing']['queued']),
+                'X-Convert-Seconds': str(result['timing']['convert']),
+                'X-Total-Seconds': str(result['timing']['total']),
+                'X-Record-Counts': json.dumps(result['record_counts']),
+            }
+            self.send_body(status, result['data'], OUTPUT_CONTENT_TYPES[job['format']], headers)
+        else:
+            result.pop('data', None)
+            self.send_json(status, result)
+
+    @staticmethod
+    def path_job(params: Dict[str, Any]) -> Dict[str, Any]:
+        """按路径转换的任务（输入和输出路径由服务所在的机器解析）"""
+        if not isinstance(params, dict):
+            raise ValueError("请求体必须是JSON对象")
+        if not params.get('input'):
+            raise ValueError("缺少参数: input")
+        for name in ('input', 'output'):
+            if params.get(name) and not isinstance(params[name], str):
+                raise ValueError(f"参数 {name} 必须是字符串")
+        input_path = os.path.abspath(params['input'])
+        if not os.path.exists(input_path):
+            raise ValueError(f"输入文件不存在: {input_path}")
+        output_path = os.path.abspath(params.get('output') or
+                                      os.path.join(os.path.dirname(input_path), 'dnspod_template.xlsx'))
+        converter_options, options = parse_job_options(params)
+        return {'input': input_path, 'output': output_path,
+                'converter_options': converter_options, 'options': options}
+
+    @staticmethod
+    def upload_job(params: Dict[str, Any], data: bytes) -> Dict[str, Any]:
+        """转换上传文件内容的任务，filename 的扩展名决定按哪种格式读取"""
+        filename = os.path.basename(params.get('filename') or 'upload.xlsx')
+        output_format = params.get('format', 'xlsx')
+        if output_format not in OUTPUT_CONTENT_TYPES:
+            raise ValueError(f"不支持的输出格式: {output_format}（可选 {', '.join(OUTPUT_CONTENT_TYPES)}）")
+        if not data:
+            raise ValueError("上传的文件为空")
+        converter_options, options = parse_job_options(params)
+        return {'data': data, 'filename': filename, 'format': output_format,
+                'converter_options': converter_options, 'options': options}
+
+
+class TCPServiceServer(ThreadingHTTPServer):
+    """监听本地TCP端口的转换服务"""
+
+    daemon_threads = True
+
+
+class UnixServiceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """监听Unix套接字的转换服务"""
+
+    daemon_threads = True
+
+    def server_bind(self):
+        # 删除上次运行遗留的套接字文件
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+        super().server_bind()
+
+
+def create_server(service: ConversionService, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                  socket_path: str = None, max_upload: int = DEFAULT_MAX_UPLOAD, quiet: bool = False):
+    """创建转换服务的HTTP服务器（指定 socket_path 时监听Unix套接字）"""
+    if socket_path:
+        server = UnixServiceServer(socket_path, ServiceRequestHandler)
+    else:
+        server = TCPServiceServer((host, port), ServiceRequestHandler)
+    server.service = service
+    server.max_upload = max_upload
+    server.quiet = quiet
+    return server
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """通过Unix套接字连接的HTTP连接"""
+
+    def __init__(self, socket_path: str, timeout: float = None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class ServiceClient:
+    """转换服务的客户端（复用同一个连接发送多个请求）"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT, socket_path: str = None,
+                 timeout: float = None):
+        if socket_path:
+            self.connection = UnixHTTPConnection(socket_path, timeout)
+        else:
+            self.connection = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def close(self):
+        self.connection.close()
+
+    def request(self, method: str, path: str, body: bytes = None,
+                headers: Dict[str, str] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """发送请求，返回 (状态码, 响应头, 响应体)"""
+        self.connection.request(method, path, body=body, headers=headers or {})
+        response = self.connection.getresponse()
+        data = response.read()
+        return response.status, dict(response.getheaders()), data
+
+    def health(self) -> Dict[str, Any]:
+        return json.loads(self.request('GET', '/health')[2])
+
+    def convert_path(self, input_path: str, output_path: str, **options) -> Tuple[int, Dict[str, Any]]:
+        """按路径转换，返回 (状态码, 转换结果)"""
+        payload = json.dumps({'input': os.path.abspath(input_path), 'output': os.path.abspath(output_path),
+                              **options}).encode('utf-8')
+        status, _, data = self.request('POST', '/convert', payload, {'Content-Type': 'application/json'})
+        return status, json.loads(data)
+
+    def convert_bytes(self, data: bytes, filename: str, output_format: str = 'xlsx',
+                      **options) -> Tuple[int, Dict[str, str], bytes]:
+        """转换上传的文件内容，返回 (状态码, 响应头, DNSPOD模板内容或JSON错误信息)"""
+        query = urlencode({'filename': filename, 'format': output_format, **options})
+        return self.request('POST', f'/convert?{query}', data, {'Content-Type': 'application/octet-stream'})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地DNS转换服务（预热的工作进程池 + HTTP接口）')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址（默认127.0.0.1，只接受本机连接）')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'监听端口（默认{DEFAULT_PORT}）')
+    parser.add_argument('--socket', help='监听Unix套接字（指定时不监听TCP端口）')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='工作进程数（默认为CPU核数）')
+    parser.add_argument('--max-pending', type=int, default=None,
+                       help=f'排队中的任务数上限，超过时返回503（默认为工作进程数的{PENDING_PER_WORKER}倍）')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_JOB_TIMEOUT,
+                       help=f'等待单个任务完成的秒数，超时返回504（默认{DEFAULT_JOB_TIMEOUT}）')
+    parser.add_argument('--max-upload', type=parse_size, default=DEFAULT_MAX_UPLOAD,
+                       help='上传文件的大小上限（支持 K/M/G 单位，默认100M）')
+    parser.add_argument('--zone', help='默认主域名（请求中可用 zone 参数覆盖）')
+    parser.add_argument('--cache-size', type=int, default=65536,
+                       help='主机记录、记录值和TTL标准化结果的LRU缓存容量（默认65536）')
+    parser.add_argument('--rules', help='迁移改写规则文件（JSON，格式见 dns_rewrite.py），应用于所有任务')
+    parser.add_argument('--input-cache', action='store_true', help='使用输入缓存（默认不使用）')
+    parser.add_argument('--input-cache-dir',
+                       help=f'输入缓存目录（与 --input-cache 一起使用，默认 {default_input_cache_dir()}）')
+    parser.add_argument('--input-cache-size', type=parse_size, default=DEFAULT_INPUT_CACHE_BYTES,
+                       help='输入缓存的总大小上限（支持 K/M/G 单位，默认1G）')
+    parser.add_argument('--quiet', action='store_true', help='不输出请求日志')
+    args = parser.parse_args()
+
+    converter_options = {'zone': args.zone, 'cache_size': args.cache_size}
+    if args.rules:
+        try:
+            rules = RewriteRules.from_file(args.rules, args.cache_size)
+        except ValueError as e:
+            print(f"错误: {e}")
+            sys.exit(1)
+        print(f"已加载改写规则: {args.rules}（{rules.rule_count} 条）")
+        # 传递编译后的规则，转换器不再重新读取规则文件
+        converter_options['rewrite_rules'] = rules
+    if args.input_cache:
+        converter_options['input_cache_dir'] = args.input_cache_dir or default_input_cache_dir()
+        converter_options['input_cache_bytes'] = args.input_cache_size
+
+    service = ConversionService(args.workers, args.max_pending, args.timeout, converter_options)
+    try:
+        server = create_server(service, args.host, args.port, args.socket, args.max_upload, args.quiet)
+    except OSError as e:
+        print(f"错误: 无法监听 {args.socket or f'{args.host}:{args.port}'}: {e}")
+        service.shutdown()
+        sys.exit(1)
+
+    start = time.perf_counter()
+    ready = service.warm_up()
+    address = args.socket or f"http://{args.host}:{args.port}"
+    print(f"转换服务已启动: {address}（{ready} 个工作进程已就绪，预热耗时 {time.perf_counter() - start:.2f} 秒，"
+          f"排队上限 {service.max_pending}）", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("正在停止转换服务...")
+    finally:
+        server.server_close()
+        service.shutdown()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+
+
+if __name__ == '__main__':
+    main()
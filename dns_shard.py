@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DNSPOD模板分片输出
+
+DNSPOD单次导入的记录数有限，一个超大的Excel模板写出和上传都很慢。分片输出按每个
+文件的记录数上限和/或字节数上限，将转换结果拆分为多个模板文件：
+
+    dnspod_template_part001.xlsx、dnspod_template_part002.xlsx ……
+
+可按主机记录（host）或分区（zone，即模板的 Split Zone 列）分组：同一组的记录写入
+同一个分片，只有单独一组就超过上限时才拆开。分片在线程池中并发写出，完成后生成
+清单文件 <输出文件名>_manifest.json，列出每个分片的文件名、记录数、字节数和各记录类型的条数。
+
+字节数上限按记录的CSV（UTF-8）编码长度估算，Excel文件经过压缩，实际大小通常更小。
+
+作者: DNS转换工具开发团队
+许可证: MIT License
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from dns_core import DNSPODTemplateWriter, LazyModule
+
+pd = LazyModule('pandas')
+np = LazyModule('numpy')
+
+# 分组方式到模板列的映射
+SHARD_GROUP_COLUMNS = {'host': 'Host', 'zone': 'Split Zone'}
+
+# 默认的写入线程数上限
+DEFAULT_SHARD_WORKERS = 8
+
+SIZE_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*$', re.IGNORECASE)
+SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+# 分片文件名的后缀（批量转换时不作为输入文件）
+SHARD_SUFFIX_RE = re.compile(r'_part\d{3,}$')
+
+
+def parse_size(text: str) -> int:
+    """解析字节数，支持 K/M/G 单位（如 512K、5M、1.5G）"""
+    match = SIZE_RE.match(text)
+    if not match:
+        raise ValueError(f"无效的大小: {text}")
+    size = int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+    if size <= 0:
+        raise ValueError(f"无效的大小: {text}")
+    return size
+
+
+def shard_paths(output_path: str, count: int) -> List[str]:
+    """生成各分片的文件路径（<输出文件名>_part001.xlsx ……）"""
+    base, ext = os.path.splitext(output_path)
+    width = max(3, len(str(count)))
+    return [f"{base}_part{number:0{width}d}{ext}" for number in range(1, count + 1)]
+
+
+def manifest_path_for(output_path: str) -> str:
+    """根据输出文件路径生成分片清单路径"""
+    return f"{os.path.splitext(output_path)[0]}_manifest.json"
+
+
+def estimate_row_bytes(dnspod_df: pd.DataFrame) -> np.ndarray:
+    """按CSV（UTF-8）编码估算每条记录的字节数（各列长度 + 分隔符和换行）"""
+    sizes = np.full(len(dnspod_df), len(dnspod_df.columns), dtype=np.int64)
+    for column in dnspod_df.columns:
+        values = dnspod_df[column].astype(str)
+        codes, uniques = pd.factorize(values)
+        lengths = np.array([len(value.encode('utf-8')) for value in uniques], dtype=np.int64)
+        sizes += lengths[codes]
+    return sizes
+
+
+def plan_shards(dnspod_df: pd.DataFrame, max_records: int = None, max_bytes: int = None,
+                group_by: str = None) -> List[np.ndarray]:
+    """将记录划分为分片，返回每个分片的行号数组
+
+    按顺序把记录装入当前分片，达到记录数或字节数上限时开始新分片。
+    指定 group_by 时先按组排列（组按首次出现的顺序，组内保持原顺序），分片只在组的边界处切分。
+    """
+    if not max_records and not max_bytes:
+        raise ValueError("分片输出需要指定记录数上限或字节数上限")
+    total = len(dnspod_df)
+    if total == 0:
+        return [np.arange(0)]
+
+    order = np.arange(total)
+    boundaries = None
+    if group_by:
+        codes, _ = pd.factorize(dnspod_df[SHARD_GROUP_COLUMNS[group_by]], use_na_sentinel=False)
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        # 每组第一条记录在排序后的位置（含开头位置 0 和末尾位置 total）
+        boundaries = np.concatenate(([0], np.flatnonzero(np.diff(sorted_codes)) + 1, [total]))
+
+    cumulative_bytes = np.cumsum(estimate_row_bytes(dnspod_df)[order]) if max_bytes else None
+
+    shards = []
+    start = 0
+    while start < total:
+        end = total
+        if max_records:
+            end = min(end, start + max_records)
+        if max_bytes:
+            used = cumulative_bytes[start - 1] if start else 0
+            end = min(end, int(np.searchsorted(cumulative_bytes, used + max_bytes, side='right')))
+        if boundaries is not None and end < total:
+            # 退回到最近的组边界；单独一组就超过上限时只能在组内切分
+            boundary = boundaries[np.searchsorted(boundaries, end, side='right') - 1]
+            if boundary > start:
+                end = int(boundary)
+        # 单条记录就超过字节数上限时也单独成为一个分片
+        end = max(end, start + 1)
+        shards.append(order[start:end])
+        start = end
+    return shards
+
+
+def _write_shard(dnspod_df: pd.DataFrame, rows: np.ndarray, path: str, domain: str = None) -> Dict[str, Any]:
+    """写出一个分片（在工作线程中切片，避免同时复制所有分片），返回清单中的分片信息"""
+    shard_df = dnspod_df.iloc[rows]
+    with DNSPODTemplateWriter(path, list(shard_df.columns), domain) as writer:
+        writer.write(shard_df)
+    return {
+        'file': os.path.basename(path),
+        'records': len(shard_df),
+        'bytes': os.path.getsize(path),
+        'types': {record_type: int(count)
+                  for record_type, count in shard_df['Type'].value_counts().items()},
+    }
+
+
+def write_shards(dnspod_df: pd.DataFrame, output_path: str, max_records: int = None,
+                 max_bytes: int = None, group_by: str = None, workers: int = None,
+                 domain: str = None) -> Dict[str, Any]:
+    """按上限拆分转换结果，在线程池中并发写出各分片并保存清单，返回清单内容"""
+    shards = plan_shards(dnspod_df, max_records, max_bytes, group_by)
+    paths = shard_paths(output_path, len(shards))
+    workers = workers or min(DEFAULT_SHARD_WORKERS, os.cpu_count() or 1)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(shards)))) as executor:
+        futures = [executor.submit(_write_shard, dnspod_df, rows, path, domain)
+                   for rows, path in zip(shards, paths)]
+        # 按分片顺序收集结果，任一分片写出失败时抛出异常
+        shard_info = [future.result() for future in futures]
+
+    types = Counter()
+    for info in shard_info:
+        types.update(info['types'])
+    manifest = {
+        'output': os.path.basename(output_path),
+        'max_records': max_records,
+        'max_bytes': max_bytes,
+        'group_by': group_by,
+        'total_records': len(dnspod_df),
+        'types': dict(types),
+        'shards': shard_info,
+    }
+    with open(manifest_path_for(output_path), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def print_shard_summary(manifest: Dict[str, Any], manifest_path: str, limit: int = 10):
+    """打印分片结果"""
+    shards = manifest['shards']
+    print(f"DNSPOD模板已分为 {len(shards)} 个文件:")
+    for info in shards[:limit]:
+        types = '，'.join(f"{record_type} {count}" for record_type, count in info['types'].items())
+        print(f"  {info['file']}: {info['records']} 条记录，{info['bytes']} 字节（{types}）")
+    if len(shards) > limit:
+        print(f"  …… 另有 {len(shards) - limit} 个文件")
+    print(f"分片清单已保存到: {manifest_path}")
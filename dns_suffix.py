@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基于公共后缀列表（Public Suffix List）的主机记录相对化
+
+随工具附带离线的公共后缀列表（public_suffix_list.dat，仅ICANN部分），
+启动时加载为按标签倒序组织的后缀树，单次查询为 O(标签数)，
+同一主机名的查询结果会被缓存（LRU）。
+
+未指定主域名时，每个输入文件推断一个主域名：出现次数最多、且覆盖过半主机名的注册域名。
+仍无法确定时，只有以点号结尾的完整域名按各自的注册域名截取，其他名称（如阿里云导出的
+_dmarc.blog、api.dev）视为已经是相对主机记录，原样保留。
+
+示例：
+- www.example.com.     →  www
+- a.b.example.com.     →  a.b
+- example.com.cn.      →  @
+- www.dept.example.com（指定主域名 dept.example.com）→  www
+- www.corp.internal.   →  www（列表中没有的顶级域名按默认规则 * 处理）
+- api.dev（无法推断主域名）→  api.dev
+
+作者: DNS转换工具开发团队
+许可证: MIT License
+"""
+
+import os
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+DEFAULT_SUFFIX_LIST = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                   'public_suffix_list.dat')
+
+
+class _SuffixNode:
+    """后缀树节点"""
+
+    __slots__ = ('children', 'is_rule', 'is_exception')
+
+    def __init__(self):
+        self.children: Dict[str, '_SuffixNode'] = {}
+        self.is_rule = False
+        self.is_exception = False
+
+
+class PublicSuffixIndex:
+    """公共后缀索引（后缀树），用于查找主机名的注册域名"""
+
+    def __init__(self, rules: Iterable[str], cache_size: int = 65536):
+        self._root = _SuffixNode()
+        for rule in rules:
+            self._add_rule(rule)
+        # 注册域名查询结果缓存（LRU）
+        self.registrable_domain = lru_cache(maxsize=cache_size)(self._registrable_domain)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_SUFFIX_LIST) -> 'PublicSuffixIndex':
+        """从公共后缀列表文件加载"""
+        with open(path, encoding='utf-8') as f:
+            return cls(line.split()[0] for line in f
+                       if line.strip() and not line.startswith('//'))
+
+    def _add_rule(self, rule: str):
+        """将一条规则加入后缀树（以 ! 开头的为例外规则）"""
+        is_exception = rule.startswith('!')
+        node = self._root
+        for label in reversed(rule.lstrip('!').lower().split('.')):
+            node = node.children.setdefault(label, _SuffixNode())
+        if is_exception:
+            node.is_exception = True
+        else:
+            node.is_rule = True
+
+    def public_suffix_length(self, labels: list) -> int:
+        """返回命中的公共后缀包含的标签数
+
+        未命中任何显式规则时按隐含的默认规则 * 处理：公共后缀为最后一级标签（列表中没有的顶级域名，
+        如 .internal、.corp）。
+        """
+        node = self._root
+        length = 0
+        for depth, label in enumerate(reversed(labels)):
+            child = node.children.get(label)
+            if child is not None and child.is_exception:
+                # 例外规则：后缀为规则去掉最左侧标签
+                return depth
+            if child is None:
+                wildcard = node.children.get('*')
+                if wildcard is not None:
+                    length = depth + 1
+                break
+            if child.is_rule:
+                length = depth + 1
+            node = child
+        return length or min(len(labels), 1)
+
+    def _registrable_domain(self, name: str) -> Optional[str]:
+        """返回主机名的注册域名（公共后缀加一级），无法确定时返回None
+
+        以下划线开头的标签（如 _dmarc、_sip）不能注册，这样的名称不视为注册域名。
+        """
+        labels = name.lower().split('.')
+        suffix_length = self.public_suffix_length(labels)
+        if (suffix_length == 0 or len(labels) <= suffix_length or not all(labels)
+                or labels[-(suffix_length + 1)].startswith('_')):
+            domain = None
+        else:
+            domain = '.'.join(labels[-(suffix_length + 1):])
+        return domain
+
+
+@lru_cache(maxsize=None)
+def load_public_suffix_index(path: str = DEFAULT_SUFFIX_LIST) -> PublicSuffixIndex:
+    """加载公共后缀索引（每个文件只加载一次）"""
+    return PublicSuffixIndex.from_file(path)
+
+
+def normalize_zone(zone: Optional[str]) -> Optional[str]:
+    """标准化主域名：去除首尾空白和点号并转为小写"""
+    if not zone:
+        return None
+    return zone.strip().strip('.').lower() or None
+
+
+def infer_zone(host_counts: Iterable[Tuple[Any, int]], index: PublicSuffixIndex) -> Optional[str]:
+    """由一个输入文件的 (主机名, 出现次数) 推断主域名
+
+    返回出现次数最多的注册域名；属于该域名的主机名不超过一半（如阿里云导出的相对主机记录）时返回None。
+    """
+    domains = Counter()
+    total = 0
+    for name, count in host_counts:
+        if not isinstance(name, str):
+            continue
+        name = name.strip().rstrip('.')
+        if not name or name == '@':
+            continue
+        total += count
+        domain = index.registrable_domain(name)
+        if domain is not None:
+            domains[domain] += count
+    if domains:
+        zone, count = domains.most_common(1)[0]
+        if count * 2 > total:
+            return zone
+    return None
+
+
+def relativize_host(name: str, index: PublicSuffixIndex, zone: Optional[str] = None,
+                    absolute: bool = True) -> str:
+    """将完整域名转换为相对于主域名的主机记录
+
+    指定主域名时按主域名截取，不属于主域名的名称原样返回。未指定主域名时，完整域名
+    （absolute 为True，如原名称以点号结尾）以公共后缀列表确定的注册域名为主域名，
+    其他名称视为已经是相对主机记录，原样返回。
+    """
+    lower = name.lower()
+    if zone is None:
+        if not absolute:
+            return name
+        zone = index.registrable_domain(name)
+        if zone is None:
+            return name
+
+    if lower == zone:
+        return '@'
+    if lower.endswith('.' + zone):
+        return name[:-len(zone) - 1]
+    return name
+
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+通过DNSPOD API上传转换后的记录
+
+读取DNSPOD模板（Excel、CSV或NDJSON），按 dnspod_api_record 转换为 CreateRecord 的参数，
+并发调用DNSPOD API（腾讯云API 3.0，TC3-HMAC-SHA256签名）逐条创建记录：
+
+- 各线程共用一个保持连接（keep-alive）的HTTP连接池，不必为每条记录重新建立TLS连接
+- 令牌桶限制每秒请求数；服务器返回 RequestLimitExceeded 时整体暂停一段时间再继续
+- 限频、服务器内部错误和网络错误按指数退避（带随机抖动）重试
+- 记录按批次提交，每批完成后将已创建（或已存在）的记录写入SQLite检查点，
+  中断后再次运行会跳过已完成的记录；记录已存在（InvalidParameter.DomainRecordExist）视为完成
+
+批量创建接口（CreateRecordBatch）是异步任务，需要再查询任务结果，且无法按条重试，
+这里按批次并发调用 CreateRecord。
+
+使用方法：
+    export TENCENTCLOUD_SECRET_ID=... TENCENTCLOUD_SECRET_KEY=...
+    python dns_upload.py dnspod_template.xlsx --domain example.com --rate 20 --concurrency 8
+
+    # 离线测试：上传到本地模拟API服务器
+    python benchmarks/mock_dnspod_api.py --port 8054 --rate 50
+    python dns_upload.py dnspod_template.xlsx --domain example.com --endpoint http://127.0.0.1:8054
+
+作者: DNS转换工具开发团队
+许可证: MIT License
+"""
+
+import argparse
+import contextlib
+import csv
+import hashlib
+import hmac
+import http.client
+import json
+import os
+import queue
+import random
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from dns_core import DNSPOD_COLUMNS, NDJSON_EXTENSIONS, dnspod_api_record
+
+DNSPOD_API_ENDPOINT = 'https://dnspod.tencentcloudapi.com'
+DNSPOD_API_SERVICE = 'dnspod'
+DNSPOD_API_VERSION = '2021-03-23'
+CREATE_RECORD_ACTION = 'CreateRecord'
+
+# 默认每秒请求数（DNSPOD API的默认频率限制为每秒20次）
+DEFAULT_RATE = 20.0
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_RETRIES = 5
+DEFAULT_TIMEOUT = 10.0
+
+# 指数退避的初始和最长等待秒数
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+# 可重试的错误码（前缀匹配）
+RETRYABLE_ERRORS = ('RequestLimitExceeded', 'InternalError', 'ResourceUnavailable')
+
+# 表示记录已存在的错误码，视为上传完成
+RECORD_EXISTS_ERRORS = ('InvalidParameter.DomainRecordExist',)
+
+# 上传失败报告的列
+FAILURE_REPORT_COLUMNS = ['Domain', 'SubDomain', 'RecordType', 'RecordLine', 'Value', 'Error']
+
+
+class TokenBucket:
+    """线程安全的令牌桶：每秒补充 rate 个令牌，最多积累 burst 个"""
+
+    def __init__(self, rate: float, burst: int = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def try_acquire(self) -> bool:
+        """有可用令牌时取走一个并返回True，否则立即返回False"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def acquire(self):
+        """取走一个令牌，没有可用令牌时等待"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                # 暂停期间 updated 在将来，等待到暂停结束并补充到一个令牌
+                wait = max(self.updated - now, 0) + (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """清空令牌并在 seconds 秒内不再发放（服务器提示限频时调用）"""
+        with self._lock:
+            self.tokens = 0.0
+            self.updated = max(self.updated, time.monotonic() + seconds)
+
+
+class ConnectionPool:
+    """保持连接的HTTP连接池：请求完成后连接放回池中供其他线程复用，出错的连接直接关闭"""
+
+    def __init__(self, endpoint: str, timeout: float = DEFAULT_TIMEOUT):
+        url = urlsplit(endpoint)
+        if url.scheme not in ('http', 'https'):
+            raise ValueError(f"不支持的API地址: {endpoint}")
+        self.scheme = url.scheme
+        self.host = url.netloc
+        self.path = url.path or '/'
+        self.timeout = timeout
+        self.created = 0
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        with self._lock:
+            self.created += 1
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, timeout=self.timeout)
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[http.client.HTTPConnection]:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._new_connection()
+        try:
+            yield conn
+        except BaseException:
+            conn.close()
+            raise
+        self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def sign_request(secret_id: str, secret_key: str, host: str, action: str, payload: bytes,
+                 timestamp: int) -> str:
+    """按TC3-HMAC-SHA256计算腾讯云API 3.0请求的Authorization头"""
+    date = datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%d')
+    canonical_request = '\n'.join([
+        'POST', '/', '',
+        f'content-type:application/json; charset=utf-8\nhost:{host}\nx-tc-action:{action.lower()}\n',
+        'content-type;host;x-tc-action',
+        hashlib.sha256(payload).hexdigest(),
+    ])
+    scope = f'{date}/{DNSPOD_API_SERVICE}/tc3_request'
+    string_to_sign = '\n'.join(['TC3-HMAC-SHA256', str(timestamp), scope,
+                                hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()])
+
+    key = f'TC3{secret_key}'.encode('utf-8')
+    for part in (date, DNSPOD_API_SERVICE, 'tc3_request'):
+        key = hmac.new(key, part.encode('utf-8'), hashlib.sha256).digest()
+    signature = hmac.new(key, string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
+    return (f'TC3-HMAC-SHA256 Credential={secret_id}/{scope}, '
+            f'SignedHeaders=content-type;host;x-tc-action, Signature={signature}')
+
+
+def parse_retry_after(value: Optional[str], now: float = None) -> Optional[float]:
+    """解析 Retry-After 头，返回需要等待的秒数；没有该头或无法解析时返回None
+
+    按RFC 9110，Retry-After 可以是秒数，也可以是HTTP日期（如 Wed, 21 Oct 2015 07:28:00 GMT）。
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(retry_at.timestamp() - (time.time() if now is None else now), 0.0)
+
+
+def record_key(record: Dict[str, Any]) -> str:
+    """检查点中记录的键（与DNSPOD判断记录是否重复的字段一致）"""
+    return '\t'.join(str(record.get(field, '')) for field in
+                     ('Domain', 'SubDomain', 'RecordType', 'RecordLine', 'Value'))
+
+
+class UploadCheckpoint:
+    """上传进度检查点：保存已创建或已存在的记录，中断后再次上传时跳过"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute('''CREATE TABLE IF NOT EXISTS uploaded (
+            key TEXT PRIMARY KEY, status TEXT NOT NULL, record_id INTEGER, uploaded_at REAL NOT NULL)''')
+
+    def completed(self) -> set:
+        """已完成的记录键"""
+        return {row[0] for row in self._db.execute('SELECT key FROM uploaded')}
+
+    def save(self, results: List[Dict[str, Any]]):
+        """在一个事务中保存一批已完成的记录"""
+        now = time.time()
+        with self._db:
+            self._db.executemany('INSERT OR REPLACE INTO uploaded VALUES (?, ?, ?, ?)',
+                                 [(result['key'], result['status'], result['record_id'], now)
+                                  for result in results])
+
+    def close(self):
+        self._db.close()
+
+
+class DNSPODUploader:
+    """并发调用DNSPOD API的 CreateRecord 创建记录（连接池、令牌桶限频、指数退避重试）"""
+
+    def __init__(self, endpoint: str = DNSPOD_API_ENDPOINT, secret_id: str = None, secret_key: str = None,
+                 rate: float = DEFAULT_RATE, burst: int = None, concurrency: int = DEFAULT_CONCURRENCY,
+                 retries: int = DEFAULT_RETRIES, timeout: float = DEFAULT_TIMEOUT,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        self.pool = ConnectionPool(endpoint, timeout)
+        self.secret_id = secret_id
+        self.secret_key = secret_key
+        self.limiter = TokenBucket(rate, burst)
+        self.concurrency = concurrency
+        self.retries = retries
+        self.batch_size = batch_size
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    def _count(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] += value
+
+    def _headers(self, payload: bytes) -> Dict[str, str]:
+        timestamp = int(time.time())
+        headers = {
+            'Content-Type': 'application/json; charset=utf-8',
+            'Host': self.pool.host,
+            'X-TC-Action': CREATE_RECORD_ACTION,
+            'X-TC-Version': DNSPOD_API_VERSION,
+            'X-TC-Timestamp': str(timestamp),
+        }
+        if self.secret_id and self.secret_key:
+            headers['Authorization'] = sign_request(self.secret_id, self.secret_key, self.pool.host,
+                                                    CREATE_RECORD_ACTION, payload, timestamp)
+        return headers
+
+    def _post(self, record: Dict[str, Any]) -> Tuple[int, Optional[str], bytes]:
+        """发送一次 CreateRecord 请求，返回 (HTTP状态码, Retry-After头, 响应体)"""
+        payload = json.dumps(record, ensure_ascii=False, default=str).encode('utf-8')
+        with self.pool.connection() as conn:
+            conn.request('POST', self.pool.path, body=payload, headers=self._headers(payload))
+            response = conn.getresponse()
+            body = response.read()
+        return response.status, response.getheader('Retry-After'), body
+
+    @staticmethod
+    def backoff(attempt: int) -> float:
+        """第 attempt 次重试前的等待秒数（指数增长，带随机抖动）"""
+        return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    def create_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """创建一条记录，返回结果（status 为 created、exists 或 failed）"""
+        result = {'key': record_key(record), 'record': record, 'status': 'failed',
+                  'record_id': None, 'error': ''}
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._count('retries')
+            self.limiter.acquire()
+            self._count('requests')
+            try:
+                status, retry_after, body = self._post(record)
+            except (OSError, http.client.HTTPException) as e:
+                result['error'] = f"网络错误: {e}"
+                time.sleep(self.backoff(attempt))
+                continue
+
+            if status == 429 or status >= 500:
+                result['error'] = f"HTTP {status}"
+                # 服务器指定的等待时间也不超过最长退避时间
+                delay = parse_retry_after(retry_after)
+                delay = min(BACKOFF_MAX, delay) if delay is not None else self.backoff(attempt)
+                if status == 429:
+                    self._count('rate_limited')
+                    self.limiter.pause(delay)
+                else:
+                    time.sleep(delay)
+                continue
+            try:
+                response = json.loads(body)['Response']
+            except (ValueError, KeyError, TypeError):
+                result['error'] = f"无法解析的响应（HTTP {status}）: {body[:200]!r}"
+                return result
+
+            error = response.get('Error')
+            if error is None:
+                result['status'] = 'created'
+                result['record_id'] = response.get('RecordId')
+                return result
+            code = error.get('Code', '')
+            result['error'] = f"{code}: {error.get('Message', '')}"
+            if code.startswith(RECORD_EXISTS_ERRORS):
+                result['status'] = 'exists'
+                return result
+            if not code.startswith(RETRYABLE_ERRORS):
+                return result
+            delay = self.backoff(attempt)
+            if code.startswith('RequestLimitExceeded'):
+                # 服务器已限频：暂停发放令牌，所有线程一起等待，避免继续触发限频
+                self._count('rate_limited')
+                self.limiter.pause(delay)
+            else:
+                time.sleep(delay)
+        return result
+
+    def upload(self, records: List[Dict[str, Any]], checkpoint: UploadCheckpoint = None) -> List[Dict[str, Any]]:
+        """按批次并发创建记录，每批完成后更新检查点，返回失败记录的结果"""
+        completed = checkpoint.completed() if checkpoint is not None else set()
+        pending = [record for record in records if record_key(record) not in completed]
+        self.counters['skipped'] += len(records) - len(pending)
+        if self.counters['skipped']:
+            print(f"检查点中已有 {self.counters['skipped']} 条记录上传完成，跳过")
+
+        failures = []
+        done = 0
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for batch_start in range(0, len(pending), self.batch_size):
+                results = list(executor.map(self.create_record, pending[batch_start:batch_start + self.batch_size]))
+                if checkpoint is not None:
+                    checkpoint.save([result for result in results if result['status'] != 'failed'])
+                for result in results:
+                    self.counters[result['status']] += 1
+                failures.extend(result for result in results if result['status'] == 'failed')
+                done += len(results)
+                elapsed = time.perf_counter() - start
+                print(f"已上传 {done}/{len(pending)} 条记录（{done / elapsed if elapsed else 0:.1f} 条/秒）")
+        self.pool.close()
+        return failures
+
+
+def read_api_records(template_path: str, domain: str = None) -> List[Dict[str, Any]]:
+    """读取DNSPOD模板（Excel/CSV）或NDJSON记录，返回 CreateRecord 的参数列表"""
+    if template_path.lower().endswith(NDJSON_EXTENSIONS):
+        records = []
+        with open(template_path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    if domain:
+                        record.setdefault('Domain', domain)
+                    records.append(record)
+        return records
+
+    from dns_diff import read_dnspod_template
+
+    dnspod_df = read_dnspod_template(template_path)
+    defaults = {'Split Zone': 'Default', 'Remarks': ''}
+    columns = [column for column in DNSPOD_COLUMNS if column in dnspod_df.columns]
+    return [dnspod_api_record({**defaults, **dict(zip(columns, row))}, domain)
+            for row in dnspod_df[columns].itertuples(index=False, name=None)]
+
+
+def save_failures(failures: List[Dict[str, Any]], output_path: str):
+    """将上传失败的记录和原因保存为CSV"""
+    with open(output_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(FAILURE_REPORT_COLUMNS)
+        for failure in failures:
+            record = failure['record']
+            writer.writerow([record.get(column, '') for column in FAILURE_REPORT_COLUMNS[:-1]] + [failure['error']])
+
+
+def print_upload_summary(counters: Counter, elapsed: float, connections: int):
+    """打印上传摘要"""
+    print("\n=== 上传结果 ===")
+    print(f"新建: {counters['created']}，已存在: {counters['exists']}，失败: {counters['failed']}，"
+          f"检查点跳过: {counters['skipped']}")
+    print(f"共发出 {counters['requests']} 个请求（重试 {counters['retries']} 次，限频 {counters['rate_limited']} 次），"
+          f"使用 {connections} 个连接，用时 {elapsed:.2f} 秒")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='通过DNSPOD API上传转换后的记录')
+    parser.add_argument('template_file', help='DNSPOD模板文件（Excel、CSV或 .ndjson/.jsonl 记录）')
+    parser.add_argument('--domain', help='主域名（如 example.com）；NDJSON记录中已包含Domain时可省略')
+    parser.add_argument('--endpoint', default=DNSPOD_API_ENDPOINT,
+                       help=f'API地址（默认 {DNSPOD_API_ENDPOINT}，离线测试时指向本地模拟服务器）')
+    parser.add_argument('--secret-id', default=os.environ.get('TENCENTCLOUD_SECRET_ID'),
+                       help='API密钥ID（默认读取环境变量 TENCENTCLOUD_SECRET_ID）')
+    parser.add_argument('--secret-key', default=os.environ.get('TENCENTCLOUD_SECRET_KEY'),
+                       help='API密钥（默认读取环境变量 TENCENTCLOUD_SECRET_KEY）')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                       help=f'每秒最多发出的请求数（默认{DEFAULT_RATE:g}）')
+    parser.add_argument('--burst', type=int, help='令牌桶容量，即允许的瞬时突发请求数（默认与 --rate 相同）')
+    parser.add_argument('-c', '--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                       help=f'并发请求数（默认{DEFAULT_CONCURRENCY}）')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                       help=f'每批记录数，每批完成后更新检查点（默认{DEFAULT_BATCH_SIZE}）')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                       help=f'限频、服务器错误和网络错误的重试次数（默认{DEFAULT_RETRIES}）')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                       help=f'单个请求的超时秒数（默认{DEFAULT_TIMEOUT:g}）')
+    parser.add_argument('--checkpoint', help='检查点文件路径（默认为 <模板文件名>.upload.sqlite）')
+    parser.add_argument('--restart', action='store_true', help='忽略已有的检查点，重新上传全部记录')
+    parser.add_argument('--failures', help='上传失败报告路径（CSV，默认为 <模板文件名>_upload_failures.csv）')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.template_file):
+        print(f"错误: 文件不存在: {args.template_file}")
+        sys.exit(1)
+    if args.rate <= 0 or args.concurrency < 1:
+        print("错误: --rate 必须大于0，--concurrency 至少为1")
+        sys.exit(1)
+    if args.endpoint == DNSPOD_API_ENDPOINT and not (args.secret_id and args.secret_key):
+        print("错误: 请通过 --secret-id/--secret-key 或环境变量 TENCENTCLOUD_SECRET_ID/TENCENTCLOUD_SECRET_KEY 提供API密钥")
+        sys.exit(1)
+
+    try:
+        records = read_api_records(args.template_file, args.domain)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"读取DNSPOD模板失败: {e}")
+        sys.exit(1)
+    if any(not record.get('Domain') for record in records):
+        print("错误: 请使用 --domain 指定主域名")
+        sys.exit(1)
+
+    base = os.path.splitext(args.template_file)[0]
+    checkpoint_path = args.checkpoint or f"{base}.upload.sqlite"
+    if args.restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    checkpoint = UploadCheckpoint(checkpoint_path)
+
+    print(f"向 {args.endpoint} 上传 {len(records)} 条记录"
+          f"（每秒最多 {args.rate:g} 个请求，并发 {args.concurrency}，重试 {args.retries}次）...")
+    uploader = DNSPODUploader(args.endpoint, args.secret_id, args.secret_key, args.rate, args.burst,
+                              args.concurrency, args.retries, args.timeout, args.batch_size)
+    start = time.perf_counter()
+    try:
+        failures = uploader.upload(records, checkpoint)
+    except KeyboardInterrupt:
+        print(f"\n上传已中断，进度已保存到: {checkpoint_path}（再次运行将从中断处继续）")
+        sys.exit(1)
+    finally:
+        checkpoint.close()
+    print_upload_summary(uploader.counters, time.perf_counter() - start, uploader.pool.created)
+    print(f"上传进度已保存到: {checkpoint_path}")
+
+    if failures:
+        output = args.failures or f"{base}_upload_failures.csv"
+        save_failures(failures, output)
+        print(f"上传失败的记录已保存到: {output}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DNS记录值校验
+
+按记录类型校验转换后的DNSPOD记录，校验规则在模块加载时预编译一次，
+并按列批量执行：同一列中重复出现的值只校验一次。
+
+支持的校验：
+- A：IPv4地址（每段0-255）
+- AAAA：IPv6地址
+- CNAME/MX/NS/PTR：目标主机名
+- MX：优先级为0-65535的整数
+- SRV：priority weight port target 格式
+- TXT：非空且长度不超过上限
+- CAA：flags tag "value" 格式
+- TTL：1-604800秒
+
+作者: DNS转换工具开发团队
+许可证: MIT License
+"""
+
+import ipaddress
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict
+
+# pandas 只在按列批量校验时导入，逐条校验不依赖pandas
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# IPv4地址：每段0-255（允许前导零，与多IP拆分的规则一致）
+IPV4_OCTET = r'(?:[0-9]{1,2}|[01][0-9]{2}|2[0-4][0-9]|25[0-5])'
+IPV4_RE = re.compile(rf'(?:{IPV4_OCTET}\.){{3}}{IPV4_OCTET}')
+
+# 主机名：每段1-63个字符，不以连字符开头或结尾，允许下划线（如 _domainkey）和中文域名
+HOSTNAME_LABEL = r'(?!-)[\w-]{1,63}(?<!-)'
+HOSTNAME_RE = re.compile(rf'(?=.{{1,253}}\.?\Z)(?:{HOSTNAME_LABEL}\.)*{HOSTNAME_LABEL}\.?')
+
+# SRV记录值：priority weight port target
+SRV_RE = re.compile(r'(\d{1,5})\s+(\d{1,5})\s+(\d{1,5})\s+(\S+)')
+
+# CAA记录值：flags tag "value"（标签为字母数字，值可不带引号）
+CAA_RE = re.compile(r'(\d{1,3})\s+([A-Za-z0-9]+)\s+("[^"]*"|\S+)')
+
+# TXT记录值的最大长度
+TXT_MAX_LENGTH = 512
+
+# TTL取值范围（秒）
+TTL_MIN = 1
+TTL_MAX = 604800
+
+
+def is_valid_ipv4(value: str) -> bool:
+    """校验IPv4地址"""
+    return IPV4_RE.fullmatch(value) is not None
+
+
+@lru_cache(maxsize=65536)
+def is_valid_ipv6(value: str) -> bool:
+    """校验IPv6地址"""
+    try:
+        ipaddress.IPv6Address(value)
+        return True
+    except ValueError:
+        return False
+
+
+def is_valid_hostname(value: str) -> bool:
+    """校验主机名（允许末尾的点号）"""
+    return HOSTNAME_RE.fullmatch(value) is not None
+
+
+def validate_a(value: str) -> str:
+    """校验A记录值"""
+    return '' if is_valid_ipv4(value) else f"无效的IPv4地址: {value}"
+
+
+def validate_aaaa(value: str) -> str:
+    """校验AAAA记录值"""
+    return '' if is_valid_ipv6(value) else f"无效的IPv6地址: {value}"
+
+
+def validate_hostname(value: str) -> str:
+    """校验CNAME/MX/NS/PTR记录的目标主机名"""
+    return '' if is_valid_hostname(value) else f"无效的主机名: {value}"
+
+
+def validate_srv(value: str) -> str:
+    """校验SRV记录值"""
+    match = SRV_RE.fullmatch(value)
+    if not match:
+        return f"SRV记录值应为 'priority weight port target' 格式: {value}"
+    if any(int(number) > 65535 for number in match.groups()[:3]):
+        return f"SRV记录的优先级、权重和端口应在0-65535之间: {value}"
+    target = match.group(4)
+    if target != '.' and not is_valid_hostname(target):
+        return f"SRV记录的目标主机名无效: {target}"
+    return ''
+
+
+def validate_txt(value: str) -> str:
+    """校验TXT记录值"""
+    if not value:
+        return "TXT记录值为空"
+    if len(value) > TXT_MAX_LENGTH:
+        return f"TXT记录值长度 {len(value)} 超过上限 {TXT_MAX_LENGTH}"
+    return ''
+
+
+def validate_caa(value: str) -> str:
+    """校验CAA记录值"""
+    match = CAA_RE.fullmatch(value)
+    if not match:
+        return f"CAA记录值应为 'flags tag \"value\"' 格式: {value}"
+    if int(match.group(1)) > 255:
+        return f"CAA记录的flags应在0-255之间: {value}"
+    return ''
+
+
+def validate_mx_priority(priority: str) -> str:
+    """校验MX优先级"""
+    try:
+        number = float(priority)
+    except (ValueError, TypeError):
+        return f"无效的MX优先级: {priority}"
+    if not number.is_integer() or not 0 <= number <= 65535:
+        return f"MX优先级应为0-65535之间的整数: {priority}"
+    return ''
+
+
+def validate_ttl(ttl: int) -> str:
+    """校验TTL"""
+    if not TTL_MIN <= ttl <= TTL_MAX:
+        return f"TTL应在{TTL_MIN}-{TTL_MAX}秒之间: {ttl}"
+    return ''
+
+
+# 每种记录类型的记录值校验函数
+VALUE_VALIDATORS: Dict[str, Callable[[str], str]] = {
+    'A': validate_a,
+    'AAAA': validate_aaaa,
+    'CNAME': validate_hostname,
+    'MX': validate_hostname,
+    'NS': validate_hostname,
+    'PTR': validate_hostname,
+    'SRV': validate_srv,
+    'TXT': validate_txt,
+    'CAA': validate_caa,
+}
+
+
+def validate_record(record: Dict[str, Any]) -> str:
+    """校验单条DNSPOD格式的记录，返回失败原因，校验通过时返回空字符串
+
+    规则与 validate_records 相同。
+    """
+    record_type = str(record['Type'])
+    validator = VALUE_VALIDATORS.get(record_type)
+    reason = validator(str(record['Value'])) if validator else ''
+    if not reason and record_type == 'MX':
+        reason = validate_mx_priority(str(record['MX']))
+    if not reason:
+        reason = validate_ttl(record['TTL'])
+    return reason
+
+
+def _map_unique(values: 'pd.Series', validator: Callable) -> 'pd.Series':
+    """对列中每个不同的值只执行一次校验"""
+    import pandas as pd
+
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    reasons = pd.Series([validator(value) for value in uniques], dtype=object)
+    return pd.Series(reasons.to_numpy()[codes], index=values.index, dtype=object)
+
+
+def validate_records(dnspod_df: 'pd.DataFrame') -> 'pd.Series':
+    """按列批量校验DNSPOD格式的记录
+
+    返回与输入行对齐的校验失败原因，校验通过的行为空字符串。
+    """
+    import pandas as pd
+
+    reasons = pd.Series('', index=dnspod_df.index, dtype=object)
+    if dnspod_df.empty:
+        return reasons
+
+    record_types = dnspod_df['Type'].astype(str)
+    values = dnspod_df['Value'].astype(str)
+
+    for record_type, validator in VALUE_VALIDATORS.items():
+        mask = record_types == record_type
+        if mask.any():
+            reasons[mask] = _map_unique(values[mask], validator)
+
+    mx_mask = (record_types == 'MX') & (reasons == '')
+    if mx_mask.any():
+        reasons[mx_mask] = _map_unique(dnspod_df['MX'][mx_mask].astype(str), validate_mx_priority)
+
+    ttl_mask = reasons == ''
+    reasons[ttl_mask] = _map_unique(dnspod_df['TTL'][ttl_mask], validate_ttl)
+    return reasons
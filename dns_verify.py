@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+转换结果的DNS解析验证
+
+切换DNS服务商之前，向指定的DNS服务器查询每条转换后的记录，确认解析结果与转换结果一致。
+同一名称、同一类型的记录（如多IP的A记录）合并为一次查询，比较返回的记录集合。
+
+所有查询在一个asyncio事件循环中通过同一个UDP套接字并发发出，按事务ID分发响应，
+不为每个查询创建线程；并发数、超时和重试次数均可配置。
+
+报告中的状态：
+- ok：解析结果与转换结果一致
+- mismatch：记录集合不一致
+- nxdomain / servfail / refused 等：服务器返回的错误码
+- timeout：重试后仍无响应
+
+使用方法：
+    python dns_verify.py huawei_dns.xlsx --zone example.com --server 8.8.8.8
+    python dns_verify.py huawei_dns.xlsx --zone example.com --server 127.0.0.1:5353 --concurrency 500
+
+离线运行时可用 benchmarks/stub_dns_server.py 按转换结果启动本地DNS服务器。
+
+作者: DNS转换工具开发团队
+许可证: MIT License
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import os
+import random
+import struct
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from dns_converter import DNSConverter, pd
+
+# 记录类型编号（RFC 1035 / RFC 3596 / RFC 2782 / RFC 8659）
+QTYPES = {'A': 1, 'NS': 2, 'CNAME': 5, 'PTR': 12, 'MX': 15, 'TXT': 16, 'AAAA': 28, 'SRV': 33, 'CAA': 257}
+QTYPE_NAMES = {number: name for name, number in QTYPES.items()}
+
+RCODE_NAMES = {0: 'noerror', 1: 'formerr', 2: 'servfail', 3: 'nxdomain', 4: 'notimp', 5: 'refused'}
+
+# 记录值为主机名的记录类型
+HOSTNAME_TYPES = frozenset(['CNAME', 'NS', 'PTR'])
+
+VERIFY_REPORT_COLUMNS = ['Status', 'Type', 'Host', 'Name', 'Expected', 'Actual']
+
+CLASS_IN = 1
+HEADER = struct.Struct('!HHHHHH')
+RR_FIXED = struct.Struct('!HHIH')
+
+
+class DNSMessageError(ValueError):
+    """DNS报文格式错误"""
+
+
+def encode_name(name: str) -> bytes:
+    """将域名编码为DNS报文中的标签序列"""
+    encoded = bytearray()
+    for label in name.strip('.').split('.'):
+        if not label:
+            continue
+        try:
+            raw = label.encode('ascii')
+        except UnicodeEncodeError:
+            raw = label.encode('idna')
+        if len(raw) > 63:
+            raise DNSMessageError(f"标签过长: {label}")
+        encoded.append(len(raw))
+        encoded += raw
+    encoded.append(0)
+    return bytes(encoded)
+
+
+def read_name(message: bytes, offset: int) -> Tuple[str, int]:
+    """读取报文中的域名（支持压缩指针），返回域名和域名之后的偏移"""
+    labels = []
+    end = None
+    jumps = 0
+    while True:
+        if offset >= len(message):
+            raise DNSMessageError("域名超出报文长度")
+        length = message[offset]
+        if length & 0xC0 == 0xC0:
+            if offset + 1 >= len(message):
+                raise DNSMessageError("压缩指针不完整")
+            if end is None:
+                end = offset + 2
+            jumps += 1
+            if jumps > 64:
+                raise DNSMessageError("压缩指针循环")
+            offset = ((length & 0x3F) << 8) | message[offset + 1]
+            continue
+        offset += 1
+        if length == 0:
+            break
+        labels.append(message[offset:offset + length].decode('ascii', 'replace'))
+        offset += length
+    return '.'.join(labels), end if end is not None else offset
+
+
+def build_query(query_id: int, name: str, qtype: str) -> bytes:
+    """构造一个递归查询报文"""
+    return HEADER.pack(query_id, 0x0100, 1, 0, 0, 0) + encode_name(name) + struct.pack('!HH', QTYPES[qtype], CLASS_IN)
+
+
+def _character_strings(data: bytes) -> List[bytes]:
+    """拆分TXT记录中的各个字符串"""
+    strings = []
+    offset = 0
+    while offset < len(data):
+        length = data[offset]
+        strings.append(data[offset + 1:offset + 1 + length])
+        offset += 1 + length
+    return strings
+
+
+def _caa_parts(value: str) -> Tuple[int, str, str]:
+    """拆分CAA记录值为 (flags, tag, value)，tag 转为小写，value 去掉引号"""
+    flags, tag, data = value.split(None, 2)
+    data = data.strip()
+    if len(data) >= 2 and data[0] == data[-1] == '"':
+        data = data[1:-1]
+    return int(flags), tag.lower(), data
+
+
+def decode_rdata(message: bytes, rtype: int, offset: int, length: int) -> Optional[str]:
+    """将记录数据解码为与转换结果相同格式的文本，不支持的类型返回None"""
+    rdata = message[offset:offset + length]
+    name = QTYPE_NAMES.get(rtype)
+    if name == 'A' and length == 4:
+        return str(ipaddress.IPv4Address(rdata))
+    if name == 'AAAA' and length == 16:
+        return ipaddress.IPv6Address(rdata).compressed
+    if name in HOSTNAME_TYPES:
+        return read_name(message, offset)[0].lower()
+    if name == 'MX':
+        preference = struct.unpack_from('!H', message, offset)[0]
+        return f"{preference} {read_name(message, offset + 2)[0].lower()}"
+    if name == 'SRV':
+        priority, weight, port = struct.unpack_from('!HHH', message, offset)
+        return f"{priority} {weight} {port} {read_name(message, offset + 6)[0].lower()}"
+    if name == 'TXT':
+        return b''.join(_character_strings(rdata)).decode('utf-8', 'replace')
+    if name == 'CAA' and length >= 2:
+        tag_end = 2 + rdata[1]
+        tag = rdata[2:tag_end].decode('ascii', 'replace').lower()
+        return f'{rdata[0]} {tag} "{rdata[tag_end:].decode("utf-8", "replace")}"'
+    return None
+
+
+def encode_rdata(rtype: str, value: str) -> bytes:
+    """将 record_text 格式的记录值编码为记录数据（用于本地模拟服务器）"""
+    if rtype == 'A':
+        return ipaddress.IPv4Address(value).packed
+    if rtype == 'AAAA':
+        return ipaddress.IPv6Address(value).packed
+    if rtype in HOSTNAME_TYPES:
+        return encode_name(value)
+    if rtype == 'MX':
+        preference, target = value.split(' ', 1)
+        return struct.pack('!H', int(preference)) + encode_name(target)
+    if rtype == 'SRV':
+        priority, weight, port, target = value.split(' ', 3)
+        return struct.pack('!HHH', int(priority), int(weight), int(port)) + encode_name(target)
+    if rtype == 'TXT':
+        raw = value.encode('utf-8')
+        chunks = [raw[start:start + 255] for start in range(0, len(raw), 255)] or [b'']
+        return b''.join(bytes([len(chunk)]) + chunk for chunk in chunks)
+    if rtype == 'CAA':
+        flags, tag, data = _caa_parts(value)
+        return bytes([flags, len(tag)]) + tag.encode('ascii') + data.encode('utf-8')
+    raise DNSMessageError(f"不支持的记录类型: {rtype}")
+
+
+def parse_response(message: bytes) -> Tuple[int, int, bytes, List[Tuple[str, str]]]:
+    """解析响应报文，返回 (事务ID, 错误码, 问题部分, [(记录类型, 记录值)])"""
+    if len(message) < HEADER.size:
+        raise DNSMessageError("报文过短")
+    query_id, flags, qdcount, ancount, _, _ = HEADER.unpack_from(message)
+    offset = HEADER.size
+    for _ in range(qdcount):
+        offset = read_name(message, offset)[1] + 4
+    question = message[HEADER.size:offset]
+
+    answers = []
+    for _ in range(ancount):
+        offset = read_name(message, offset)[1]
+        if offset + RR_FIXED.size > len(message):
+            raise DNSMessageError("资源记录不完整")
+        rtype, _, _, length = RR_FIXED.unpack_from(message, offset)
+        offset += RR_FIXED.size
+        if offset + length > len(message):
+            raise DNSMessageError("记录数据不完整")
+        value = decode_rdata(message, rtype, offset, length)
+        if value is not None:
+            answers.append((QTYPE_NAMES[rtype], value))
+        offset += length
+    return query_id, flags & 0x000F, question, answers
+
+
+def build_response(query: bytes, answers: List[Tuple[str, str]], rcode: int = 0, ttl: int = 600) -> bytes:
+    """为查询报文构造权威响应（用于本地模拟服务器），answers 为 [(记录类型, 记录值)]"""
+    query_id, flags = struct.unpack_from('!HH', query)
+    offset = read_name(query, HEADER.size)[1] + 4
+    question = query[HEADER.size:offset]
+
+    records = bytearray()
+    for rtype, value in answers:
+        rdata = encode_rdata(rtype, value)
+        # 0xC00C：指向问题部分中的域名
+        records += b'\xc0\x0c' + RR_FIXED.pack(QTYPES[rtype], CLASS_IN, ttl, len(rdata)) + rdata
+    header = HEADER.pack(query_id, 0x8400 | (flags & 0x0100) | rcode, 1, len(answers), 0, 0)
+    return header + question + bytes(records)
+
+
+def record_name(host: str, zone: str) -> str:
+    """由主机记录和主域名得到完整域名"""
+    host = host.strip().rstrip('.').lower()
+    if host in ('', '@'):
+        return zone
+    return f"{host}.{zone}"
+
+
+def record_text(rtype: str, value: str, mx: str = '-') -> str:
+    """将DNSPOD记录值转换为与 decode_rdata 相同格式的文本"""
+    value = value.strip()
+    if rtype == 'AAAA':
+        try:
+            return ipaddress.IPv6Address(value).compressed
+        except ValueError:
+            return value.lower()
+    if rtype in HOSTNAME_TYPES:
+        return value.rstrip('.').lower()
+    if rtype == 'MX':
+        try:
+            preference = int(float(mx))
+        except (TypeError, ValueError):
+            preference = mx
+        return f"{preference} {value.rstrip('.').lower()}"
+    if rtype == 'SRV':
+        parts = value.split()
+        if parts:
+            parts[-1] = parts[-1].rstrip('.').lower()
+        return ' '.join(parts)
+    if rtype == 'CAA':
+        try:
+            flags, tag, data = _caa_parts(value)
+        except ValueError:
+            return value
+        return f'{flags} {tag} "{data}"'
+    return value
+
+
+def expected_rrsets(dnspod_df: pd.DataFrame, zone: str) -> Dict[Tuple[str, str], dict]:
+    """按 (完整域名, 记录类型) 汇总转换结果，返回每组的主机记录和应返回的记录值"""
+    rrsets: Dict[Tuple[str, str], dict] = {}
+    for rtype, host, value, mx in zip(*(dnspod_df[column].astype(str).tolist()
+                                        for column in ('Type', 'Host', 'Value', 'MX'))):
+        rtype = rtype.strip().upper()
+        if rtype not in QTYPES:
+            continue
+        key = (record_name(host, zone), rtype)
+        if key not in rrsets:
+            rrsets[key] = {'host': host, 'values': set()}
+        rrsets[key]['values'].add(record_text(rtype, value, mx))
+    return rrsets
+
+
+class _ResolverProtocol(asyncio.DatagramProtocol):
+    """共享UDP套接字：按事务ID将响应交给等待中的查询"""
+
+    def __init__(self):
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        if len(data) < 2:
+            return
+        query_id = int.from_bytes(data[:2], 'big')
+        future = self.pending.get(query_id)
+        if future is not None and not future.done():
+            future.set_result(data)
+
+    def error_received(self, exc):
+        # ICMP端口不可达等错误不针对具体查询，由超时和重试处理
+        pass
+
+
+class DNSVerifier:
+    """通过UDP向指定DNS服务器并发查询转换后的记录"""
+
+    def __init__(self, server: str = '127.0.0.1', port: int = 53, concurrency: int = 100,
+                 timeout: float = 2.0, retries: int = 2, converter: Optional[DNSConverter] = None):
+        self.server = server
+        self.port = port
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.converter = converter or DNSConverter()
+        self._protocol: Optional[_ResolverProtocol] = None
+
+    def _new_query_id(self) -> int:
+        """分配一个未被占用的随机事务ID"""
+        while True:
+            query_id = random.getrandbits(16)
+            if query_id not in self._protocol.pending:
+                return query_id
+
+    async def query(self, name: str, qtype: str) -> Tuple[str, List[str]]:
+        """查询一个名称，返回 (状态, 该类型的记录值列表)；状态为 noerror、服务器错误码或 timeout"""
+        counters = self.converter.counters
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.retries + 1):
+            if attempt:
+                counters['verify_retries'] += 1
+            query_id = self._new_query_id()
+            message = build_query(query_id, name, qtype)
+            question = message[HEADER.size:]
+            future = self._protocol.pending[query_id] = loop.create_future()
+            counters['verify_queries'] += 1
+            try:
+                self._protocol.transport.sendto(message)
+                deadline = loop.time() + self.timeout
+                while True:
+                    data = await asyncio.wait_for(future, max(deadline - loop.time(), 0))
+                    try:
+                        _, rcode, response_question, answers = parse_response(data)
+                    except DNSMessageError:
+                        response_question = None
+                    if response_question == question:
+                        break
+                    # 问题部分不匹配的响应（过期或伪造的报文）忽略，继续等待
+                    counters['verify_ignored_responses'] += 1
+                    future = self._protocol.pending[query_id] = loop.create_future()
+            except asyncio.TimeoutError:
+                continue
+            finally:
+                self._protocol.pending.pop(query_id, None)
+
+            if rcode != 0:
+                return RCODE_NAMES.get(rcode, f'rcode{rcode}'), []
+            return 'noerror', [value for rtype, value in answers if rtype == qtype]
+
+        counters['verify_timeouts'] += 1
+        return 'timeout', []
+
+    async def verify_async(self, dnspod_df: pd.DataFrame, zone: str) -> pd.DataFrame:
+        """并发验证所有记录，返回验证报告（每个名称和类型一行）"""
+        converter = self.converter
+        rrsets = expected_rrsets(dnspod_df, zone.strip('.').lower())
+        total = len(rrsets)
+        loop = asyncio.get_running_loop()
+        transport, self._protocol = await loop.create_datagram_endpoint(
+            _ResolverProtocol, remote_addr=(self.server, self.port))
+
+        rows = []
+        statuses = defaultdict(int)
+        pending = iter(rrsets.items())
+
+        # 固定数量的协程从同一个迭代器中取记录，同时在途的查询数不超过并发数
+        async def worker():
+            for (name, rtype), rrset in pending:
+                status, actual = await self.query(name, rtype)
+                expected = rrset['values']
+                if status == 'noerror':
+                    status = 'ok' if set(actual) == expected else 'mismatch'
+                statuses[status] += 1
+                rows.append((status, rtype, rrset['host'], name,
+                             '; '.join(sorted(expected)), '; '.join(sorted(actual))))
+                if len(rows) % max(1, total // 100) == 0:
+                    converter.report_progress('verify', len(rows) / total)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, min(self.concurrency, total)))))
+        finally:
+            transport.close()
+            self._protocol = None
+
+        converter.report_progress('verify', 1.0)
+        converter.counters['verify_names'] += total
+        converter.counters['verify_mismatches'] += total - statuses['ok']
+        report = pd.DataFrame(rows, columns=VERIFY_REPORT_COLUMNS)
+        return report.sort_values(['Status', 'Name', 'Type'], kind='stable').reset_index(drop=True)
+
+    def verify(self, dnspod_df: pd.DataFrame, zone: str) -> pd.DataFrame:
+        """verify_async 的同步版本"""
+        with self.converter.stage('verify'):
+            return asyncio.run(self.verify_async(dnspod_df, zone))
+
+
+def parse_server(text: str) -> Tuple[str, int]:
+    """解析 host、host:port 或 [IPv6]:port 格式的服务器地址"""
+    if text.startswith('['):
+        host, _, port = text[1:].partition(']')
+        return host, int(port.lstrip(':') or 53)
+    if text.count(':') == 1:
+        host, port = text.split(':')
+        return host, int(port)
+    return text, 53
+
+
+def print_verify_summary(report: pd.DataFrame):
+    """打印验证摘要"""
+    print("\n=== 验证结果 ===")
+    print(f"共验证 {len(report)} 组记录（按名称和类型）")
+    for status, count in report['Status'].value_counts().items():
+        print(f"{status}: {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='通过DNS查询验证转换后的记录')
+    parser.add_argument('input_file', help='华为云/阿里云DNS导出文件（Excel或CSV）')
+    parser.add_argument('--zone', required=True, help='主域名（如 example.com）')
+    parser.add_argument('--server', default='127.0.0.1', help='DNS服务器地址，可带端口（默认127.0.0.1:53）')
+    parser.add_argument('--concurrency', type=int, default=100, help='最大并发查询数（默认100）')
+    parser.add_argument('--timeout', type=float, default=2.0, help='单次查询超时秒数（默认2）')
+    parser.add_argument('--retries', type=int, default=2, help='超时后的重试次数（默认2）')
+    parser.add_argument('-o', '--output', help='验证报告路径（CSV，默认为 <输入文件名>_verify_dns.csv）')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input_file):
+        print(f"错误: 文件不存在: {args.input_file}")
+        sys.exit(1)
+
+    server, port = parse_server(args.server)
+    converter = DNSConverter(zone=args.zone)
+    dnspod_df = converter.convert_dns_records_vectorized(converter.read_dns_file(args.input_file))
+
+    print(f"向 {server}:{port} 查询（并发 {args.concurrency}，超时 {args.timeout}秒，重试 {args.retries}次）...")
+    verifier = DNSVerifier(server, port, args.concurrency, args.timeout, args.retries, converter)
+    report = verifier.verify(dnspod_df, args.zone)
+    print_verify_summary(report)
+
+    elapsed = converter.timings['verify']
+    queries = converter.counters['verify_queries']
+    print(f"共发出 {queries} 个查询，用时 {elapsed:.2f} 秒（{queries / elapsed * 60 if elapsed else 0:.0f} 个/分钟）")
+
+    output = args.output or f"{os.path.splitext(args.input_file)[0]}_verify_dns.csv"
+    report.to_csv(output, index=False, encoding='utf-8-sig')
+    print(f"验证报告已保存到: {output}")
+    if (report['Status'] != 'ok').any():
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
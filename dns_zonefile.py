@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BIND区域文件（RFC 1035 master file）流式解析
+
+逐行读取区域文件，支持：
+- $ORIGIN、$TTL 指令（$INCLUDE 不支持，$GENERATE 跳过并给出提示）
+- 括号跨行的记录（如SOA）、行首空白表示沿用上一条记录的主机名
+- 带引号的字符串、转义字符（\\" 和 \\DDD），多段TXT字符串按顺序拼接
+- TTL单位（1h30m、2d 等），TTL与类别（IN）的任意顺序
+- 记录所在行的注释作为备注
+
+每条记录生成一个使用标准列名（Type/Host/Value/TTL/MX/Remarks）的字典，与CSV/Excel
+导出文件读取后的记录相同，交给 convert_record 转换。主机名为以点号结尾的完整域名，
+记录值中的相对名称按 $ORIGIN 补全。
+
+只依赖标准库，内存占用与文件大小无关。
+
+作者: DNS转换工具开发团队
+许可证: MIT License
+"""
+
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 按扩展名识别的区域文件
+ZONE_FILE_EXTENSIONS = ('.zone', '.db', '.bind')
+
+# 解析结果使用的标准列名
+ZONE_RECORD_COLUMNS = ['Type', 'Host', 'Value', 'TTL', 'MX', 'Remarks']
+
+DNS_CLASSES = frozenset(['IN', 'CH', 'HS', 'CS'])
+
+# 记录值为主机名（需要按 $ORIGIN 补全相对名称）的记录类型
+HOSTNAME_VALUE_TYPES = frozenset(['CNAME', 'NS', 'PTR'])
+
+TTL_RE = re.compile(r'^(?:\d+[wdhms]?)+$', re.IGNORECASE)
+TTL_PART_RE = re.compile(r'(\d+)([wdhms]?)', re.IGNORECASE)
+TTL_UNITS = {'': 1, 's': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+# 需要逐字符解析的特殊字符，不含这些字符的行直接按空白拆分
+SPECIAL_CHARS_RE = re.compile(r'["();\\]')
+
+# \DDD 中不是有效UTF-8的字节，解码时暂存为 U+DC80..U+DCFF
+SURROGATE_BYTE_RE = re.compile('[\udc80-\udcff]')
+
+
+class ZoneFileError(ValueError):
+    """区域文件格式错误"""
+
+
+class QuotedString(str):
+    """带引号的字符串（与不带引号的标记区分，如TXT记录的各段字符串）"""
+
+
+def is_zone_file(file_path: str) -> bool:
+    """按扩展名判断是否为BIND区域文件"""
+    return file_path.lower().endswith(ZONE_FILE_EXTENSIONS)
+
+
+def parse_ttl(token: str) -> int:
+    """解析TTL，支持 3600、1h、1h30m 等格式"""
+    if not TTL_RE.match(token):
+        raise ZoneFileError(f"无效的TTL: {token}")
+    return sum(int(number) * TTL_UNITS[unit.lower()] for number, unit in TTL_PART_RE.findall(token))
+
+
+def _unescape(text: str) -> str:
+    """处理转义字符：\\DDD 为十进制的字节值（RFC 1035），\\X 为字符X本身
+
+    连续的 \\DDD 按字节拼接后按UTF-8解码（如 \\228\\184\\173 为“中”），
+    不是有效UTF-8的字节保留为原来的 \\DDD 写法，输出文件仍可按UTF-8写入。
+    """
+    if '\\' not in text:
+        return text
+    data = bytearray()
+    position = 0
+    while position < len(text):
+        char = text[position]
+        if char == '\\' and position + 1 < len(text):
+            digits = text[position + 1:position + 4]
+            if len(digits) == 3 and digits.isdigit() and int(digits) <= 255:
+                data.append(int(digits))
+                position += 4
+                continue
+            data.extend(text[position + 1].encode('utf-8', 'surrogateescape'))
+            position += 2
+            continue
+        data.extend(char.encode('utf-8', 'surrogateescape'))
+        position += 1
+    return SURROGATE_BYTE_RE.sub(lambda match: f"\\{ord(match.group()) - 0xDC00:03d}",
+                                 data.decode('utf-8', 'surrogateescape'))
+
+
+def tokenize_zone(lines: Iterable[str]) -> Iterator[Tuple[int, bool, List[str], str]]:
+    """将区域文件拆分为逻辑记录
+
+    逐条返回 (起始行号, 是否沿用上一条记录的主机名, 标记列表, 注释)。括号内的换行不结束记录；
+    带引号的字符串作为 QuotedString 返回。
+    """
+    tokens: List[str] = []
+    comments: List[str] = []
+    depth = 0
+    start_line = 0
+    implicit_owner = False
+
+    for line_number, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        if depth == 0:
+            start_line = line_number
+            implicit_owner = line[:1] in (' ', '\t')
+
+        if not SPECIAL_CHARS_RE.search(line):
+            # 快速路径：不含引号、括号、注释和转义的行
+            tokens.extend(line.split())
+        else:
+            position = 0
+            length = len(line)
+            while position < length:
+                char = line[position]
+                if char in ' \t':
+                    position += 1
+                elif char == ';':
+                    comments.append(line[position + 1:].strip())
+                    break
+                elif char == '(':
+                    depth += 1
+                    position += 1
+                elif char == ')':
+                    if depth == 0:
+                        raise ZoneFileError(f"第 {line_number} 行: 多余的右括号")
+                    depth -= 1
+                    position += 1
+                elif char == '"':
+                    end = position + 1
+                    while end < length and line[end] != '"':
+                        end += 2 if line[end] == '\\' else 1
+                    if end >= length:
+                        raise ZoneFileError(f"第 {line_number} 行: 引号未闭合")
+                    tokens.append(QuotedString(_unescape(line[position + 1:end])))
+                    position = end + 1
+                else:
+                    end = position
+                    while end < length and line[end] not in ' \t;()"':
+                        end += 2 if line[end] == '\\' else 1
+                    tokens.append(line[position:end])
+                    position = end
+
+        if depth == 0 and tokens:
+            yield start_line, implicit_owner, tokens, ' '.join(comment for comment in comments if comment)
+            tokens = []
+            comments = []
+        elif depth == 0:
+            comments = []
+
+    if depth:
+        raise ZoneFileError(f"第 {start_line} 行开始的括号未闭合")
+    if tokens:
+        yield start_line, implicit_owner, tokens, ' '.join(comment for comment in comments if comment)
+
+
+def absolute_name(name: str, origin: Optional[str]) -> str:
+    """将名称转换为以点号结尾的完整域名（@ 表示 $ORIGIN）"""
+    if name == '@':
+        if origin is None:
+            raise ZoneFileError("使用了 @ 但没有 $ORIGIN，请使用 --zone 指定主域名")
+        return origin
+    if name.endswith('.') and not name.endswith('\\.'):
+        return name
+    if origin is None:
+        raise ZoneFileError(f"相对名称 {name} 需要 $ORIGIN，请使用 --zone 指定主域名")
+    return f"{name}.{origin}" if origin != '.' else f"{name}."
+
+
+def _record_value(record_type: str, rdata: List[str], origin: Optional[str]) -> Tuple[str, Any]:
+    """按记录类型生成 (记录值, MX优先级)，目标主机名按 $ORIGIN 补全并去掉末尾的点号"""
+    if record_type in HOSTNAME_VALUE_TYPES and len(rdata) == 1:
+        return _unescape(absolute_name(rdata[0], origin)).rstrip('.'), ''
+    if record_type == 'MX' and len(rdata) == 2:
+        return _unescape(absolute_name(rdata[1], origin)).rstrip('.'), int(rdata[0])
+    if record_type == 'SRV' and len(rdata) == 4:
+        target = _unescape(absolute_name(rdata[3], origin)).rstrip('.')
+        return ' '.join(rdata[:3] + [target]), ''
+    if record_type in ('TXT', 'SPF'):
+        # 多段字符串按顺序拼接为一条记录值
+        return ''.join(token if isinstance(token, QuotedString) else _unescape(token) for token in rdata), ''
+    if record_type == 'CAA' and len(rdata) == 3:
+        # CAA的值保留引号（flags tag "value"）
+        return f'{rdata[0]} {rdata[1]} "{rdata[2]}"', ''
+    return ' '.join(_unescape(token) for token in rdata), ''
+
+
+def iter_zone_records(lines: Iterable[str], origin: Optional[str] = None,
+                      warn=print, on_zone=None) -> Iterator[Dict[str, Any]]:
+    """逐条解析区域文件中的记录，返回使用标准列名的字典
+
+    origin 为初始的 $ORIGIN（如 example.com），文件中的 $ORIGIN 指令会覆盖它。
+    未指定 TTL 的记录使用 $TTL，没有 $TTL 时沿用上一条记录的TTL。
+    on_zone 在返回第一条记录之前调用一次，参数为区域文件的主域名（不含末尾的点号）：
+    第一条记录为SOA时取其主机名，否则取当时的 $ORIGIN，都没有时为None。
+    """
+    if origin:
+        origin = origin.strip().rstrip('.') + '.'
+    default_ttl = None
+    last_ttl = None
+    owner = None
+    zone_reported = on_zone is None
+
+    for line_number, implicit_owner, tokens, comment in tokenize_zone(lines):
+        try:
+            first = tokens[0]
+            if first.startswith('$') and not isinstance(first, QuotedString):
+                directive = first.upper()
+                if directive == '$ORIGIN' and len(tokens) >= 2:
+                    origin = absolute_name(tokens[1], origin)
+                elif directive == '$TTL' and len(tokens) >= 2:
+                    default_ttl = parse_ttl(tokens[1])
+                elif directive == '$INCLUDE':
+                    raise ZoneFileError("不支持 $INCLUDE，请先合并为一个区域文件")
+                else:
+                    warn(f"警告: 第 {line_number} 行的 {first} 指令不受支持，已跳过")
+                continue
+
+            position = 0
+            if not implicit_owner:
+                owner = _unescape(absolute_name(first, origin))
+                position = 1
+            elif owner is None:
+                raise ZoneFileError("第一条记录缺少主机名")
+
+            # TTL 和类别可以任意顺序出现，也都可以省略
+            ttl = None
+            for _ in range(2):
+                if position >= len(tokens):
+                    break
+                token = tokens[position]
+                if token.upper() in DNS_CLASSES:
+                    position += 1
+                elif ttl is None and TTL_RE.match(token):
+                    ttl = parse_ttl(token)
+                    position += 1
+            if position >= len(tokens):
+                raise ZoneFileError("缺少记录类型")
+
+            record_type = tokens[position].upper()
+            rdata = tokens[position + 1:]
+            if not rdata:
+                raise ZoneFileError(f"{record_type} 记录缺少记录值")
+            value, mx = _record_value(record_type, rdata, origin)
+        except (ZoneFileError, ValueError) as e:
+            raise ZoneFileError(f"区域文件第 {line_number} 行: {e}") from None
+
+        if ttl is not None:
+            last_ttl = ttl
+        else:
+            ttl = default_ttl if default_ttl is not None else last_ttl
+
+        if not zone_reported:
+            zone = owner if record_type == 'SOA' else origin
+            on_zone(zone.rstrip('.') if zone and zone != '.' else None)
+            zone_reported = True
+
+        yield {
+            'Type': record_type,
+            'Host': owner,
+            'Value': value,
+            'TTL': ttl,
+            'MX': mx,
+            'Remarks': comment,
+        }
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+重复记录去除的测试（去重键、TTL不一致的记录集报告、A记录多个IP的拆分）
+
+运行方法：
+    python -m unittest discover tests
+"""
+
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from dns_converter import DNSConverter  # noqa: E402
+from dns_core import DNSPODRecord, DNSRecordConverter, RecordDeduplicator  # noqa: E402
+
+
+def record(record_type, host, value, ttl=600, split_zone='Default'):
+    return DNSPODRecord(record_type, host, value, '-', ttl, '', split_zone)
+
+
+def as_frame(records):
+    return pd.DataFrame([list(item) for item in records], columns=DNSConverter().dnspod_columns)
+
+
+class DedupKeyTest(unittest.TestCase):
+    RECORDS = [
+        record('A', 'www', '192.0.2.1'),
+        record('A', 'WWW', '192.0.2.1'),                  # 主机记录不区分大小写
+        record('A', 'www', '192.0.2.1', split_zone='电信'),  # 分区不同，保留
+        record('A', 'www', '192.0.2.2'),                  # 记录值不同，保留
+        record('CNAME', 'api', 'Target.Example.com.'),
+        record('CNAME', 'api', 'target.example.com'),     # 目标主机名不区分大小写、忽略末尾点号
+        record('AAAA', 'v6', '2001:db8:0:0:0:0:0:1'),
+        record('AAAA', 'v6', '2001:DB8::1'),              # IPv6按规范格式比较
+        record('TXT', 'txt', 'Hello'),
+        record('TXT', 'txt', 'hello'),                    # TXT记录值区分大小写，保留
+    ]
+    KEPT = [0, 2, 3, 4, 6, 8, 9]
+
+    def test_filter_records(self):
+        deduplicator = RecordDeduplicator()
+        kept = deduplicator.filter_records(self.RECORDS)
+        self.assertEqual(kept, [self.RECORDS[index] for index in self.KEPT])
+        self.assertEqual(deduplicator.duplicates, 3)
+
+    def test_vectorized_matches_records(self):
+        deduplicator = RecordDeduplicator()
+        with contextlib.redirect_stdout(io.StringIO()):
+            kept = DNSConverter().deduplicate_records(as_frame(self.RECORDS), deduplicator)
+        pd.testing.assert_frame_equal(kept, as_frame([self.RECORDS[index] for index in self.KEPT]))
+        self.assertEqual(deduplicator.duplicates, 3)
+
+    def test_shared_across_chunks(self):
+        # 分块转换时各块共用同一个 deduplicator，后面块中的重复记录同样去除
+        deduplicator = RecordDeduplicator()
+        self.assertEqual(len(deduplicator.filter_records(self.RECORDS[:1])), 1)
+        self.assertEqual(deduplicator.filter_records(self.RECORDS[1:2]), [])
+
+
+class TTLConflictTest(unittest.TestCase):
+    def test_first_record_kept_and_conflict_reported(self):
+        records = [record('A', 'www', '192.0.2.1', 300),
+                   record('A', 'www', '192.0.2.2', 600),
+                   record('A', 'WWW', '192.0.2.1', 600),   # 与第一条重复，保留第一条（TTL 300）
+                   record('MX', '@', 'mx.example.com', 600),
+                   record('A', 'www', '192.0.2.3', 300, split_zone='电信')]
+        deduplicator = RecordDeduplicator()
+        kept = deduplicator.filter_records(records)
+        self.assertEqual(kept, [records[0], records[1], records[3], records[4]])
+        self.assertEqual(kept[0].ttl, 300)
+        # 同一记录类型、主机记录和分区的记录为一个记录集，不同分区各自比较
+        self.assertEqual({tuple(deduplicator.split_rrset_key(rrset)): ttls
+                          for rrset, ttls in deduplicator.ttl_conflicts.items()},
+                         {('A', 'www', 'Default'): {300, 600}})
+
+        converter = DNSRecordConverter()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            converter.print_dedup_summary(deduplicator)
+        self.assertIn("已去除 1 条重复记录", output.getvalue())
+        self.assertIn("  A www: TTL 300, 600", output.getvalue())
+        self.assertEqual(converter.counters['duplicates_removed'], 1)
+        self.assertEqual(converter.counters['ttl_conflicts'], 1)
+
+
+class MultipleIPTest(unittest.TestCase):
+    VALUE = '192.0.2.1;192.0.2.2,192.0.2.3 192.0.2.4\n192.0.2.5；192.0.2.6, ;192.0.2.7'
+    IPS = [f'192.0.2.{number}' for number in range(1, 8)]
+
+    def test_parse_multiple_ips(self):
+        converter = DNSRecordConverter()
+        self.assertEqual(converter.parse_multiple_ips(self.VALUE), self.IPS)
+        self.assertEqual(converter.parse_multiple_ips('192.0.2.1'), ['192.0.2.1'])
+        # 没有合法IP时保留原始值（由校验步骤处理）
+        self.assertEqual(converter.parse_multiple_ips(' not-an-ip '), ['not-an-ip'])
+        self.assertEqual(converter.parse_multiple_ips(''), [])
+
+    def test_row_and_vectorized_split(self):
+        dns_df = pd.DataFrame({'Type': ['A', 'A'], 'Host': ['www', 'www'], 'TTL': [600, 600],
+                               'Value': [self.VALUE, '192.0.2.1']})
+        converter = DNSConverter(zone='example.com')
+        with contextlib.redirect_stdout(io.StringIO()):
+            row = converter.convert_dns_records(dns_df)
+            vectorized = converter.convert_dns_records_vectorized(dns_df)
+        self.assertEqual(vectorized['Value'].tolist(), self.IPS + ['192.0.2.1'])
+        pd.testing.assert_frame_equal(vectorized, row)
+
+
+if __name__ == '__main__':
+    unittest.main()
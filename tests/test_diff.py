@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+源文件与DNSPOD模板差异比对的测试（重复记录、TTL/MX不一致的配对、MX优先级的数值比较、改写规则）
+
+运行方法：
+    python -m unittest discover tests
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from dns_converter import DNSConverter  # noqa: E402
+from dns_diff import DIFF_REPORT_COLUMNS, diff_records, verify_template  # noqa: E402
+from dns_rewrite import RewriteRules  # noqa: E402
+
+ALIYUN_CSV = """记录类型,主机记录,解析线路,记录值,MX优先级,TTL值,状态(启用/暂停)
+A,www,默认,192.0.2.1,,600,启用
+MX,@,默认,mx.example.com,5,600,启用
+"""
+
+RULES = {'ip_map': [{'from': '192.0.2.0/24', 'to': '198.51.100.0/24'}], 'ttl': [{'type': 'MX', 'ttl': 3600}]}
+
+
+def records(*rows):
+    """(Type, Host, Value, TTL, MX) 构成的DNSPOD格式记录，各列均为字符串"""
+    return pd.DataFrame(list(rows), columns=['Type', 'Host', 'Value', 'TTL', 'MX'], dtype=str)
+
+
+def report_rows(report):
+    return [tuple(row) for row in report[DIFF_REPORT_COLUMNS].itertuples(index=False)]
+
+
+class DiffRecordsTest(unittest.TestCase):
+    def test_identical(self):
+        rows = [('A', 'www', '192.0.2.1', '600', '-'), ('MX', '@', 'mx.example.com', '600', '10')]
+        report = diff_records(records(*rows), records(*reversed(rows)))
+        self.assertTrue(report.empty)
+        self.assertEqual(list(report.columns), DIFF_REPORT_COLUMNS)
+
+    def test_duplicate_records_counted(self):
+        record = ('A', 'www', '192.0.2.1', '600', '-')
+        # 源文件中的记录出现两次，模板中只有一次：缺少一条
+        self.assertEqual(report_rows(diff_records(records(record, record), records(record))),
+                         [('missing', 'A', 'www', '192.0.2.1', '600', '', '-', '')])
+        # 模板中重复导入：多出一条
+        self.assertEqual(report_rows(diff_records(records(record), records(record, record))),
+                         [('extra', 'A', 'www', '192.0.2.1', '', '600', '', '-')])
+
+    def test_mismatch_pairing(self):
+        expected = records(('A', 'www', '192.0.2.1', '600', '-'),
+                           ('MX', '@', 'mx1.example.com', '600', '10'),
+                           ('MX', '@', 'mx2.example.com', '600', '20'),
+                           ('CNAME', 'api', 'www.example.com', '600', '-'))
+        actual = records(('A', 'WWW', '192.0.2.1', '300', '-'),
+                         ('MX', '@', 'MX1.example.com.', '600', '15'),
+                         ('MX', '@', 'mx2.example.com', '3600', '30'),
+                         ('CNAME', 'api', 'other.example.com', '600', '-'))
+        self.assertEqual(report_rows(diff_records(expected, actual)), [
+            ('extra', 'CNAME', 'api', 'other.example.com', '', '600', '', '-'),
+            ('missing', 'CNAME', 'api', 'www.example.com', '600', '', '-', ''),
+            ('mx_mismatch', 'MX', '@', 'mx1.example.com', '600', '600', '10', '15'),
+            ('ttl_mismatch', 'A', 'www', '192.0.2.1', '600', '300', '-', '-'),
+            ('ttl_mx_mismatch', 'MX', '@', 'mx2.example.com', '600', '3600', '20', '30'),
+        ])
+
+    def test_mx_priority_compared_as_number(self):
+        # Excel读取的MX优先级常为 5.0，与模板中的 5 相同；非MX记录的空值与 - 相同
+        expected = records(('MX', '@', 'mx.example.com', '600', '5.0'), ('A', 'www', '192.0.2.1', '600.0', ''))
+        actual = records(('MX', '@', 'mx.example.com', '600', '5'), ('A', 'www', '192.0.2.1', '600', '-'))
+        self.assertTrue(diff_records(expected, actual).empty)
+
+
+class VerifyTemplateTest(unittest.TestCase):
+    def test_rewrite_rules_applied_to_source(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source_path = os.path.join(tmp, 'aliyun.csv')
+            template_path = os.path.join(tmp, 'dnspod.csv')
+            with open(source_path, 'w', encoding='utf-8') as f:
+                f.write(ALIYUN_CSV)
+            records(('A', 'www', '198.51.100.1', '600', '-'),
+                    ('MX', '@', 'mx.example.com', '3600', '5')).to_csv(template_path, index=False)
+            with contextlib.redirect_stdout(io.StringIO()):
+                # 模板按改写规则生成：比对时使用同样的规则才一致
+                report = verify_template(DNSConverter(zone='example.com'), source_path, template_path)
+                self.assertEqual(sorted(report['Status']), ['extra', 'missing', 'ttl_mismatch'])
+                converter = DNSConverter(zone='example.com', rewrite_rules=RewriteRules(RULES))
+                self.assertTrue(verify_template(converter, source_path, template_path).empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量转换缓存的测试（变化、删除的行和转换设置变化时缓存失效，差异报告按记录类型和主机记录分组）
+
+运行方法：
+    python -m unittest discover tests
+"""
+
+import contextlib
+import csv
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_converter import DNSConverter  # noqa: E402
+from dns_rewrite import RewriteRules  # noqa: E402
+
+HEADER = '记录类型,主机记录,解析线路,记录值,MX优先级,TTL值,状态(启用/暂停)\n'
+
+ROWS = [
+    'A,www,默认,192.0.2.1,,600,启用\n',
+    'A,www,默认,192.0.2.2,,600,启用\n',
+    'CNAME,api,默认,www.example.com,,600,启用\n',
+    'MX,@,默认,mx.example.com,10,600,启用\n',
+    'TXT,@,默认,v=spf1 -all,,600,启用\n',
+]
+
+
+class IncrementalCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.input_path = os.path.join(tmp.name, 'aliyun.csv')
+        self.output_path = os.path.join(tmp.name, 'dnspod.csv')
+        self.diff_path = os.path.join(tmp.name, 'dnspod_diff.csv')
+
+    def run_incremental(self, rows, **options):
+        """增量转换一次，返回 (复用行数, 重新转换行数, 差异报告的行)"""
+        with open(self.input_path, 'w', encoding='utf-8') as f:
+            f.write(HEADER + ''.join(rows))
+        converter = DNSConverter(**{'zone': 'example.com', **options})
+        with contextlib.redirect_stdout(io.StringIO()):
+            converter.convert_file(self.input_path, self.output_path, incremental=True)
+        with open(self.diff_path, encoding='utf-8-sig', newline='') as f:
+            changes = [(row['Change'], row['Type'], row['Host'], row['Value']) for row in csv.DictReader(f)]
+        return converter.counters['cache_hits'], converter.counters['cache_misses'], changes
+
+    def test_unchanged_rows_reused(self):
+        hits, misses, changes = self.run_incremental(ROWS)
+        self.assertEqual((hits, misses), (0, 5))
+        self.assertEqual(len(changes), 5)
+        self.assertEqual({change[0] for change in changes}, {'added'})
+        self.assertEqual(self.run_incremental(ROWS), (5, 0, []))
+
+    def test_changed_row_reconverted(self):
+        self.run_incremental(ROWS)
+        rows = list(ROWS)
+        rows[3] = 'MX,@,默认,mx.example.com,20,600,启用\n'
+        hits, misses, changes = self.run_incremental(rows)
+        self.assertEqual((hits, misses), (4, 1))
+        self.assertEqual(changes, [('changed_old', 'MX', '@', 'mx.example.com'),
+                                   ('changed_new', 'MX', '@', 'mx.example.com')])
+
+    def test_deleted_row(self):
+        self.run_incremental(ROWS)
+        hits, misses, changes = self.run_incremental(ROWS[:2] + ROWS[3:])
+        self.assertEqual((hits, misses), (4, 0))
+        self.assertEqual(changes, [('removed', 'CNAME', 'api', 'www.example.com')])
+        # 删除的行再次出现时重新转换（缓存只保留上一次运行用到的结果）
+        self.assertEqual(self.run_incremental(ROWS)[:2], (4, 1))
+
+    def test_diff_grouped_by_type_and_host(self):
+        self.run_incremental(ROWS)
+        rows = [
+            'A,www,默认,192.0.2.1,,600,启用\n',
+            'A,www,默认,192.0.2.3,,600,启用\n',      # www 的一个IP变化：同组内记为 changed
+            'A,new,默认,192.0.2.9,,600,启用\n',      # 新主机记录：added
+            'MX,@,默认,mx.example.com,10,600,启用\n',
+            'TXT,@,默认,v=spf1 -all,,600,启用\n',
+        ]
+        hits, misses, changes = self.run_incremental(rows)
+        self.assertEqual((hits, misses), (3, 2))
+        self.assertEqual(changes, [
+            ('added', 'A', 'new', '192.0.2.9'),
+            ('changed_old', 'A', 'www', '192.0.2.2'),
+            ('changed_new', 'A', 'www', '192.0.2.3'),
+            ('removed', 'CNAME', 'api', 'www.example.com'),
+        ])
+
+    def test_conversion_settings_invalidate(self):
+        self.run_incremental(ROWS)
+        # 主域名变化：所有行重新转换
+        self.assertEqual(self.run_incremental(ROWS, zone='example.org')[:2], (0, 5))
+
+        rules = {'ip_map': [{'from': '192.0.2.0/24', 'to': '198.51.100.0/24'}]}
+        self.run_incremental(ROWS, rewrite_rules=RewriteRules(rules))
+        self.assertEqual(self.run_incremental(ROWS, rewrite_rules=RewriteRules(rules))[:2], (5, 0))
+        # 改写规则变化（指纹不同）：所有行重新转换，改写结果的变化出现在差异报告中
+        rules['ip_map'][0]['to'] = '203.0.113.0/24'
+        hits, misses, changes = self.run_incremental(ROWS, rewrite_rules=RewriteRules(rules))
+        self.assertEqual((hits, misses), (0, 5))
+        self.assertEqual([change[0] for change in changes], ['changed_old'] * 2 + ['changed_new'] * 2)
+        self.assertEqual([change[3] for change in changes[2:]], ['203.0.113.1', '203.0.113.2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+阶段耗时统计的测试
+
+运行方法：
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_core import DNSRecordConverter  # noqa: E402
+
+
+class StageTimingTest(unittest.TestCase):
+    def test_nested_stage_with_same_name_counted_once(self):
+        converter = DNSRecordConverter()
+        start = time.perf_counter()
+        with converter.stage('read'):
+            with converter.stage('read'):
+                time.sleep(0.05)
+            with converter.stage('detect'):
+                time.sleep(0.01)
+        elapsed = time.perf_counter() - start
+        self.assertLessEqual(converter.timings['read'], elapsed)
+        self.assertGreaterEqual(converter.timings['read'], 0.06)
+        self.assertGreaterEqual(converter.timings['detect'], 0.01)
+
+    def test_repeated_stage_accumulates(self):
+        converter = DNSRecordConverter()
+        for _ in range(3):
+            with converter.stage('write'):
+                time.sleep(0.01)
+        self.assertGreaterEqual(converter.timings['write'], 0.03)
+
+
+if __name__ == '__main__':
+    unittest.main()
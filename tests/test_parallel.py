@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单个文件并行转换的测试：结果与单进程转换一致
+
+运行方法：
+    python -m unittest discover tests
+"""
+
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from dns_converter import DNSConverter  # noqa: E402
+
+
+def convert(dns_df, workers=None, chunk_rows=None, **options):
+    converter = DNSConverter(**options)
+    with contextlib.redirect_stdout(io.StringIO()):
+        if workers:
+            return converter.convert_dns_records_parallel(dns_df, workers, chunk_rows=chunk_rows)
+        return converter.convert_dns_records_vectorized(dns_df)
+
+
+class ParallelZoneTest(unittest.TestCase):
+    def test_chunk_majority_does_not_set_zone(self):
+        # 整个文件中 example.com 不占多数（3/10），但第一块（5条）中占多数
+        hosts = [f's{number}.example.com' for number in range(3)] + [f'h{number}' for number in range(7)]
+        dns_df = pd.DataFrame({'Type': 'A', 'Host': hosts, 'TTL': 600,
+                               'Value': [f'192.0.2.{number}' for number in range(10)]})
+        single = convert(dns_df)
+        parallel = convert(dns_df, workers=2, chunk_rows=5)
+        self.assertEqual(single['Host'].tolist(), hosts)
+        pd.testing.assert_frame_equal(parallel, single)
+
+    def test_inferred_zone_passed_to_workers(self):
+        hosts = [f'h{number}.example.com.' for number in range(6)] + ['www', 'mail.example.com', 'api.dev']
+        dns_df = pd.DataFrame({'Type': 'A', 'Host': hosts, 'TTL': 600,
+                               'Value': [f'192.0.2.{number}' for number in range(9)]})
+        single = convert(dns_df)
+        self.assertEqual(single['Host'].tolist()[-3:], ['www', 'mail', 'api.dev'])
+        pd.testing.assert_frame_equal(convert(dns_df, workers=2, chunk_rows=3), single)
+
+
+if __name__ == '__main__':
+    unittest.main()
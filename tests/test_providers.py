@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+云服务商导出格式检测的测试：每种格式的完整表头按签名索引识别，表头不完全一致时按特征列识别，
+并检查标准化后的列名
+
+运行方法：
+    python -m unittest discover tests
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_converter import DNSConverter  # noqa: E402
+from dns_core import DNSRecordConverter  # noqa: E402
+from dns_providers import PROFILE_INDEX, PROVIDER_PROFILES, detect_profile, header_key  # noqa: E402
+
+# 每种格式一个导出文件的表头：(格式, 表头, 标准化后的列名)
+SIGNATURE_HEADERS = [
+    ('huawei', ['类型', '主机记录', '记录值', 'TTL', '备注', 'MX'],
+     ['Type', 'Host', 'Value', 'TTL', 'Remarks', 'MX']),
+    ('aliyun', ['记录类型', '主机记录', '解析线路', '记录值', 'MX优先级', 'TTL值', '状态(启用/暂停)'],
+     ['Type', 'Host', 'Line', 'Value', 'MX', 'TTL', 'Status']),
+    ('cloudflare', ['Type', 'Name', 'Content', 'TTL', 'Priority', 'Proxied'],
+     ['Type', 'Host', 'Value', 'TTL', 'MX', 'Proxied']),
+    ('route53', ['Name', 'Type', 'TTL', 'ResourceRecords', 'SetIdentifier'],
+     ['Host', 'Type', 'TTL', 'Value', 'Remarks']),
+    ('godaddy', ['type', 'name', 'data', 'ttl', 'priority'],
+     ['Type', 'Host', 'Value', 'TTL', 'MX']),
+]
+
+# 不在签名索引中的表头（多出或缺少列、列名带空白），按特征列识别；不认识的列名保持不变
+MARKER_HEADERS = [
+    ('huawei', ['类型', '主机记录', '记录值', 'TTL', '备注', '权重'],
+     ['Type', 'Host', 'Value', 'TTL', 'Remarks', '权重']),
+    ('aliyun', ['记录类型', '主机记录', '线路', '记录值', 'TTL', '权重'],
+     ['Type', 'Host', 'Line', 'Value', 'TTL', '权重']),
+    ('cloudflare', [' Type ', 'Name', 'Content', 'TTL', 'Tags'],
+     ['Type', 'Host', 'Value', 'TTL', 'Tags']),
+    ('route53', ['Name', 'Type', 'ResourceRecords', 'Weight'],
+     ['Host', 'Type', 'Value', 'Weight']),
+    ('godaddy', ['type', 'name', 'data', 'ttl', 'notes'],
+     ['Type', 'Host', 'Value', 'TTL', 'notes']),
+]
+
+
+class DetectProfileTest(unittest.TestCase):
+    def test_signature_headers(self):
+        for key, header, normalized in SIGNATURE_HEADERS:
+            with self.subTest(provider=key):
+                self.assertIn(header_key(header), PROFILE_INDEX)
+                profile = detect_profile(header)
+                self.assertEqual(profile.key, key)
+                self.assertEqual(profile.normalize_columns(header), normalized)
+                # 列的顺序不影响检测
+                self.assertIs(detect_profile(list(reversed(header))), profile)
+
+    def test_all_signatures_indexed(self):
+        for profile in PROVIDER_PROFILES:
+            for signature in profile.signatures:
+                with self.subTest(provider=profile.key, signature=sorted(signature)):
+                    self.assertIs(detect_profile(signature), profile)
+
+    def test_marker_fallback(self):
+        for key, header, normalized in MARKER_HEADERS:
+            with self.subTest(provider=key):
+                self.assertNotIn(header_key(header), PROFILE_INDEX)
+                profile = detect_profile(header)
+                self.assertEqual(profile.key, key)
+                self.assertEqual(profile.normalize_columns(header), normalized)
+
+    def test_unknown_header_defaults_to_huawei(self):
+        self.assertEqual(detect_profile(['Type', 'Host', 'Value']).key, 'huawei')
+        # 特征列按 PROVIDER_PROFILES 的顺序匹配：同时含有 content 和 备注 时按Cloudflare处理
+        self.assertEqual(detect_profile(['type', 'name', 'content', '备注']).key, 'cloudflare')
+
+
+class ReadHeaderTest(unittest.TestCase):
+    def test_csv_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for key, header, normalized in SIGNATURE_HEADERS + MARKER_HEADERS:
+                path = os.path.join(tmp, f'{key}.csv')
+                with open(path, 'w', encoding='utf-8-sig') as f:
+                    f.write(','.join(header) + '\n')
+                    f.write(','.join(['A'] * len(header)) + '\n')
+                with self.subTest(provider=key, header=header), contextlib.redirect_stdout(io.StringIO()):
+                    columns, profile = DNSRecordConverter().read_csv_header(path)
+                    self.assertEqual((profile.key, columns), (key, normalized))
+                    df = DNSConverter().read_dns_file(path)
+                    self.assertEqual(list(df.columns)[:len(normalized)], normalized)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+迁移改写规则的测试（编译后的规则在转换器和子进程之间传递）
+
+运行方法：
+    python -m unittest discover tests
+"""
+
+import os
+import pickle
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_core import DNSRecordConverter  # noqa: E402
+from dns_rewrite import RewriteRules  # noqa: E402
+
+RULES = {
+    'ip_map': [{'from': '192.0.2.0/24', 'to': '203.0.113.0/24'}],
+    'target_map': [{'from': '*.huaweicloud.com', 'to': '*.tencentcloud.com'}],
+    'ttl': [{'type': 'MX', 'ttl': 3600}],
+}
+
+
+class RewriteRulesTest(unittest.TestCase):
+    def test_apply(self):
+        rules = RewriteRules(RULES)
+        self.assertEqual(rules.apply('A', 'www', '192.0.2.7', 600), ('203.0.113.7', 600))
+        self.assertEqual(rules.apply('CNAME', 'cdn', 'a.cdn.huaweicloud.com', 600), ('a.cdn.tencentcloud.com', 600))
+        self.assertEqual(rules.apply('MX', '@', 'mx.example.com', 600), ('mx.example.com', 3600))
+
+    def test_pickle_round_trip(self):
+        rules = RewriteRules(RULES, cache_size=128)
+        rules.apply('A', 'www', '192.0.2.7', 600)
+        copy = pickle.loads(pickle.dumps(rules))
+        self.assertEqual(copy.fingerprint, rules.fingerprint)
+        self.assertEqual(copy.cache_size, 128)
+        self.assertEqual(copy.apply('A', 'www', '192.0.2.8', 600), ('203.0.113.8', 600))
+
+    def test_converter_reuses_compiled_rules(self):
+        rules = RewriteRules(RULES)
+        with mock.patch.object(RewriteRules, '__init__', side_effect=AssertionError("规则被重新编译")):
+            converter = DNSRecordConverter(rewrite_rules=rules)
+            other = DNSRecordConverter(**converter.converter_options())
+        self.assertIs(converter.rewrite_rules, rules)
+        self.assertIs(other.rewrite_rules, rules)
+        record = {'Type': 'A', 'Host': 'www', 'Value': '192.0.2.1', 'TTL': 600}
+        self.assertEqual(converter.convert_record(record)[0].value, '203.0.113.1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地转换服务的测试（请求校验、工作进程转换器缓存、排队名额）
+
+运行方法：
+    python -m unittest discover tests
+"""
+
+import contextlib
+import io
+import json
+import os
+import socket
+import sys
+import threading
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dns_service  # noqa: E402
+from dns_service import ConversionService, create_server, parse_job_options  # noqa: E402
+
+
+class BrokenExecutor:
+    """submit 总是抛出 BrokenProcessPool 的进程池"""
+
+    def __init__(self):
+        self.shutdown_calls = []
+
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("工作进程异常退出")
+
+    def shutdown(self, *args, **kwargs):
+        self.shutdown_calls.append(kwargs)
+
+
+class WorkerConverterTest(unittest.TestCase):
+    def setUp(self):
+        dns_service._worker_converters.clear()
+
+    def tearDown(self):
+        dns_service._worker_converters.clear()
+
+    def test_least_recently_used_is_evicted(self):
+        with mock.patch.object(dns_service, 'WORKER_CONVERTER_LIMIT', 2), \
+                contextlib.redirect_stdout(io.StringIO()):
+            first = dns_service._worker_converter({'zone': 'a.example.com'})
+            dns_service._worker_converter({'zone': 'b.example.com'})
+            # 命中后 a 成为最近使用的转换器，新增 c 时淘汰 b
+            self.assertIs(dns_service._worker_converter({'zone': 'a.example.com'}), first)
+            dns_service._worker_converter({'zone': 'c.example.com'})
+        zones = [dict(key)['zone'] for key in dns_service._worker_converters]
+        self.assertEqual(zones, ['a.example.com', 'c.example.com'])
+
+
+class SubmitTest(unittest.TestCase):
+    def test_slot_released_when_resubmit_fails(self):
+        service = ConversionService(workers=1, max_pending=1)
+        service.executor.shutdown()
+        service.executor = BrokenExecutor()
+        with mock.patch.object(service, '_create_executor', BrokenExecutor):
+            with self.assertRaises(BrokenProcessPool):
+                service.submit({})
+            # 名额已归还，下一次提交仍然是进程池错误而不是排队已满
+            with self.assertRaises(BrokenProcessPool):
+                service.submit({})
+        self.assertEqual(service.pending(), 0)
+
+    def test_broken_executor_replaced_once(self):
+        service = ConversionService(workers=1)
+        service.executor.shutdown()
+        broken = service.executor = BrokenExecutor()
+        with mock.patch.object(service, '_create_executor', side_effect=BrokenExecutor) as create:
+            replacement = service._replace_broken_executor(broken)
+            # 另一个线程随后发现同一个损坏的进程池：直接使用已重建的进程池
+            self.assertIs(service._replace_broken_executor(broken), replacement)
+        self.assertEqual(create.call_count, 1)
+        self.assertIs(service.executor, replacement)
+        self.assertEqual(broken.shutdown_calls, [{'wait': False, 'cancel_futures': True}])
+
+
+class ParseJobOptionsTest(unittest.TestCase):
+    def test_chunksize(self):
+        self.assertEqual(parse_job_options({'chunksize': '500'})[1]['chunksize'], 500)
+        for value in ([1], {'a': 1}, 'abc', -5, '0'):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_job_options({'chunksize': value})
+
+
+class ContentLengthTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.service = ConversionService(workers=1)
+        cls.server = create_server(cls.service, port=0, quiet=True)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.service.shutdown()
+
+    def status(self, headers: str, body: bytes = b'') -> int:
+        request = f"POST /convert HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n".encode('ascii') + body
+        with socket.create_connection(self.server.server_address, timeout=5) as sock:
+            sock.sendall(request)
+            return int(sock.makefile('rb').readline().split()[1])
+
+    def test_missing_content_length(self):
+        self.assertEqual(self.status("Content-Type: application/json\r\n"), 411)
+
+    def test_invalid_content_length(self):
+        self.assertEqual(self.status("Content-Length: abc\r\n"), 400)
+        self.assertEqual(self.status("Content-Length: -1\r\n"), 400)
+
+    def test_invalid_json_options(self):
+        for params in ({'input': os.path.abspath(__file__), 'chunksize': [1]}, {'input': [1]}):
+            body = json.dumps(params).encode('utf-8')
+            headers = f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            with self.subTest(params=params):
+                self.assertEqual(self.status(headers, body), 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
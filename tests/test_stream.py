@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式转换的测试：分块读取CSV和XLSX的结果与一次读取整个文件一致（各列类型不随分块变化）
+
+运行方法：
+    python -m unittest discover tests
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_converter import DNSConverter  # noqa: E402
+
+# 第一块的MX优先级都有值、备注为 0 和空值；之后的块出现空的MX优先级和字符串备注
+ALIYUN_CSV = """记录类型,主机记录,解析线路,记录值,MX优先级,TTL值,状态(启用/暂停),备注
+MX,@,默认,mx1.example.com,10,600,启用,
+MX,m,默认,mx2.example.com,20,600,启用,0
+A,a,默认,192.0.2.1,,600,启用,
+A,b,默认,192.0.2.2,,300,启用,note
+TXT,@,默认,v=spf1 -all,,600,启用,0
+CNAME,www,默认,a.example.com,,600,启用,
+"""
+
+
+class StreamEquivalenceTest(unittest.TestCase):
+    def convert(self, input_path, output_path, **options):
+        with contextlib.redirect_stdout(io.StringIO()):
+            DNSConverter(zone='example.com').convert_file(input_path, output_path, engine='vectorized', **options)
+        with open(output_path, encoding='utf-8-sig') as f:
+            return f.read()
+
+    def assert_stream_matches(self, tmp, input_path) -> str:
+        expected = self.convert(input_path, os.path.join(tmp, 'full.csv'))
+        self.assertIn('mx2.example.com,20.0,600,', expected)
+        for chunksize in (1, 2, 3, 4):
+            with self.subTest(chunksize=chunksize):
+                actual = self.convert(input_path, os.path.join(tmp, f'stream{chunksize}.csv'),
+                                      stream=True, chunksize=chunksize)
+                self.assertEqual(actual, expected)
+        return expected
+
+    def test_stream_matches_vectorized_across_chunks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, 'aliyun.csv')
+            with open(input_path, 'w', encoding='utf-8') as f:
+                f.write(ALIYUN_CSV)
+            self.assertIn('mx2.example.com,20.0,600,0', self.assert_stream_matches(tmp, input_path))
+
+    def test_xlsx_stream_matches_vectorized_across_chunks(self):
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        for line in ALIYUN_CSV.splitlines():
+            workbook.active.append([int(cell) if cell.isdigit() else cell or None for cell in line.split(',')])
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, 'aliyun.xlsx')
+            workbook.save(input_path)
+            self.assert_stream_matches(tmp, input_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
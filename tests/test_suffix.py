@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+主机记录相对化与主域名推断的测试
+
+运行方法：
+    python -m unittest discover tests
+"""
+
+import contextlib
+import io
+import os
+import sys
+import unittest
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_core import DNSRecordConverter  # noqa: E402
+from dns_suffix import infer_zone, load_public_suffix_index, relativize_host  # noqa: E402
+
+
+def convert_hosts(converter, hosts):
+    """按一个输入文件转换各主机名的A记录，返回转换后的主机记录"""
+    records = [{'Type': 'A', 'Host': host, 'Value': '192.0.2.1', 'TTL': 600} for host in hosts]
+    with contextlib.redirect_stdout(io.StringIO()):
+        converter.infer_file_zone(Counter(record['Host'] for record in records).items())
+        return [converter.convert_record(record)[0].host for record in records]
+
+
+class RegistrableDomainTest(unittest.TestCase):
+    def setUp(self):
+        self.index = load_public_suffix_index()
+
+    def test_registrable_domain(self):
+        self.assertEqual(self.index.registrable_domain('www.example.com'), 'example.com')
+        self.assertEqual(self.index.registrable_domain('example.com.cn'), 'example.com.cn')
+        self.assertIsNone(self.index.registrable_domain('com'))
+
+    def test_unlisted_tld_uses_default_rule(self):
+        # 列表中没有的顶级域名按隐含的默认规则 * 处理：公共后缀为最后一级标签
+        self.assertEqual(self.index.registrable_domain('www.corp.internal'), 'corp.internal')
+        self.assertEqual(self.index.registrable_domain('a.b.example.unlistedtld'), 'example.unlistedtld')
+        self.assertIsNone(self.index.registrable_domain('internal'))
+        self.assertEqual(relativize_host('www.corp.internal', self.index, None), 'www')
+
+    def test_underscore_label_is_not_registrable(self):
+        self.assertIsNone(self.index.registrable_domain('_dmarc.blog'))
+        self.assertIsNone(self.index.registrable_domain('_sip._tcp'))
+        self.assertEqual(self.index.registrable_domain('_dmarc.example.com'), 'example.com')
+
+    def test_relative_names_without_zone(self):
+        for name in ('_dmarc.blog', 'api.dev', 'm.shop', 'www'):
+            self.assertEqual(relativize_host(name, self.index, None, absolute=False), name)
+        self.assertEqual(relativize_host('api.dev', self.index, None), '@')
+        self.assertEqual(relativize_host('www.example.com', self.index, None), 'www')
+
+
+class InferZoneTest(unittest.TestCase):
+    def setUp(self):
+        self.index = load_public_suffix_index()
+
+    def test_most_common_registrable_domain(self):
+        hosts = {'www.example.com.': 3, 'example.com.': 2, 'mail.example.com.': 1, 'cdn.other.net.': 1}
+        self.assertEqual(infer_zone(hosts.items(), self.index), 'example.com')
+
+    def test_relative_hosts_have_no_zone(self):
+        hosts = {'www': 2, '@': 3, '_dmarc.blog': 1, 'api.dev': 1, 'm.shop': 1}
+        self.assertIsNone(infer_zone(hosts.items(), self.index))
+
+    def test_minority_domain_is_not_a_zone(self):
+        hosts = {'www': 1, 'mail': 1, 'api.dev': 1}
+        self.assertIsNone(infer_zone(hosts.items(), self.index))
+
+
+class CleanHostRecordTest(unittest.TestCase):
+    def test_aliyun_relative_hosts_unchanged(self):
+        hosts = ['_dmarc.blog', 'api.dev', 'm.shop', 'www', '@', '_sip._tcp']
+        self.assertEqual(convert_hosts(DNSRecordConverter(), hosts), hosts)
+
+    def test_huawei_absolute_hosts(self):
+        hosts = ['www.example.com.', 'example.com.', '_dmarc.example.com.', 'a.b.example.com.', 'api.dev.']
+        self.assertEqual(convert_hosts(DNSRecordConverter(), hosts), ['www', '@', '_dmarc', 'a.b', 'api.dev'])
+
+    def test_inferred_zone_per_file(self):
+        converter = DNSRecordConverter()
+        self.assertEqual(convert_hosts(converter, ['www.example.com.', 'example.com.']), ['www', '@'])
+        self.assertEqual(converter.zone, 'example.com')
+        # 下一个文件重新推断，不沿用上一个文件的主域名
+        self.assertEqual(convert_hosts(converter, ['www.example.org.', 'mail.example.org.']), ['www', 'mail'])
+        self.assertEqual(convert_hosts(converter, ['api.dev', 'www']), ['api.dev', 'www'])
+        self.assertIsNone(converter.zone)
+
+    def test_unlisted_tld_zone_inferred(self):
+        converter = DNSRecordConverter()
+        hosts = ['corp.internal.', 'www.corp.internal.', 'ldap.dc1.corp.internal.']
+        self.assertEqual(convert_hosts(converter, hosts), ['@', 'www', 'ldap.dc1'])
+        self.assertEqual(converter.zone, 'corp.internal')
+
+    def test_configured_zone_wins(self):
+        converter = DNSRecordConverter(zone='dept.example.com')
+        hosts = ['www.dept.example.com.', 'dept.example.com.', 'api.dev']
+        self.assertEqual(convert_hosts(converter, hosts), ['www', '@', 'api.dev'])
+
+
+if __name__ == '__main__':
+    unittest.main()
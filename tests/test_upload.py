@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DNSPOD API上传的测试：在本机启动 http.server 模拟API，检查TC3签名、HTTP 429 限频暂停、
+检查点续传和记录已存在的处理
+
+运行方法：
+    python -m unittest discover tests
+"""
+
+import contextlib
+import hashlib
+import hmac
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timezone
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_upload import DNSPODUploader, UploadCheckpoint, parse_retry_after  # noqa: E402
+
+SECRET_ID = 'AKIDEXAMPLE'
+SECRET_KEY = 'secret-key-example'
+
+
+def expected_authorization(headers, payload: bytes) -> str:
+    """按腾讯云API 3.0文档逐步计算TC3-HMAC-SHA256签名（与 dns_upload.sign_request 独立实现）"""
+    timestamp = int(headers['X-TC-Timestamp'])
+    date = datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%d')
+    canonical_headers = (f"content-type:{headers['Content-Type'].lower()}\n"
+                         f"host:{headers['Host'].lower()}\n"
+                         f"x-tc-action:{headers['X-TC-Action'].lower()}\n")
+    signed_headers = 'content-type;host;x-tc-action'
+    canonical_request = (f"POST\n/\n\n{canonical_headers}\n{signed_headers}\n"
+                         f"{hashlib.sha256(payload).hexdigest()}")
+    scope = f"{date}/dnspod/tc3_request"
+    string_to_sign = (f"TC3-HMAC-SHA256\n{timestamp}\n{scope}\n"
+                      f"{hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()}")
+    secret_date = hmac.new(('TC3' + SECRET_KEY).encode('utf-8'), date.encode('utf-8'), hashlib.sha256).digest()
+    secret_service = hmac.new(secret_date, b'dnspod', hashlib.sha256).digest()
+    secret_signing = hmac.new(secret_service, b'tc3_request', hashlib.sha256).digest()
+    signature = hmac.new(secret_signing, string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
+    return (f"TC3-HMAC-SHA256 Credential={SECRET_ID}/{scope}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}")
+
+
+class StubAPIHandler(BaseHTTPRequestHandler):
+    """按 server.respond(请求头, 请求体) 的返回值 (HTTP状态码, 响应头, Response) 应答"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format: str, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        with self.server.lock:
+            self.server.requests.append((time.monotonic(), json.loads(body)))
+        status, headers, response = self.server.respond(self.headers, body)
+        data = json.dumps({'Response': response}).encode('utf-8')
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class UploadTestCase(unittest.TestCase):
+    def start_stub(self, respond):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StubAPIHandler)
+        server.daemon_threads = True
+        server.respond = respond
+        server.requests = []
+        server.lock = threading.Lock()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def uploader(self, server, **options) -> DNSPODUploader:
+        options = {'rate': 1000, 'concurrency': 2, 'retries': 2, 'timeout': 5, **options}
+        return DNSPODUploader(f"http://127.0.0.1:{server.server_address[1]}", **options)
+
+    @staticmethod
+    def records(count: int):
+        return [{'Domain': 'example.com', 'SubDomain': f'host{number}', 'RecordType': 'A',
+                 'RecordLine': '默认', 'Value': f'192.0.2.{number}', 'TTL': 600} for number in range(count)]
+
+    @staticmethod
+    def upload(uploader, records, checkpoint=None):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return uploader.upload(records, checkpoint)
+
+
+class SignatureTest(UploadTestCase):
+    def test_tc3_signature(self):
+        def respond(headers, body):
+            if headers.get('Authorization') != expected_authorization(headers, body):
+                return 200, {}, {'Error': {'Code': 'AuthFailure.SignatureFailure', 'Message': '签名错误'}}
+            return 200, {}, {'RecordId': 1}
+
+        server = self.start_stub(respond)
+        uploader = self.uploader(server, secret_id=SECRET_ID, secret_key=SECRET_KEY)
+        failures = self.upload(uploader, self.records(3))
+        self.assertEqual(failures, [])
+        self.assertEqual(uploader.counters['created'], 3)
+
+    def test_wrong_key_rejected(self):
+        server = self.start_stub(lambda headers, body: (
+            200, {}, {'RecordId': 1} if headers.get('Authorization') == expected_authorization(headers, body)
+            else {'Error': {'Code': 'AuthFailure.SignatureFailure', 'Message': '签名错误'}}))
+        uploader = self.uploader(server, secret_id=SECRET_ID, secret_key='wrong')
+        failures = self.upload(uploader, self.records(1))
+        self.assertEqual(len(failures), 1)
+        self.assertTrue(failures[0]['error'].startswith('AuthFailure.SignatureFailure'))
+
+
+class RateLimitTest(UploadTestCase):
+    def test_http_429_pauses_token_bucket(self):
+        calls = []
+
+        def respond(headers, body):
+            calls.append(body)
+            if len(calls) == 1:
+                return 429, {'Retry-After': '1'}, {'Error': {'Code': 'RequestLimitExceeded', 'Message': '限频'}}
+            return 200, {}, {'RecordId': len(calls)}
+
+        server = self.start_stub(respond)
+        uploader = self.uploader(server, concurrency=1)
+        failures = self.upload(uploader, self.records(2))
+        self.assertEqual(failures, [])
+        self.assertEqual(uploader.counters['rate_limited'], 1)
+        self.assertEqual(uploader.counters['retries'], 1)
+        times = [moment for moment, _ in server.requests]
+        # 429 之后按 Retry-After 暂停发放令牌，下一个请求至少在1秒后发出
+        self.assertGreaterEqual(times[1] - times[0], 0.9)
+
+    def test_http_date_retry_after(self):
+        retry_at = formatdate(time.time() + 0.5, usegmt=True)
+        calls = []
+
+        def respond(headers, body):
+            calls.append(body)
+            if len(calls) == 1:
+                return 503, {'Retry-After': retry_at}, {'Error': {'Code': 'InternalError', 'Message': '内部错误'}}
+            return 200, {}, {'RecordId': 1}
+
+        server = self.start_stub(respond)
+        uploader = self.uploader(server, concurrency=1)
+        self.assertEqual(self.upload(uploader, self.records(1)), [])
+        self.assertEqual(uploader.counters['retries'], 1)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('3'), 3.0)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertIsNone(parse_retry_after(None))
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        self.assertAlmostEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT', now=1445412470), 10.0)
+
+
+class CheckpointTest(UploadTestCase):
+    def test_resume_and_existing_records(self):
+        created = set()
+        state = {'fail': {'host2', 'host3'}}
+
+        def respond(headers, body):
+            params = json.loads(body)
+            host = params['SubDomain']
+            if host in state['fail']:
+                return 200, {}, {'Error': {'Code': 'InvalidParameterValue', 'Message': '临时错误'}}
+            if host in created:
+                return 200, {}, {'Error': {'Code': 'InvalidParameter.DomainRecordExist', 'Message': '记录已经存在'}}
+            created.add(host)
+            return 200, {}, {'RecordId': len(created)}
+
+        server = self.start_stub(respond)
+        records = self.records(5)
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = UploadCheckpoint(os.path.join(tmp, 'upload.sqlite'))
+            try:
+                uploader = self.uploader(server, batch_size=2)
+                failures = self.upload(uploader, records, checkpoint)
+                self.assertEqual(sorted(failure['record']['SubDomain'] for failure in failures), ['host2', 'host3'])
+                self.assertEqual(len(checkpoint.completed()), 3)
+
+                # host2 在服务器上已经存在（例如上一次请求超时但实际已创建），视为完成
+                state['fail'] = set()
+                created.add('host2')
+                server.requests.clear()
+                uploader = self.uploader(server, batch_size=2)
+                failures = self.upload(uploader, records, checkpoint)
+                self.assertEqual(failures, [])
+                self.assertEqual(sorted(params['SubDomain'] for _, params in server.requests), ['host2', 'host3'])
+                self.assertEqual(uploader.counters['skipped'], 3)
+                self.assertEqual(uploader.counters['exists'], 1)
+                self.assertEqual(uploader.counters['created'], 1)
+                self.assertEqual(len(checkpoint.completed()), 5)
+            finally:
+                checkpoint.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
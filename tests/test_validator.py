@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DNS记录值校验的测试（无效的A/AAAA记录值、缺少优先级的MX记录、超长TXT记录，
+未通过校验的记录不写入模板而写入 --rejects 报告）
+
+运行方法：
+    python -m unittest discover tests
+"""
+
+import contextlib
+import csv
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from dns_converter import DNSConverter  # noqa: E402
+from dns_validator import TXT_MAX_LENGTH, validate_record, validate_records  # noqa: E402
+
+LONG_TXT = 'x' * (TXT_MAX_LENGTH + 1)
+
+ALIYUN_CSV = f"""记录类型,主机记录,解析线路,记录值,MX优先级,TTL值,状态(启用/暂停)
+A,www,默认,192.0.2.1,,600,启用
+A,bad4,默认,192.0.2.256,,600,启用
+AAAA,v6,默认,2001:db8::1,,600,启用
+AAAA,bad6,默认,2001:db8::g,,600,启用
+MX,@,默认,mx1.example.com,10,600,启用
+MX,nopri,默认,mx2.example.com,,600,启用
+TXT,@,默认,{'y' * TXT_MAX_LENGTH},,600,启用
+TXT,long,默认,{LONG_TXT},,600,启用
+"""
+
+VALID_HOSTS = ['www', 'v6', '@', '@']
+REJECTED_HOSTS = ['bad4', 'bad6', 'nopri', 'long']
+
+
+def record(record_type, value, mx='-', ttl=600):
+    return {'Type': record_type, 'Host': 'www', 'Split Zone': 'Default', 'Value': value,
+            'MX': mx, 'TTL': ttl, 'Remarks': ''}
+
+
+class ValidateRecordTest(unittest.TestCase):
+    CASES = [
+        (record('A', '192.0.2.1'), ''),
+        (record('A', '192.0.2.256'), '无效的IPv4地址'),
+        (record('A', '192.0.2'), '无效的IPv4地址'),
+        (record('AAAA', '2001:db8::1'), ''),
+        (record('AAAA', '2001:db8::g'), '无效的IPv6地址'),
+        (record('AAAA', '192.0.2.1'), '无效的IPv6地址'),
+        (record('MX', 'mx.example.com', '10'), ''),
+        (record('MX', 'mx.example.com', '10.0'), ''),
+        (record('MX', 'mx.example.com', ''), '无效的MX优先级'),
+        (record('MX', 'mx.example.com', '-'), '无效的MX优先级'),
+        (record('MX', 'mx.example.com', '70000'), 'MX优先级应为0-65535之间的整数'),
+        (record('TXT', 'y' * TXT_MAX_LENGTH), ''),
+        (record('TXT', LONG_TXT), f"TXT记录值长度 {TXT_MAX_LENGTH + 1} 超过上限 {TXT_MAX_LENGTH}"),
+        (record('TXT', ''), 'TXT记录值为空'),
+    ]
+
+    def test_reasons(self):
+        for rec, reason in self.CASES:
+            with self.subTest(record=rec['Value'][:20], mx=rec['MX']):
+                actual = validate_record(rec)
+                if reason:
+                    self.assertTrue(actual.startswith(reason), actual)
+                else:
+                    self.assertEqual(actual, '')
+
+    def test_column_rules_match_record_rules(self):
+        dnspod_df = pd.DataFrame([rec for rec, _ in self.CASES])
+        self.assertEqual(validate_records(dnspod_df).tolist(), [validate_record(rec) for rec, _ in self.CASES])
+
+
+class RejectsFileTest(unittest.TestCase):
+    def convert(self, **options):
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, 'aliyun.csv')
+            output_path = os.path.join(tmp, 'dnspod.csv')
+            rejects_path = os.path.join(tmp, 'rejects.csv')
+            with open(input_path, 'w', encoding='utf-8') as f:
+                f.write(ALIYUN_CSV)
+            converter = DNSConverter(zone='example.com')
+            with contextlib.redirect_stdout(io.StringIO()):
+                converter.convert_file(input_path, output_path, validate=True, rejects_path=rejects_path, **options)
+            with open(output_path, encoding='utf-8-sig', newline='') as f:
+                template = list(csv.DictReader(f))
+            with open(rejects_path, encoding='utf-8-sig', newline='') as f:
+                rejects = list(csv.DictReader(f))
+        return converter, template, rejects
+
+    def test_rejects_excluded_from_template(self):
+        for options in ({'engine': 'core'}, {'engine': 'vectorized'}, {'engine': 'vectorized', 'stream': True},
+                        {'incremental': True}):
+            with self.subTest(**options):
+                converter, template, rejects = self.convert(**options)
+                self.assertEqual([row['Host'] for row in template], VALID_HOSTS)
+                self.assertEqual([row['Host'] for row in rejects], REJECTED_HOSTS)
+                self.assertEqual([row['Reason'].split(':')[0] for row in rejects],
+                                 ['无效的IPv4地址', '无效的IPv6地址', '无效的MX优先级', rejects[3]['Reason']])
+                self.assertIn('超过上限', rejects[3]['Reason'])
+                self.assertEqual(rejects[3]['Value'], LONG_TXT)
+                self.assertEqual(converter.counters['rejected'], len(REJECTED_HOSTS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DNS查询验证的测试：启动 benchmarks/stub_dns_server.py，检查 ok、mismatch、timeout 状态和重试次数
+
+运行方法：
+    python -m unittest discover tests
+"""
+
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from dns_converter import DNSConverter  # noqa: E402
+from dns_verify import DNSVerifier  # noqa: E402
+
+STUB_SERVER = os.path.join(ROOT_DIR, 'benchmarks', 'stub_dns_server.py')
+
+ALIYUN_CSV = """记录类型,主机记录,解析线路,记录值,MX优先级,TTL值,状态(启用/暂停)
+A,www,默认,192.0.2.1,,600,启用
+A,@,默认,192.0.2.2,,600,启用
+CNAME,mail,默认,www.example.com,,600,启用
+MX,@,默认,mx1.example.com,5,600,启用
+TXT,@,默认,v=spf1 -all,,600,启用
+"""
+
+
+class StubServerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.input_path = os.path.join(cls.tmp.name, 'aliyun.csv')
+        with open(cls.input_path, 'w', encoding='utf-8') as f:
+            f.write(ALIYUN_CSV)
+        cls.servers = []
+
+    @classmethod
+    def tearDownClass(cls):
+        for process in cls.servers:
+            process.terminate()
+            process.wait()
+            process.stdout.close()
+        cls.tmp.cleanup()
+
+    def start_server(self, *options) -> int:
+        """启动模拟DNS服务器（随机端口），返回监听端口"""
+        process = subprocess.Popen(
+            [sys.executable, '-u', STUB_SERVER, self.input_path, '--zone', 'example.com', '--port', '0', *options],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, encoding='utf-8')
+        self.servers.append(process)
+        for line in process.stdout:
+            if line.startswith('模拟DNS服务器已启动'):
+                return int(line.split('，')[0].rsplit(':', 1)[1])
+        self.fail("模拟DNS服务器启动失败")
+
+    def verify(self, port: int, retries: int, changes=None):
+        converter = DNSConverter(zone='example.com')
+        with contextlib.redirect_stdout(io.StringIO()):
+            dnspod_df = converter.convert_dns_records_vectorized(converter.read_dns_file(self.input_path))
+        for (rtype, host), value in (changes or {}).items():
+            dnspod_df.loc[(dnspod_df['Type'] == rtype) & (dnspod_df['Host'] == host), 'Value'] = value
+        verifier = DNSVerifier('127.0.0.1', port, concurrency=4, timeout=0.2, retries=retries, converter=converter)
+        report = verifier.verify(dnspod_df, 'example.com')
+        return dict(zip(zip(report['Type'], report['Host']), report['Status'])), converter.counters
+
+    def test_ok_and_mismatch(self):
+        port = self.start_server()
+        statuses, counters = self.verify(port, retries=2, changes={('A', 'www'): '192.0.2.99'})
+        self.assertEqual(statuses, {('A', 'www'): 'mismatch', ('A', '@'): 'ok', ('CNAME', 'mail'): 'ok',
+                                    ('MX', '@'): 'ok', ('TXT', '@'): 'ok'})
+        self.assertEqual(counters['verify_retries'], 0)
+        self.assertEqual(counters['verify_mismatches'], 1)
+
+    def test_timeout_and_retries(self):
+        port = self.start_server('--drop-rate', '1')
+        statuses, counters = self.verify(port, retries=2)
+        self.assertEqual(set(statuses.values()), {'timeout'})
+        self.assertEqual(counters['verify_timeouts'], len(statuses))
+        self.assertEqual(counters['verify_retries'], 2 * len(statuses))
+        self.assertEqual(counters['verify_queries'], 3 * len(statuses))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+区域文件主域名（SOA/$ORIGIN）和转义字符的测试
+
+运行方法：
+    python -m unittest discover tests
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dns_core import DNSRecordConverter  # noqa: E402
+from dns_zonefile import iter_zone_records, tokenize_zone  # noqa: E402
+
+DEPT_ZONE = """$ORIGIN dept.example.com.
+$TTL 600
+@   IN SOA ns1.example.com. admin.example.com. ( 1 3600 600 86400 300 )
+www IN A 192.0.2.1
+api IN CNAME www
+@   IN MX 10 mail
+"""
+
+
+class ZoneOriginTest(unittest.TestCase):
+    def zone_of(self, text, origin=None):
+        zones = []
+        records = list(iter_zone_records(text.splitlines(), origin, on_zone=zones.append))
+        self.assertEqual(len(zones), 1 if records else 0)
+        return zones[0] if zones else None
+
+    def test_soa_owner(self):
+        self.assertEqual(self.zone_of(DEPT_ZONE), 'dept.example.com')
+
+    def test_origin_without_soa(self):
+        self.assertEqual(self.zone_of("$ORIGIN example.org.\nwww 300 IN A 192.0.2.1\n"), 'example.org')
+
+    def test_no_origin(self):
+        self.assertIsNone(self.zone_of("www.example.com. 300 IN A 192.0.2.1\n"))
+        self.assertEqual(self.zone_of("www 300 IN A 192.0.2.1\n", 'example.net'), 'example.net')
+
+    def test_convert_uses_zone_file_origin(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, 'dept.zone')
+            output_path = os.path.join(tmp, 'out.ndjson')
+            with open(input_path, 'w', encoding='utf-8') as f:
+                f.write(DEPT_ZONE)
+            with contextlib.redirect_stdout(io.StringIO()):
+                converter = DNSRecordConverter()
+                converter.convert_records_to_file(lambda: converter.iter_zone_file_records(input_path), output_path)
+            with open(output_path, encoding='utf-8') as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual([(r['Domain'], r['SubDomain'], r['RecordType']) for r in records],
+                         [('dept.example.com', 'www', 'A'), ('dept.example.com', 'api', 'CNAME'),
+                          ('dept.example.com', '@', 'MX')])
+
+
+class UnescapeTest(unittest.TestCase):
+    def tokens(self, line):
+        return list(tokenize_zone([line]))[0][2]
+
+    def test_ddd_octets_decoded_as_utf8(self):
+        # \DDD 是一个字节：UTF-8 编码的“中文”写成6个转义字节
+        self.assertEqual(self.tokens('www IN TXT "\\228\\184\\173\\230\\150\\135"')[-1], '中文')
+        self.assertEqual(self.tokens('www IN TXT "v\\061spf1 \\"x\\""')[-1], 'v=spf1 "x"')
+
+    def test_invalid_utf8_octets_kept(self):
+        # 不是有效UTF-8的字节保留为 \DDD，结果仍可按UTF-8写入
+        self.assertEqual(self.tokens('www IN TXT "\\255a\\228\\184\\173"')[-1], '\\255a中')
+
+
+if __name__ == '__main__':
+    unittest.main()